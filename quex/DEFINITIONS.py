@@ -34,6 +34,18 @@ except:
 QUEX_PATH          = QUEX_INSTALLATION_DIR
 QUEX_CODEC_DB_PATH = QUEX_PATH + "/quex/engine/codec_db/database"
 
+# Directory for data derived from the databases of the installation (see
+# 'quex/engine/misc/disk_cache.py'). An empty string disables the cache.
+QUEX_CACHE_PATH    = os.environ.get("QUEX_CACHE_PATH", 
+                                    os.path.join(os.environ.get("XDG_CACHE_HOME", 
+                                                                os.path.expanduser("~/.cache")),
+                                                 "quex"))
+
+# The results of parsing input files are cached as pickles (see 
+# 'quex/input/files/parse_cache.py'). Loading a pickle may execute code. So,
+# the parse cache is only used if 'QUEX_CACHE_PATH' is set explicitly.
+QUEX_PARSE_CACHE_F = bool(os.environ.get("QUEX_CACHE_PATH"))
+
 sys.path.insert(0, QUEX_INSTALLATION_DIR)
 
 def check():
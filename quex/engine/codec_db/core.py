@@ -3,11 +3,14 @@
 from   quex.DEFINITIONS                   import QUEX_CODEC_DB_PATH
 import quex.engine.codec_db.parser        as     parser
 import quex.engine.misc.error             as     error
+import quex.engine.misc.disk_cache        as     disk_cache
+from   quex.engine.misc.interval_handling import NumberSet, Interval
 from   quex.engine.misc.tools             import flatten
 from   quex.engine.misc.file_operations   import get_file_content_or_die, \
                                                  open_file_or_die
 
-from   copy import copy
+from   array import array
+from   copy  import copy
 import os
 
 
@@ -81,13 +84,51 @@ def get_supported_unicode_character_set(CodecAlias=None, FileName=None):
     return source_set
 
 def load(result_list, FileName, ExitOnErrorF):
+    """Appends the entries [SourceBegin, SourceEnd, TargetBegin] of the codec
+    table in 'FileName' to 'result_list'. Tables of the codec database are 
+    cached on disk as flat arrays of integers (see 'disk_cache').
+
+    RETURNS: [0] Set of unicode characters covered by the codec.
+             [1] Range of values in the codec elements.
+    """
+    cache_name = _get_cache_name(FileName)
+    if cache_name is not None:
+        content = disk_cache.read("codec", cache_name, FileName)
+        if content is not None:
+            return _load_from_flat_table(result_list, content)
+
     fh = open_file_or_die(FileName, "r")
-    source_set, drain_set, error_str = parser.do(result_list, fh)
+    table = []
+    source_set, drain_set, error_str = parser.do(table, fh)
 
     if error_str is not None:
         error.log(error_str, fh, DontExitF=not ExitOnErrorF)
         return None, None
 
+    list.extend(result_list, table)
+    if cache_name is not None:
+        disk_cache.write("codec", cache_name, FileName,
+                         array("q", flatten(table)).tobytes())
+    return source_set, drain_set
+
+def _get_cache_name(FileName):
+    """RETURNS: Name of the cached table, if 'FileName' is part of the codec 
+                database. None, else.
+    """
+    directory, base_name = os.path.split(os.path.abspath(FileName))
+    if directory != os.path.abspath(QUEX_CODEC_DB_PATH): return None
+    return "%s.bin" % os.path.splitext(base_name)[0]
+
+def _load_from_flat_table(result_list, Content):
+    flat_table = array("q")
+    flat_table.frombytes(Content)
+    source_set = NumberSet()
+    drain_set  = NumberSet()
+    for i in range(0, len(flat_table), 3):
+        source_begin, source_end, target_begin = flat_table[i:i+3]
+        list.append(result_list, [source_begin, source_end, target_begin])
+        source_set.add_interval(Interval(source_begin, source_end))
+        drain_set.add_interval(Interval(target_begin, target_begin + source_end - source_begin))
     return source_set, drain_set
 
 def get_file_name_for_codec_alias(CodecAlias):
@@ -6,7 +6,8 @@
 
 """
 import quex.engine.codec_db.unicode.parser as     ucs_db_parser
-from   quex.engine.misc.interval_handling  import Interval
+from   quex.engine.misc.interval_handling  import Interval, NumberSet
+from   bisect      import bisect_right
 from   collections import defaultdict
 
 class CaseFoldDb:
@@ -19,10 +20,11 @@ class CaseFoldDb:
         """
         result = []
 
-        for fold in self.upper_to_lower[CharacterCode]:
+        # '.get()', since indexing the 'defaultdict'-s would insert keys.
+        for fold in self.upper_to_lower.get(CharacterCode, ()):
             if fold not in result: result.append(fold)
 
-        for fold in self.lower_to_upper[CharacterCode]:
+        for fold in self.lower_to_upper.get(CharacterCode, ()):
             if fold not in result: result.append(fold)
 
         return result
@@ -117,3 +119,92 @@ def get_fold_set_for_interval(interval, flags):
         result.update(folded_set)
        
     return sorted(result)
+
+class FoldIndex:
+    """Precomputed case folding for a given combination of flags (see 
+    'get_fold_set_for_interval()'). A code point folds to everything that is
+    reachable from it by single character folds. 
+
+       run_list   = sorted list of (begin, end, delta tuple). Each code point 
+                    'x' in [begin, end) folds to 'x + delta' for every delta.
+                    Consecutive code points with the same deltas, such as 
+                    'A' to 'Z', share a run.
+       multi_db   = map: code point --> sorted tuple of multi character 
+                    sequences to which it folds.
+
+    Folding a whole NumberSet is a single sweep over its intervals and the 
+    runs, instead of a consultation of the database per character.
+    """
+    def __init__(self, Flags):
+        Db.init()
+        character_list = sorted(set(
+            x
+            for db in (Db.CS, Db.F, Db.T)
+            for fold_db in (db.upper_to_lower, db.lower_to_upper)
+            for character_code, fold_list in fold_db.items()
+            for x in [ character_code ] + [ fold[0] for fold in fold_list if len(fold) == 1 ]
+        ))
+
+        self.run_list = []
+        self.multi_db = {}
+        for character_code in character_list:
+            fold_list  = get_fold_set(character_code, Flags)
+            delta_list = tuple(
+                fold[0] - character_code 
+                for fold in fold_list if len(fold) == 1 and fold[0] != character_code
+            )
+            multi_list = tuple(fold for fold in fold_list if len(fold) > 1)
+            if multi_list: self.multi_db[character_code] = multi_list
+            if not delta_list: continue
+
+            if self.run_list:
+                begin, end, last_delta_list = self.run_list[-1]
+                if end == character_code and last_delta_list == delta_list:
+                    self.run_list[-1] = (begin, end + 1, delta_list)
+                    continue
+            self.run_list.append((character_code, character_code + 1, delta_list))
+
+        self.begin_list = [ begin for begin, end, delta_list in self.run_list ]
+
+    def get_fold_number_set(self, CharacterSet):
+        """RETURNS: NumberSet of the characters in 'CharacterSet' and all 
+                    single characters to which they fold.
+        """
+        L             = len(self.run_list)
+        interval_list = []
+        for interval in CharacterSet.get_intervals(PromiseToTreatWellF=True):
+            i = max(0, bisect_right(self.begin_list, interval.begin) - 1)
+            while i < L:
+                begin, end, delta_list = self.run_list[i]
+                if begin >= interval.end: break
+                begin = max(begin, interval.begin)
+                end   = min(end, interval.end)
+                if begin < end:
+                    interval_list.extend(Interval(begin + delta, end + delta) for delta in delta_list)
+                i += 1
+
+        if not interval_list: return CharacterSet.clone()
+        return NumberSet.union_of_many([ CharacterSet ] + interval_list)
+
+    def get_multi_fold_list(self, CharacterSet):
+        """RETURNS: Sorted list of multi character sequences to which the 
+                    characters in 'CharacterSet' fold.
+        """
+        return sorted(set(
+            fold
+            for character_code, multi_list in self.multi_db.items()
+            if CharacterSet.contains(character_code)
+            for fold in multi_list
+        ))
+
+_fold_index_db = {} # map: flags --> FoldIndex
+
+def get_fold_index(Flags):
+    """RETURNS: FoldIndex for the given flags. It is computed only once.
+    """
+    key    = "".join(sorted(set(Flags) & set("smt")))
+    result = _fold_index_db.get(key)
+    if result is None:
+        result              = FoldIndex(key)
+        _fold_index_db[key] = result
+    return result
@@ -8,13 +8,17 @@ sys.path.insert(0, os.environ["QUEX_PATH"])
 
 from   quex.DEFINITIONS              import QUEX_PATH
 import quex.engine.misc.error        as     error
+import quex.engine.misc.disk_cache   as     disk_cache
+import quex.engine.codec_db.unicode.prebuilt as prebuilt
 
 from   quex.engine.misc.interval_handling import Interval, NumberSet
 from   quex.constants import INTEGER_MAX
 
 import re
 import fnmatch
-from   copy import deepcopy, copy
+import marshal
+from   array import array
+from   copy  import copy
 
 unicode_db_directory = QUEX_PATH + "/quex/engine/codec_db/unicode/database"
 comment_deleter_re   = re.compile(r"#[^\n]*")
@@ -139,6 +143,54 @@ def load_db(DB_Filename, ValueType, ValueColumnIdx, KeyColumnIdx):
 
     return db
 
+def read_cached_code_point_db(PropertyAlias, Filename):
+    """Code point databases are cached on disk in 'marshal' format. Number sets
+    are stored as arrays of interval boundaries. The cache of a property is 
+    valid, as long as the database file 'Filename' is unchanged.
+
+    RETURNS: Code point database of the property. None, if there is no valid
+             cache.
+    """
+    content = disk_cache.read("unicode", "%s.bin" % PropertyAlias, 
+                              unicode_db_directory + "/" + Filename)
+    if content is None: return None
+    try:    db = marshal.loads(content)
+    except: return None
+
+    # Binary properties: the database is a single number set.
+    if type(db) != dict: return _decode(db)
+    return dict((key, _decode(value)) for key, value in db.items())
+
+def write_cached_code_point_db(PropertyAlias, Filename, CodePointDb):
+    if type(CodePointDb) != dict: db = _encode(CodePointDb)
+    else:                         db = dict((key, _encode(value)) for key, value in CodePointDb.items())
+    disk_cache.write("unicode", "%s.bin" % PropertyAlias, 
+                     unicode_db_directory + "/" + Filename, marshal.dumps(db))
+
+def _encode(Value):
+    """NumberSet --> bytes of interval boundaries; int and str remain."""
+    if not isinstance(Value, NumberSet): return Value
+    return array("q", [
+        x for interval in Value.get_intervals(PromiseToTreatWellF=True)
+          for x in (interval.begin, interval.end)
+    ]).tobytes()
+
+def _decode(Value):
+    if type(Value) != bytes: return Value
+    boundaries = array("q")
+    boundaries.frombytes(Value)
+    return NumberSet([
+        Interval(boundaries[i], boundaries[i+1]) for i in range(0, len(boundaries), 2)
+    ], ArgumentIsYoursF=True)
+
+def _decoupled(X):
+    """Number sets of the database must not be modified by the caller.
+
+    RETURNS: Clone of 'X', if 'X' is a NumberSet. 'X', else (int, str).
+    """
+    if isinstance(X, NumberSet): return X.clone()
+    return X
+
 class PropertyInfo:
     def __init__(self, Name, Alias, Type, RelatedPropertyInfoDB):
         """Alias = short form of Name or Value.
@@ -197,7 +249,7 @@ class PropertyInfo:
 
         if self.type == "Binary": 
             # Decouple, since we refer to an internal database
-            return deepcopy(self.code_point_db)
+            return _decoupled(self.code_point_db)
 
         adapted_value = Value.replace(" ", "_")
 
@@ -225,8 +277,8 @@ class PropertyInfo:
                        "Possible Values: " + \
                        self.get_value_list_help()
             # No need to decouple, since character is not a reference to
-            # internal database (for safety, do it)
-            return deepcopy(character_set)
+            # internal database.
+            return character_set
 
         if type(value) == list:
             result = NumberSet()
@@ -241,30 +293,58 @@ class PropertyInfo:
             if result is None:
                 return "%s/%s is not supported by Unicode database." % (self.name, repr(value))
 
-        # Reference to internal database --> decouple with 'deepcopy'
-        return deepcopy(result)
+        # Reference to internal database --> decouple
+        return _decoupled(result)
 
     def init_code_point_db(self):
+        """Loads the code point database of the property. The most used 
+        properties are taken from the prebuilt tables ('prebuilt.py'). Else,
+        the databases of all properties that are loaded from the same file are
+        cached (see 'read_cached_code_point_db()'). Later runs load only the 
+        cache of the property at hand.
+        """
+        file_name = self.get_database_file_name()
+        if file_name is None: return
+
+        self.code_point_db = prebuilt.get_code_point_db(self.alias)
+        if self.code_point_db is not None: return
+
+        self.code_point_db = read_cached_code_point_db(self.alias, file_name)
+        if self.code_point_db is not None: return
+
+        if   file_name == "UnicodeData.txt":
+            self.related_property_info_db.load_UnicodeData()
+        elif file_name == "CompositionExclusions.txt":
+            self.related_property_info_db.load_Composition_Exclusion()
+        elif self.type == "Binary":
+            self.related_property_info_db.load_binary_properties(file_name)
+        else:
+            self.code_point_db = load_db(file_name, "NumberSet", 0, 1)
+
+        for property in self.related_property_info_db.db.values():
+            if   property.code_point_db is None:                   continue
+            elif property.get_database_file_name() != file_name: continue
+            write_cached_code_point_db(property.alias, file_name, property.code_point_db)
 
+    def get_database_file_name(self):
+        """RETURNS: Name of the file in the Unicode database from which the 
+                    property's code point database is loaded. 
+                    None, if the property is not supported.
+        """
         if self.alias in ["na", "na1", "nv", "gc", "bc", "isc"]:
             # Name
             # Unicode 1 Name 
             # Numeric Value
             # General Category
             # Bidi Class
-            self.related_property_info_db.load_UnicodeData()
-            return
+            return "UnicodeData.txt"
         
         if self.type == "Catalog":
-            if   self.alias == "blk":
-                self.code_point_db = load_db("Blocks.txt",     "NumberSet", 0, 1)
-            elif self.alias == "age":
-                self.code_point_db = load_db("DerivedAge.txt", "NumberSet", 0, 1)
-            elif self.alias == "sc":
-                self.code_point_db = load_db("Scripts.txt",    "NumberSet", 0, 1)
-            else:
-                return
-
+            return {
+                "blk": "Blocks.txt",
+                "age": "DerivedAge.txt",
+                "sc":  "Scripts.txt",
+            }.get(self.alias)
 
         elif self.type == "Binary":
 
@@ -272,36 +352,35 @@ class PropertyInfo:
                     "Ext", "Hex", "Hyphen", "IDSB", "IDST", "Ideo", "Join_C",
                     "LOE", "NChar", "OAlpha", "ODI", "OGr_Ext", "OIDC", "OIDS",
                     "OLower", "OMath", "OUpper", "Pat_Syn", "Pat_WS", "QMark",
-                    "Radical", "SD", "STerm", "Term", "UIdeo", "VS", "WSpace"]:
+                    "Radical", "SD", "STerm", "Term", "UIdeo", "VS", "WSpace",
+                    "PCM", "RI"]:
 
-                filename = "PropList.txt"
+                return "PropList.txt"
 
             elif self.alias == "Bidi_M":
 
-                filename = "extracted/DerivedBinaryProperties.txt"
+                return "extracted/DerivedBinaryProperties.txt"
 
             elif self.alias in ["Alpha", "DI", "Gr_Base", "Gr_Ext",
-                    "Gr_Link", "IDC", "IDS", "Math", "Lower", "Upper", "XIDC", "XIDS" ]:
+                    "Gr_Link", "IDC", "IDS", "Math", "Lower", "Upper", "XIDC", "XIDS",
+                    "Cased", "CI", "CWL", "CWU", "CWT", "CWCF", "CWCM" ]:
 
-                filename = "DerivedCoreProperties.txt"
+                return "DerivedCoreProperties.txt"
 
-            elif self.alias == "Comp_Ex":
+            elif self.alias in ["Comp_Ex", "XO_NFD", "XO_NFC", "XO_NFKD", "XO_NFKC", "CWKCF"]:
 
-                filename = "DerivedNormalizationProps.txt"
+                return "DerivedNormalizationProps.txt"
 
             elif self.alias == "CE":
 
-                self.related_property_info_db.load_Composition_Exclusion()
-                return
+                return "CompositionExclusions.txt"
 
             else:
-                return
-                   
-            self.related_property_info_db.load_binary_properties(filename)
+                return None
 
         elif self.type == "Enumerated":
             try:
-                filename = {
+                return {
                         "Numeric_Type":              "extracted/DerivedNumericType.txt",
                         "Joining_Type":              "extracted/DerivedJoiningType.txt",
                         "Joining_Group":             "extracted/DerivedJoiningGroup.txt",
@@ -316,12 +395,10 @@ class PropertyInfo:
                     }[self.name]
             except:
                 print("warning: no database file for property `%s'." % self.name)
-                return
+                return None
 
-            self.code_point_db = load_db(filename, "NumberSet", 0, 1)
-
-        elif self.type == "Miscellaneous":
-            pass # see first check
+        else: # "Miscellaneous", see first check
+            return None
 
     def get_value_list_help(self, MaxN=20, OpeningBracket="", ClosingBracket=""):
         if self.code_point_db is None:
@@ -568,9 +645,9 @@ class PropertyInfoDB:
         self.db["isc"].code_point_db = iso_comment_db       # ISO_Comment
 
     def map_code_point_to_character_name(self, CodePoint):
-        if self.db["na"].code_point_db is None:
-            self.load_UnicodeData()
         if len(self.__code_point_to_name_db) == 0:
+            for alias in ("na", "na1"):
+                if self.db[alias].code_point_db is None: self.db[alias].init_code_point_db()
             for key, value in list(self.db["na"].code_point_db.items()):
                 self.__code_point_to_name_db[value] = key
             for key, value in list(self.db["na1"].code_point_db.items()):
@@ -0,0 +1,181 @@
+# Project Quex (http://quex.sourceforge.net); License: MIT;
+# (C) 2005-2020 Frank-Rene Schaefer;
+#_______________________________________________________________________________
+"""Prebuilt interval tables of the most used Unicode properties: all binary
+properties, 'General_Category', 'Script', 'Block', and 'Age'.
+
+The tables are compiled from the Unicode database by
+
+        > python quex/engine/codec_db/unicode/prebuilt.py
+
+into the package data file 'database/prebuilt.bin'. On the first request, the
+file is mapped into memory (mmap). A property's number sets are created from
+the interval boundaries as they lie in the file. All users of the Unicode
+database ('ucs_property_db'), i.e. regular expressions, command line queries,
+and the identifier check in 'file_in', rely on the same tables. No text file
+of the Unicode database, in particular not 'UnicodeData.txt', is parsed for
+those properties.
+
+File layout:
+
+    [0:8]      'QXUCSTBL'
+    [8:16]     size of the index in bytes (little endian)
+    [16:...]   index ('marshal' format), padded to a multiple of 8 bytes.
+    [...]      interval boundaries: begin0, end0, begin1, end1, ...
+               (32 bit integers in the byte order of the builder)
+
+Index:
+
+    "byteorder": 'sys.byteorder' of the builder.
+    "source":    map: database file name --> SHA-1 digest of its content.
+    "property":  map: binary property alias --> (offset, count)
+                      other property alias  --> map: value --> (offset, count)
+
+where 'offset' and 'count' address interval boundaries. If the digest of a
+database file differs from the recorded one, the tables are ignored. The
+database files are then parsed, as without prebuilt tables.
+
+(C) Frank-Rene Schaefer
+"""
+import os
+import sys
+
+sys.path.insert(0, os.environ["QUEX_PATH"])
+
+from   quex.DEFINITIONS                   import QUEX_PATH
+from   quex.engine.misc.interval_handling import Interval, NumberSet
+
+from   array import array
+import hashlib
+import marshal
+import mmap
+
+FILE_NAME      = QUEX_PATH + "/quex/engine/codec_db/unicode/database/prebuilt.bin"
+MAGIC          = b"QXUCSTBL"
+CATALOG_LIST   = ["gc", "sc", "blk", "age"]   # prebuilt non-binary properties
+
+_loaded_f = False
+_table    = None   # (boundaries, property index); None if not available.
+
+def get_code_point_db(PropertyAlias):
+    """RETURNS: Code point database of the property as it is produced by the
+                parser: a NumberSet for binary properties, a map from value
+                to NumberSet else.
+                None, if the property is not prebuilt.
+    """
+    global _loaded_f
+    global _table
+    if not _loaded_f:
+        _table    = _load(FILE_NAME)
+        _loaded_f = True
+    if _table is None: return None
+
+    boundaries, property_db = _table
+    entry = property_db.get(PropertyAlias)
+    if   entry is None:        return None
+    elif type(entry) == tuple: return _number_set(boundaries, entry)
+    return dict(
+        (value, _number_set(boundaries, x)) for value, x in entry.items()
+    )
+
+def build(FileName=FILE_NAME):
+    """Parses the Unicode database and writes the prebuilt tables to 'FileName'.
+    """
+    global _loaded_f
+    global _table
+    from quex.engine.codec_db.unicode.parser import ucs_property_db, \
+                                                    unicode_db_directory
+
+    # Tables of a previous build must not be considered.
+    _loaded_f = True
+    _table    = None
+
+    ucs_property_db.init_db()
+    property_list = sorted(
+        (property for property in ucs_property_db.db.values()
+         if property.type == "Binary" or property.alias in CATALOG_LIST),
+        key=lambda property: property.alias
+    )
+
+    boundaries  = array("i")
+    property_db = {}
+    source_db   = {}
+    def append(CharacterSet):
+        offset = len(boundaries)
+        for interval in CharacterSet.get_intervals(PromiseToTreatWellF=True):
+            boundaries.append(interval.begin)
+            boundaries.append(interval.end)
+        return (offset, len(boundaries) - offset)
+
+    for property in property_list:
+        if property.code_point_db is None: property.init_code_point_db()
+        if property.code_point_db is None: continue  # not supported
+
+        if property.type == "Binary":
+            property_db[property.alias] = append(property.code_point_db)
+        else:
+            property_db[property.alias] = dict(
+                (value, append(property.code_point_db[value]))
+                for value in sorted(property.code_point_db)
+            )
+        file_name            = property.get_database_file_name()
+        source_db[file_name] = _get_digest(unicode_db_directory + "/" + file_name)
+
+    index = marshal.dumps({
+        "byteorder": sys.byteorder,
+        "source":    source_db,
+        "property":  property_db,
+    })
+    with open(FileName, "wb") as fh:
+        fh.write(MAGIC)
+        fh.write(len(index).to_bytes(8, "little"))
+        fh.write(index)
+        fh.write(b"\0" * (_aligned(16 + len(index)) - 16 - len(index)))
+        fh.write(boundaries.tobytes())
+
+def _load(FileName):
+    """RETURNS: (boundaries, property index)
+                None, if the file is not present or does not fit the Unicode
+                database.
+    """
+    from quex.engine.codec_db.unicode.parser import unicode_db_directory
+
+    try:
+        with open(FileName, "rb") as fh:
+            content = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+    except (OSError, ValueError):
+        return None
+
+    if content[:8] != MAGIC: return None
+    index_end = 16 + int.from_bytes(content[8:16], "little")
+    try:    index = marshal.loads(content[16:index_end])
+    except: return None
+    if index.get("byteorder") != sys.byteorder: return None
+
+    for file_name, digest in index["source"].items():
+        try:
+            if _get_digest(unicode_db_directory + "/" + file_name) != digest: return None
+        except OSError:
+            return None
+
+    boundaries = memoryview(content)[_aligned(index_end):].cast("i")
+    return boundaries, index["property"]
+
+def _number_set(Boundaries, Entry):
+    offset, count = Entry
+    x = Boundaries[offset:offset + count]
+    return NumberSet([
+        Interval(x[i], x[i+1]) for i in range(0, count, 2)
+    ], ArgumentIsYoursF=True)
+
+def _get_digest(FileName):
+    with open(FileName, "rb") as fh:
+        return hashlib.sha1(fh.read()).digest()
+
+def _aligned(Position):
+    return (Position + 7) & ~7
+
+if __name__ == "__main__":
+    # The parser refers to the module by its name, not as '__main__'.
+    import quex.engine.codec_db.unicode.prebuilt as prebuilt
+    prebuilt.build()
@@ -0,0 +1,362 @@
+# Project Quex (http://quex.sourceforge.net); License: MIT;
+# (C) 2005-2020 Frank-Rene Schaefer;
+#_______________________________________________________________________________
+"""Micro-benchmarks for the primitives that dominate generator run time.
+
+    > python $QUEX_PATH/quex/engine/misc/benchmark.py [options]
+
+    --repeat N        Number of measurements per benchmark (default 5).
+                      The best and the mean time are reported.
+    --select Name     Run only benchmarks whose name contains 'Name'.
+                      May be given multiple times.
+    --output File     Write the JSON report to 'File' instead of stdout.
+    --list            Print the benchmark names and exit.
+
+The report is a JSON object. Its 'results' contain one entry per benchmark:
+
+    { "name": ..., "n": operations per measurement,
+      "best_s": ..., "mean_s": ..., "repeat": ... }
+
+Times are seconds per measurement (not per operation). Reports of different
+quex versions on the same machine can be compared entry by entry.
+
+Data: Unicode property sets (from the Unicode database), codec tables (from
+'codec_db/database/*.dat'), and synthetic worst cases, i.e. sets of many tiny
+intervals and target maps with many intersecting trigger sets.
+"""
+import os
+import sys
+
+sys.path.insert(0, os.environ["QUEX_PATH"])
+
+from   quex.DEFINITIONS                                  import QUEX_VERSION
+import quex.engine.misc.interval_handling                as     interval_handling
+from   quex.engine.misc.interval_handling                import Interval, \
+                                                                NumberSet, \
+                                                                NumberSet_All
+from   quex.engine.codec_db.unicode.parser               import ucs_property_db
+import quex.engine.codec_db.core                         as     codec_db
+from   quex.engine.state_machine.state.target_map        import TargetMap
+from   quex.engine.state_machine.state.target_map_ops    import get_elementary_trigger_sets
+from   quex.engine.state_machine.core                    import DFA
+import quex.engine.state_machine.algorithm.hopcroft_minimization as hopcroft
+import quex.engine.state_machine.algorithm.minimizer     as     minimizer
+import quex.engine.state_machine.algorithm.nfa_to_dfa    as     nfa_to_dfa
+import quex.engine.state_machine.algorithm.alphabet      as     alphabet
+import quex.engine.state_machine.algebra.reverse         as     reverse
+
+import json
+import platform
+import random
+import time
+
+# Unicode properties that appear frequently in lexer specifications.
+UNICODE_PROPERTY_LIST = [
+    ("Script",           "Latin"),
+    ("Script",           "Greek"),
+    ("Script",           "Han"),
+    ("General_Category", "L"),
+    ("General_Category", "Lu"),
+    ("General_Category", "Nd"),
+    ("ID_Start",         None),
+    ("ID_Continue",      None),
+    ("White_Space",      None),
+]
+
+CODEC_LIST = [ "cp037", "cp1252", "iso8859_7", "koi8_r" ]
+
+class Benchmark:
+    def __init__(self, Name, Prepare):
+        """Name     -- Identifier reported in the JSON output.
+           Prepare  -- Function without arguments that sets up the data and
+                       returns (function, N), where 'function' is measured
+                       and 'N' is the number of operations done by one call.
+
+        Data is only set up for benchmarks that are run.
+        """
+        self.name    = Name
+        self.prepare = Prepare
+
+    def run(self, RepeatN):
+        function, n = self.prepare()
+        function() # warm up
+
+        time_list = []
+        for i in range(RepeatN):
+            t0 = time.perf_counter()
+            function()
+            time_list.append(time.perf_counter() - t0)
+
+        return {
+            "name":   self.name,
+            "n":      n,
+            "best_s": min(time_list),
+            "mean_s": sum(time_list) / len(time_list),
+            "repeat": RepeatN,
+        }
+
+def _once(Function):
+    """RETURNS: Function that calls 'Function' at its first call, and returns 
+                the same result at any call.
+    """
+    result = []
+    def function():
+        if not result: result.append(Function())
+        return result[0]
+    return function
+
+#______________________________________________________________________________
+# DATA
+#
+def unicode_sets():
+    return [
+        ucs_property_db.get_character_set(property_name, value)
+        for property_name, value in UNICODE_PROPERTY_LIST
+    ]
+
+def codec_tables():
+    """RETURNS: List of (codec name, function that returns the codec's table).
+    """
+    def load(FileName):
+        table = []
+        codec_db.load(table, FileName, ExitOnErrorF=True)
+        return table
+
+    result = []
+    for codec in CODEC_LIST:
+        codec_name, file_name = codec_db.get_file_name_for_codec_alias(codec)
+        result.append((codec_name, _once(lambda file_name=file_name: load(file_name))))
+    return result
+
+def synthetic_comb(IntervalN, Offset=0, Step=4):
+    """RETURNS: NumberSet of 'IntervalN' tiny intervals which are separated
+                by gaps. Worst case for all operations that iterate over
+                intervals.
+    """
+    return NumberSet([
+        Interval(Offset + i * Step, Offset + i * Step + Step // 2) for i in range(IntervalN)
+    ], ArgumentIsYoursF=True)
+
+def synthetic_random(IntervalN, Seed, Range=0x110000):
+    rand = random.Random(Seed)
+    result = NumberSet()
+    for i in range(IntervalN):
+        begin = rand.randrange(Range)
+        result.add_interval(Interval(begin, begin + rand.randrange(1, 64)))
+    return result
+
+def target_map(TriggerSetList):
+    tm = TargetMap()
+    for target_si, trigger_set in enumerate(TriggerSetList):
+        tm.add_transition(trigger_set, target_si)
+    return tm
+
+def synthetic_trie(WordN, Seed, Alphabet="abcdefghij", LengthMax=12):
+    """RETURNS: DFA that matches 'WordN' random words. Its states form a tree,
+                so that all states at the end of words are equivalent, as 
+                well as many states with common suffixes.
+    """
+    rand   = random.Random(Seed)
+    result = DFA()
+    for i in range(WordN):
+        si = result.init_state_index
+        for letter in (rand.choice(Alphabet) for k in range(rand.randint(1, LengthMax))):
+            target_si = result.states[si].target_map.get_resulting_target_state_index(ord(letter))
+            if target_si is None: 
+                target_si = result.add_transition(si, ord(letter))
+            si = target_si
+        result.states[si].set_acceptance(True)
+    return result
+
+def synthetic_chain(SetList, Length):
+    """RETURNS: DFA of 'Length' states in a row; each state triggers on all 
+                sets in 'SetList' to the next state.
+    """
+    result = DFA()
+    si     = result.init_state_index
+    for i in range(Length):
+        target_si = result.create_new_state(AcceptanceF=(i == Length - 1))
+        for trigger_set in SetList:
+            result.add_transition(si, trigger_set, target_si)
+        si = target_si
+    return result
+
+#______________________________________________________________________________
+# BENCHMARKS
+#
+# Data is passed as functions that return it (see '_once()'), so that it is
+# set up only when a benchmark needs it.
+#
+def _pairwise(Name, GetSetList, Operation):
+    def prepare():
+        pair_list = [ (x, y) for x in GetSetList() for y in GetSetList() ]
+        def function():
+            for x, y in pair_list:
+                Operation(x, y)
+        return function, len(pair_list)
+    return Benchmark(Name, prepare)
+
+def _each(Name, GetSetList, Operation):
+    return Benchmark(Name, lambda: _each_function(GetSetList(), Operation))
+
+def _each_function(SetList, Operation):
+    def function():
+        for x in SetList:
+            Operation(x)
+    return function, len(SetList)
+
+def number_set_benchmarks(Prefix, GetSetList):
+    universe = NumberSet_All()
+    def union_of_many():
+        set_list = GetSetList()
+        return lambda: NumberSet.from_union_of_iterable(set_list), len(set_list)
+    return [
+        _pairwise("%s/union" % Prefix,           GetSetList, lambda x, y: x.union(y)),
+        _pairwise("%s/intersection" % Prefix,    GetSetList, lambda x, y: x.intersection(y)),
+        _pairwise("%s/has_intersection" % Prefix, GetSetList, lambda x, y: x.has_intersection(y)),
+        _pairwise("%s/subtract" % Prefix,        GetSetList, lambda x, y: x.clone().subtract(y)),
+        _each("%s/complement" % Prefix,          GetSetList, lambda x: x.get_complement(universe)),
+        Benchmark("%s/union_of_many" % Prefix,   union_of_many),
+    ]
+
+def trigger_set_benchmarks(Prefix, GetSetList):
+    get_tm = _once(lambda: target_map(GetSetList()))
+    def prepare(Operation):
+        tm = get_tm()
+        return (lambda: Operation(tm)), 1
+    return [
+        Benchmark("%s/get_elementary_trigger_sets" % Prefix,
+                  lambda: prepare(get_elementary_trigger_sets)),
+        Benchmark("%s/get_trigger_set_line_up" % Prefix,
+                  lambda: prepare(lambda tm: tm.get_trigger_set_line_up())),
+    ]
+
+def transform_benchmarks(Prefix, GetSetList, TableList):
+    """TableList: list of (codec name, function that returns the table).
+    """
+    def prepare(GetTable):
+        table = GetTable()
+        return _each_function(GetSetList(), lambda x: x.clone().transform_by_table(table))
+    return [
+        Benchmark("%s/transform_by_table/%s" % (Prefix, codec_name),
+                  lambda get_table=get_table: prepare(get_table))
+        for codec_name, get_table in TableList
+    ]
+
+def hopcroft_benchmarks(Prefix, GetDfa):
+    def prepare(Algorithm):
+        dfa = GetDfa()
+        return (lambda: hopcroft.do(dfa, CreateNewStateMachineF=True, Algorithm=Algorithm)), \
+               len(dfa.states)
+    return [
+        Benchmark("hopcroft/%s/%s" % (algorithm, Prefix),
+                  lambda algorithm=algorithm: prepare(algorithm))
+        for algorithm in ("homogeneity", "refinement")
+    ]
+
+def minimizer_benchmarks(Prefix, GetDfa):
+    def compressed():
+        # As in 'beautifier.do()': minimization runs on alphabet classes.
+        dfa       = GetDfa().clone()
+        partition = alphabet.do(dfa)
+        if partition is not None: partition.compress(dfa)
+        return dfa
+    get_compressed = _once(compressed)
+
+    def prepare(Algorithm):
+        dfa = get_compressed()
+        return (lambda: minimizer.do(dfa.clone(), Algorithm)), len(dfa.states)
+    return [
+        Benchmark("minimizer/%s/%s" % (algorithm, Prefix),
+                  lambda algorithm=algorithm: prepare(algorithm))
+        for algorithm in ("hopcroft", "valmari", "brzozowski", "auto")
+    ]
+
+def reverse_benchmarks(Prefix, GetDfa):
+    """Reversal of a DFA, e.g. for pre-contexts, with and without 'Brzozowski's
+    shortcut' (see 'algebra/reverse.py').
+    """
+    def prepare(ShortcutF):
+        dfa = GetDfa()
+        return (lambda: reverse.do(dfa, BrzozowskiF=ShortcutF)), len(dfa.states)
+    return [
+        Benchmark("reverse/%s/%s" % (name, Prefix), 
+                  lambda shortcut_f=shortcut_f: prepare(shortcut_f))
+        for name, shortcut_f in (("beautifier", False), ("brzozowski", True))
+    ]
+
+def get_benchmark_list():
+    ucs_set_list    = _once(unicode_sets)
+    comb_set_list   = _once(lambda: [ synthetic_comb(4096, Offset=i) for i in range(4) ])
+    random_set_list = _once(lambda: [ synthetic_random(1024, Seed=i) for i in range(16) ])
+
+    # Set of many small table entries as worst case for 'transform_by_table'.
+    comb_table      = lambda: [ [i * 3, i * 3 + 2, 0x10000 + i * 2] for i in range(8192) ]
+
+    # Reversed DFAs as they appear for pre-contexts.
+    reversed_trie   = lambda: nfa_to_dfa.do(reverse.do(synthetic_trie(8, Seed=1), EnsureDFA_f=False))
+    reversed_chain  = lambda: nfa_to_dfa.do(reverse.do(synthetic_chain(ucs_set_list()[:3], 8), 
+                                                       EnsureDFA_f=False))
+
+    return   number_set_benchmarks("unicode", ucs_set_list) \
+           + number_set_benchmarks("comb",    comb_set_list) \
+           + number_set_benchmarks("random",  random_set_list) \
+           + trigger_set_benchmarks("unicode", ucs_set_list) \
+           + trigger_set_benchmarks("random",  random_set_list) \
+           + transform_benchmarks("unicode", ucs_set_list, codec_tables()) \
+           + transform_benchmarks("comb",    comb_set_list, [("comb", comb_table)]) \
+           + hopcroft_benchmarks("trie",    _once(lambda: synthetic_trie(2000, Seed=0))) \
+           + hopcroft_benchmarks("unicode", _once(lambda: synthetic_chain(ucs_set_list()[:3], 64))) \
+           + minimizer_benchmarks("trie-20",    lambda: synthetic_trie(20, Seed=0)) \
+           + minimizer_benchmarks("trie-200",   lambda: synthetic_trie(200, Seed=0)) \
+           + minimizer_benchmarks("trie-2000",  lambda: synthetic_trie(2000, Seed=0)) \
+           + minimizer_benchmarks("unicode-64", lambda: synthetic_chain(ucs_set_list()[:3], 64)) \
+           + minimizer_benchmarks("unicode-1024", lambda: synthetic_chain(ucs_set_list(), 1024)) \
+           + minimizer_benchmarks("reversed-trie",    reversed_trie) \
+           + minimizer_benchmarks("reversed-unicode", reversed_chain) \
+           + reverse_benchmarks("trie-8",    _once(lambda: synthetic_trie(8, Seed=1))) \
+           + reverse_benchmarks("trie-200",  _once(lambda: synthetic_trie(200, Seed=1))) \
+           + reverse_benchmarks("unicode-8", _once(lambda: synthetic_chain(ucs_set_list()[:3], 8)))
+
+def environment_info():
+    return {
+        "quex_version": QUEX_VERSION,
+        "python":       platform.python_version(),
+        "platform":     platform.platform(),
+        "number_set":   NumberSet.__name__,
+        "numpy":        interval_handling.numpy is not None,
+    }
+
+def do(RepeatN=5, SelectionList=None):
+    """RETURNS: Report (a dictionary) which can be dumped as JSON."""
+    result = []
+    for benchmark in get_benchmark_list():
+        if SelectionList and not any(x in benchmark.name for x in SelectionList):
+            continue
+        result.append(benchmark.run(RepeatN))
+
+    report = environment_info()
+    report["results"] = result
+    return report
+
+def _argument_list(Option):
+    return [
+        sys.argv[i+1] for i, arg in enumerate(sys.argv[:-1]) if arg == Option
+    ]
+
+if __name__ == "__main__":
+    if "--list" in sys.argv:
+        for benchmark in get_benchmark_list():
+            print(benchmark.name)
+        sys.exit(0)
+
+    repeat_n    = int((_argument_list("--repeat") or ["5"])[-1])
+    output_list = _argument_list("--output")
+
+    report = do(repeat_n, _argument_list("--select"))
+    txt    = json.dumps(report, indent=4, sort_keys=True)
+    if not output_list:
+        print(txt)
+    else:
+        with open(output_list[-1], "w") as fh:
+            fh.write(txt + "\n")
@@ -0,0 +1,71 @@
+# Project Quex (http://quex.sourceforge.net); License: MIT;
+# (C) 2005-2020 Frank-Rene Schaefer; 
+#_______________________________________________________________________________
+"""Cache for data derived from database files of the installation, such as the
+codec tables or the Unicode database. Parsing the text files is done once;
+later runs read the data in binary form. The results of parsing input files
+are stored as well, if 'QUEX_CACHE_PATH' is set explicitly (see 
+'quex/input/files/parse_cache.py').
+
+A cached file is stored as
+
+          $QUEX_CACHE_PATH/QUEX_VERSION/Category/Name
+
+It starts with the SHA-1 digest of the file from which it is derived. It is 
+valid, as long as the digest matches. Failures to read or write the cache are
+not errors. The data is then derived from the original file, as without cache.
+If 'QUEX_CACHE_PATH' is set to an empty string, nothing is cached.
+
+(C) Frank-Rene Schaefer
+"""
+from   quex.DEFINITIONS import QUEX_CACHE_PATH, QUEX_VERSION
+import hashlib
+import os
+
+def read(Category, Name, SourceFileName):
+    """RETURNS: Content (bytes) of the cached file. 
+                None, if there is no valid cached file.
+    """
+    file_name = _get_file_name(Category, Name)
+    if file_name is None: return None
+    try:
+        with open(file_name, "rb") as fh:
+            content = fh.read()
+        digest = _get_digest(SourceFileName)
+    except OSError:
+        return None
+
+    if not content.startswith(digest): return None
+    return content[len(digest):]
+
+def write(Category, Name, SourceFileName, Content):
+    """Stores 'Content' (bytes) in the cache. The file is written under a
+    temporary name and then renamed, so that concurrent readers never see a
+    partially written file.
+    """
+    file_name = _get_file_name(Category, Name)
+    if file_name is None: return
+    tmp_file_name = "%s.%i.tmp" % (file_name, os.getpid())
+    try:
+        digest = _get_digest(SourceFileName)
+        os.makedirs(os.path.dirname(file_name), exist_ok=True)
+        with open(tmp_file_name, "wb") as fh:
+            fh.write(digest)
+            fh.write(Content)
+        os.replace(tmp_file_name, file_name)
+    except OSError:
+        return
+
+_digest_db = {} # map: source file name --> digest
+
+def _get_digest(SourceFileName):
+    result = _digest_db.get(SourceFileName)
+    if result is None:
+        with open(SourceFileName, "rb") as fh:
+            result = hashlib.sha1(fh.read()).digest()
+        _digest_db[SourceFileName] = result
+    return result
+
+def _get_file_name(Category, Name):
+    if not QUEX_CACHE_PATH: return None
+    return os.path.join(QUEX_CACHE_PATH, QUEX_VERSION, Category, Name)
@@ -1,6 +1,8 @@
 # Project Quex (http://quex.sourceforge.net); License: MIT;
 # (C) 2005-2020 Frank-Rene Schaefer; 
 #_______________________________________________________________________________
+from   quex.engine.misc.unistream import UniStreamText
+
 import os
 import sys
 
@@ -15,6 +17,17 @@ def open_file_or_die(FileName, Mode="r", Env=None, CodecCheckF=True, Encoding="u
         sys.exit(-1)
     return fh
 
+def open_text_stream_or_die(FileName, Encoding="utf-8-sig"):
+    """RETURNS: UniStreamText on the content of the file. The file is read at 
+                once, so that parsers do not read it character by character.
+
+    Encoding errors raise 'UnicodeDecodeError'.
+    """
+    fh  = open_file_or_die(FileName, Encoding=Encoding)
+    try:     txt = fh.read()
+    finally: fh.close()
+    return UniStreamText(txt, FileName, FileF=True)
+
 def get_file_content_or_die(FileName, Mode="r"):
     fh  = open_file_or_die(FileName, Mode)
     txt = fh.read()
@@ -9,6 +9,18 @@
 #     NumberSet: A non-continous set of numbers consisting of
 #                described as a set of intervals.
 #
+#     FlatNumberSet: Same interface as 'NumberSet', but the set is stored
+#                in a single flat array of sorted interval boundaries.
+#
+# The environment variable 'QUEX_NUMBER_SET' selects the implementation that
+# is exported under the name 'NumberSet':
+#
+#     QUEX_NUMBER_SET=list  (default) list of 'Interval' objects.
+#     QUEX_NUMBER_SET=flat  flat boundary array, i.e. 'FlatNumberSet'.
+#
+# If NumPy is installed, bulk operations on large sets ('transform_by_table',
+# 'contains_many') are vectorized. Without NumPy, pure Python is used.
+#
 # ABSOLUTELY NO WARRANTY
 ################################################################################
 
@@ -20,8 +32,22 @@ from   quex.engine.misc.tools import r_enumerate, \
                                      flatten
 from   quex.constants         import INTEGER_MAX
 
+from   array     import array
+from   bisect    import bisect_left, bisect_right
 from   copy      import copy
 from   itertools import islice
+from   operator  import attrgetter
+import heapq
+import os
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+# Minimum number of intervals (or numbers) for which bulk operations are done
+# with NumPy. Below, the conversion to and from arrays dominates.
+NUMPY_BULK_SIZE_MIN = 128
 
 
 class Interval(object):
@@ -172,13 +198,12 @@ class Interval(object):
         result        = []
         end   = self.end
         begin = self.begin
-        for i, entry  in enumerate(TrafoInfo): 
-            source_begin, source_end, target_begin = entry
-            if source_end > begin: break
-        else: 
+        L     = len(TrafoInfo)
+        i     = _table_bisect(TrafoInfo, begin)
+        if i == L: 
             return False, []
+        source_begin, source_end, target_begin = TrafoInfo[i]
 
-        L = len(TrafoInfo)
         while source_begin < end:
             current_begin = max(begin, source_begin)
             offset_begin  = current_begin - source_begin
@@ -367,10 +392,28 @@ class NumberSet(object):
 
     @staticmethod
     def from_union_of_iterable(Iterable):
-        result = NumberSet()
-        for x in Iterable:
-            result.unite_with(x)
-        return result
+        return NumberSet.union_of_many(Iterable)
+
+    @staticmethod
+    def union_of_many(Iterable):
+        """Iterable = NumberSet-s or Interval-s to be united.
+
+        The sorted interval lists of all sets are merged through a heap. Thus,
+        'k' sets are united in a single pass over all of their intervals,
+        instead of 'k-1' consecutive pairwise unions.
+
+        RETURNS: NumberSet containing the union.
+        """
+        interval_list_list = [
+            x.__intervals if x.__class__ == NumberSet else [ x ]
+            for x in Iterable
+        ]
+        result = []
+        for x in heapq.merge(*interval_list_list, key=attrgetter("begin")):
+            if   x.begin == x.end:                     continue
+            elif not result or x.begin > result[-1].end: result.append(Interval(x.begin, x.end))
+            elif x.end > result[-1].end:               result[-1].end = x.end
+        return NumberSet(result, ArgumentIsYoursF=True)
 
     @staticmethod
     def from_IntervalList(IntervalList):
@@ -454,6 +497,9 @@ class NumberSet(object):
         if L == 0 or X.begin > self.__intervals[-1].end:
             self.__intervals.append(Interval(X.begin, X.end))
             return
+        elif X.begin == self.__intervals[-1].end:
+            self.__intervals[-1].end = X.end
+            return
 
         for i, y in enumerate(self.__intervals):
             # possible cases:
@@ -508,6 +554,15 @@ class NumberSet(object):
         """
         return self.__bisect(Number) is not None
 
+    def contains_many(self, NumberList):
+        """RETURNS: List of booleans. Element 'i' is True, if and only if 
+                    'NumberList[i]' is in the NumberSet.
+        """
+        if numpy is not None and len(NumberList) >= NUMPY_BULK_SIZE_MIN:
+            return _numpy_contains_many(_flat_boundaries_of_interval_list(self.__intervals), 
+                                        NumberList)
+        return [ self.__bisect(x) is not None for x in NumberList ]
+
     def contains_only(self, Number):
         if   len(self.__intervals) != 1: return False
         x = self.__intervals[0]
@@ -635,10 +690,8 @@ class NumberSet(object):
             self.__intervals = new_intervals
             return
 
-        # simply add all intervals to one single set
-        for interval in Other.__intervals:
-            self.add_interval(interval)
-            # IDEA: hint = self.add_interval(interval, hint)
+        # Two-pointer merge over both sorted interval lists.
+        self.__intervals = _merge_union(self.__intervals, Other.__intervals)
 
     def union(self, Other):
         assert Other.__class__ in (Interval, NumberSet), \
@@ -676,16 +729,20 @@ class NumberSet(object):
         if   Other_end   < self_begin: return False
         elif Other_begin > self_end:   return False
 
-        for x in Other.__intervals:
-            if   x.end   < self_begin: continue
-            elif x.begin > self_end:   break
-            for y in self.__intervals:
-                # PASTE: Implement Interval::overlap() for performance reasons.
-                if   x.begin >= y.end:   continue
-                elif x.end   <= y.begin: break
-                # x.end > y.begin  (lacks condition: x.begin < y.end)
-                # y.end > x.begin  (lacks condition: y.begin < x.end)
-                elif x.begin < y.end or y.begin < x.end: return True
+        # Two-pointer walk: step forward in the list whose current interval 
+        # ends first, until two intervals overlap.
+        A  = self.__intervals
+        B  = Other.__intervals
+        La = len(A)
+        Lb = len(B)
+        i  = 0
+        k  = 0
+        while i != La and k != Lb:
+            x = A[i]
+            y = B[k]
+            if   x.end <= y.begin: i += 1
+            elif y.end <= x.begin: k += 1
+            else:                  return True
         return False
 
     def intersect_with(self, Other):
@@ -698,29 +755,7 @@ class NumberSet(object):
             self.__intervals = []
             return 
 
-        # For each interval to remain, it needs at least have an intersection
-        # with one of the other intervals. If such an intersection is found the
-        # interval of concern can be pruned appropriately.
-        Other_min_i = 0
-        result = []
-        for x in self.__intervals:
-            for i, y in enumerate(islice(Other_intervals, Other_min_i, None), Other_min_i):
-                if x.end    < y.begin: continue # not yet reached
-                Other_min_i = i
-                if x.begin >= y.end:   continue # overstepped 
-
-                # Here:                    x.end   
-                #                |---------------------------->
-                #                          x.begin
-                #            <-------------------------|
-                #         
-                #         -------|---------------------|--------
-                #             y.begin                y.end
-                begin = max(x.begin, y.begin)
-                end   = min(x.end, y.end)
-                if begin != end: result.append(Interval(begin, end))
-
-        self.__intervals = result
+        self.__intervals = _merge_intersection(self.__intervals, Other_intervals)
 
     def intersection(self, Other):
         assert Other.__class__ == Interval or Other.__class__ == NumberSet
@@ -747,12 +782,12 @@ class NumberSet(object):
             self.__intervals = []
             return
 
-        Begin = self.__intervals[0].begin
-        End   = self.__intervals[-1].end
-        for interval in Other.__intervals:
-            if interval.end   <= Begin: continue
-            if interval.begin >= End:   break
-            self.cut_interval(interval)
+        if    not Other.__intervals \
+           or Other.__intervals[0].begin >= self.__intervals[-1].end \
+           or Other.__intervals[-1].end  <= self.__intervals[0].begin:
+            return
+
+        self.__intervals = _merge_difference(self.__intervals, Other.__intervals)
 
     def cut_lesser(self, Begin):
         """Cuts out any range that is below 'Begin'."""
@@ -831,7 +866,7 @@ class NumberSet(object):
         
         # (*) determine if the interval has any intersection at all
         if    len(self.__intervals) == 0                          \
-           or CutInterval.begin >  self.__intervals[-1].end       \
+           or CutInterval.begin >= self.__intervals[-1].end       \
            or CutInterval.end   <= self.__intervals[0].begin:
             # (the cutting interval cannot cut out anything)
             return
@@ -888,24 +923,13 @@ class NumberSet(object):
     def difference(self, Other):
         assert Other.__class__ == Interval or Other.__class__ == NumberSet
 
-        clone = self.clone()
-
         if Other.__class__ == Interval: 
+            clone = self.clone()
             clone.cut_interval(Other)
             return clone
 
-        if len(self.__intervals) == 0:
-            return clone
-
-        Begin = self.__intervals[0].begin
-        End   = self.__intervals[-1].end
-        # note: there should be no internal overlaps according to 'add_interval'
-        for interval in Other.__intervals:
-            if interval.end   <= Begin: continue
-            if interval.begin >= End:   break
-            clone.cut_interval(interval)
-
-        return clone
+        return NumberSet(_merge_difference(self.__intervals, Other.__intervals), 
+                         ArgumentIsYoursF=True)
 
     def symmetric_difference(self, Other):
         """Finds the set of numbers that is either in self or in Other but not
@@ -921,47 +945,23 @@ class NumberSet(object):
               A|B   [---------------------------]      [------------]
               A&B             [----]    [----]
               A^B   [--------]     [----]    [--]      [------------]
+
+        The result is computed by a single sweep over the borders of both sets.
         """
-        clone0 = self.clone()
-        clone0.unite_with(Other)
+        if Other.__class__ == Interval: Other_intervals = [ Other ]
+        else:                           Other_intervals = Other.__intervals
 
-        clone1 = self.clone()
-        clone1.intersect_with(Other)
-        
-        clone0.subtract(clone1)
-        return clone0
+        return NumberSet(_merge_symmetric_difference(self.__intervals, Other_intervals), 
+                         ArgumentIsYoursF=True)
 
     def complement(self, UniversalSet):
         """Transforms self into NumberSet containing all values which are in 
         UniversalSet but not in self.
         """
-        if len(self.__intervals) == 0:
-            self.__intervals = UniversalSet.get_intervals()
-            return
+        if UniversalSet.__class__ == Interval: Universe_intervals = [ UniversalSet ]
+        else:                                  Universe_intervals = UniversalSet.__intervals
 
-        first = self.__intervals[0]
-        if first.begin != -INTEGER_MAX:
-            prev = Interval(-INTEGER_MAX, first.begin)
-            self.__intervals.insert(0, prev)
-            i    = 1
-        else:
-            i    = 0
-
-        prev = self.__intervals[i]
-        if i < len(self.__intervals) - 1:
-            for x in islice(self.__intervals, i+i, None):
-                prev.begin = prev.end
-                prev.end   = x.begin
-                prev       = x
-
-        last = self.__intervals[-1]
-        if last.end == INTEGER_MAX:
-            del self.__intervals[-1]
-        else:
-            last.begin = last.end
-            last.end   = INTEGER_MAX
-
-        self.intersect_with(UniversalSet)
+        self.__intervals = _merge_difference(Universe_intervals, self.__intervals)
 
     def get_complement(self, UniversalSet):
         """RETURNS: NumberSet containing all values X which are in UniversalSet
@@ -988,6 +988,15 @@ class NumberSet(object):
                        inconsistent state!
         """
 
+        if numpy is not None and len(self.__intervals) >= NUMPY_BULK_SIZE_MIN:
+            total_verdict, \
+            boundaries       = _numpy_transform_by_table(
+                                   _flat_boundaries_of_interval_list(self.__intervals), TrafoInfo)
+            self.__intervals = [ 
+                Interval(boundaries[i], boundaries[i+1]) for i in range(0, len(boundaries), 2)
+            ]
+            return total_verdict
+
         total_verdict = True
         result        = []
         for interval in self.__intervals:
@@ -1122,6 +1131,665 @@ class NumberSet(object):
         assert self.least_greater_bound() <= Supremum, \
                "FAIL: %s <= %s" % (self.least_greater_bound(), Supremum)
 
+def _merge_union(A, B):
+    """Unites the sorted, non-touching interval lists 'A' and 'B' by a single
+    two-pointer walk.
+
+    RETURNS: List of new intervals.
+    """
+    result = []
+    La     = len(A)
+    Lb     = len(B)
+    i      = 0
+    k      = 0
+    while i != La or k != Lb:
+        if   k == Lb:                  x = A[i]; i += 1
+        elif i == La:                  x = B[k]; k += 1
+        elif A[i].begin <= B[k].begin: x = A[i]; i += 1
+        else:                          x = B[k]; k += 1
+
+        if not result or x.begin > result[-1].end: result.append(Interval(x.begin, x.end))
+        elif x.end > result[-1].end:               result[-1].end = x.end
+    return result
+
+def _merge_intersection(A, B):
+    """RETURNS: List of new intervals which are covered by 'A' and 'B'."""
+    result = []
+    La     = len(A)
+    Lb     = len(B)
+    i      = 0
+    k      = 0
+    while i != La and k != Lb:
+        x     = A[i]
+        y     = B[k]
+        begin = x.begin if x.begin > y.begin else y.begin
+        end   = x.end   if x.end   < y.end   else y.end
+        if begin < end: result.append(Interval(begin, end))
+        # Step in the list whose current interval ends first.
+        if x.end < y.end: i += 1
+        else:             k += 1
+    return result
+
+def _merge_difference(A, B):
+    """RETURNS: List of new intervals which are covered by 'A' but not by 'B'."""
+    result = []
+    Lb     = len(B)
+    k      = 0
+    for x in A:
+        # Intervals in 'B' that end before 'x' cannot cut anything from it, 
+        # nor from any later interval in 'A'.
+        while k != Lb and B[k].end <= x.begin: k += 1
+
+        begin = x.begin
+        j     = k
+        while j != Lb and B[j].begin < x.end:
+            y = B[j]
+            if y.begin > begin: result.append(Interval(begin, y.begin))
+            if y.end >= x.end:  begin = x.end; break
+            begin  = y.end
+            j     += 1
+        if begin < x.end: result.append(Interval(begin, x.end))
+    return result
+
+def _merge_symmetric_difference(A, B):
+    """RETURNS: List of new intervals which are covered by either 'A' or 'B',
+                but not by both.
+    """
+    boundaries = _flat_sweep(_flat_boundaries_of_interval_list(A), 
+                             _flat_boundaries_of_interval_list(B), 
+                             _flat_xor)
+    return [ 
+        Interval(boundaries[i], boundaries[i+1]) for i in range(0, len(boundaries), 2) 
+    ]
+
+class FlatNumberSet(object):
+    """Represents an arbitrary set of numbers, same as 'NumberSet'. However,
+    the set is stored as ONE flat array of sorted interval boundaries:
+
+                  [ begin0, end0, begin1, end1, ... ]
+
+    The boundaries are strictly increasing, i.e. there are no empty intervals
+    and adjacent intervals are always combined. A number 'x' is element of
+    the set, if the number of boundaries '<= x' is odd.
+
+    No 'Interval' objects are kept. Set operations are done by a single sweep
+    over the boundary arrays. Functions which return intervals construct
+    them on demand.
+    """
+    __slots__ = ('__b',)
+
+    def __init__(self, Arg = None, ArgumentIsYoursF=False):
+        """Arg = list     ==> list of initial intervals
+           Arg = Interval ==> initial interval
+           Arg = integer  ==> interval consisting of one number
+           Arg = array    ==> sorted boundary array (no checks!)
+           """
+        arg_type = Arg.__class__
+
+        if   arg_type == list:
+            self.__b = _flat_from_interval_list(Arg)
+
+        elif arg_type == Interval:
+            if Arg.begin == Arg.end: self.__b = array('q')
+            else:                    self.__b = array('q', (Arg.begin, Arg.end))
+
+        elif arg_type == FlatNumberSet:
+            if ArgumentIsYoursF: self.__b = Arg.__b
+            else:                self.__b = array('q', Arg.__b)
+
+        elif arg_type == int:
+            self.__b = array('q', (Arg, Arg + 1))
+
+        elif arg_type == array:
+            if ArgumentIsYoursF: self.__b = Arg
+            else:                self.__b = array('q', Arg)
+
+        elif Arg is None:
+            self.__b = array('q')
+
+        else:
+            # list based 'NumberSet'
+            assert hasattr(Arg, "get_intervals"), "#Arg: '%s'" % Arg
+            self.__b = _flat_boundaries(Arg)
+
+    @staticmethod
+    def from_integer(Value):
+        return FlatNumberSet(Value)
+
+    @staticmethod
+    def from_integer_list(ValueList):
+        return FlatNumberSet.from_IntervalList([
+            Interval(value, value+1) for value in ValueList
+        ])
+
+    @staticmethod
+    def from_range(Begin, End):
+        return FlatNumberSet(Interval(Begin, End))
+
+    @staticmethod
+    def from_union_of_iterable(Iterable):
+        return FlatNumberSet.union_of_many(Iterable)
+
+    @staticmethod
+    def union_of_many(Iterable):
+        """Iterable = NumberSet-s or Interval-s to be united.
+
+        The (begin, end) pairs of all sets are merged through a heap. 
+
+        RETURNS: FlatNumberSet containing the union.
+        """
+        result = array('q')
+        for begin, end in heapq.merge(*[_flat_pairs(_flat_boundaries(x)) for x in Iterable]):
+            if   begin == end:                       continue
+            elif not result or begin > result[-1]:   result.extend((begin, end))
+            elif end > result[-1]:                   result[-1] = end
+        return FlatNumberSet(result, ArgumentIsYoursF=True)
+
+    @staticmethod
+    def from_IntervalList(IntervalList):
+        return FlatNumberSet(_flat_from_interval_list(IntervalList),
+                             ArgumentIsYoursF=True)
+
+    @staticmethod
+    def from_tuples(TupleList):
+        return FlatNumberSet.from_IntervalList([
+            Interval(x[0], x[1]) for x in TupleList
+        ])
+
+    def boundaries(self):
+        """RETURNS: The flat boundary array. It MUST NOT be modified."""
+        return self.__b
+
+    def clone(self):
+        return FlatNumberSet(array('q', self.__b), ArgumentIsYoursF=True)
+
+    @typed(Other=Interval)
+    def quick_append_interval(self, Other, SortF=True):
+        """This function assumes that there are no intersections with other intervals.
+           Use this function with caution. It is much faster than the 'union' function
+           or the function 'add_interval'.
+        """
+        b = self.__b
+        assert not b or b[-1] <= Other.begin
+        if   Other.begin == Other.end:    return
+        elif b and b[-1] == Other.begin: b[-1] = Other.end
+        else:                            b.extend((Other.begin, Other.end))
+
+    def quick_append_value(self, Value):
+        b = self.__b
+        if b and b[-1] == Value: b[-1] = Value + 1
+        else:                    b.extend((Value, Value + 1))
+
+    def add(self, X):
+        self.add_interval(Interval(X, X+1))
+
+    def add_interval(self, X):
+        """Adds an interval and ensures that no overlap with existing
+        intervals occurs. Only the boundaries inside 'X' are replaced.
+        """
+        if X.begin == X.end: return
+        b = self.__b
+        if not b or X.begin > b[-1]:
+            b.extend((X.begin, X.end))
+            return
+
+        i = bisect_left(b, X.begin)  # boundaries <  begin
+        k = bisect_right(b, X.end)   # boundaries <= end
+        # 'i' even => begin lies outside any interval => begin is new boundary.
+        # 'k' even => end lies outside any interval   => end is new boundary.
+        new = []
+        if not (i & 1): new.append(X.begin)
+        if not (k & 1): new.append(X.end)
+        b[i:k] = array('q', new)
+
+    def contains(self, Number):
+        """True  => if Number in NumberSet
+           False => else
+        """
+        return bool(bisect_right(self.__b, Number) & 1)
+
+    def contains_many(self, NumberList):
+        """RETURNS: List of booleans. Element 'i' is True, if and only if 
+                    'NumberList[i]' is in the NumberSet.
+        """
+        if numpy is not None and len(NumberList) >= NUMPY_BULK_SIZE_MIN:
+            return _numpy_contains_many(self.__b, NumberList)
+        b = self.__b
+        return [ bool(bisect_right(b, x) & 1) for x in NumberList ]
+
+    def contains_only(self, Number):
+        b = self.__b
+        return len(b) == 2 and b[0] == Number and b[1] == Number + 1
+
+    def has_size_one(self):
+        b = self.__b
+        return len(b) == 2 and b[1] - b[0] == 1
+
+    def minimum(self):
+        if not self.__b: return INTEGER_MAX   # i.e. an absurd value
+        else:            return self.__b[0]
+
+    def maximum(self):
+        if not self.__b: return -INTEGER_MAX  # i.e. an absurd value
+        else:            return self.__b[-1] - 1
+
+    def least_greater_bound(self):
+        if not self.__b: return - INTEGER_MAX # i.e. an absurd value
+        else:            return self.__b[-1]
+
+    def is_empty(self):
+        return not self.__b
+
+    def is_all(self):
+        b = self.__b
+        return len(b) == 2 and b[0] == -INTEGER_MAX and b[1] == INTEGER_MAX
+
+    def is_equal(self, Other):
+        return self.__b == _flat_boundaries(Other)
+
+    def is_superset(self, Other):
+        """True  -- if self covers Other
+           False -- if not
+        """
+        b     = self.__b
+        other = _flat_boundaries(Other)
+        for i in range(0, len(other), 2):
+            k = bisect_right(b, other[i])
+            # 'other[i]' must be inside an interval that extends to 'other[i+1]'
+            if not (k & 1) or b[k] < other[i+1]: return False
+        return True
+
+    def interval_number(self):
+        """This value gives some information about the 'complexity' of the number set."""
+        return len(self.__b) >> 1
+
+    def unite_with(self, Other):
+        if Other.__class__ == Interval:
+            self.add_interval(Other)
+            return
+        other = _flat_boundaries(Other)
+        if   not other:  return
+        elif not self.__b:
+            self.__b = array('q', other)
+        elif other[0] > self.__b[-1]:
+            self.__b.extend(other)
+        else:
+            self.__b = _flat_sweep(self.__b, other, _flat_or)
+
+    def union(self, Other):
+        clone = self.clone()
+        clone.unite_with(Other)
+        return clone
+
+    def has_intersection(self, Other):
+        b     = self.__b
+        other = _flat_boundaries(Other)
+        if not b or not other:                         return False
+        elif other[-1] <= b[0] or other[0] >= b[-1]:   return False
+
+        # Iterate over the set with less intervals, bisect in the other.
+        if len(other) > len(b): b, other = other, b
+        for i in range(0, len(other), 2):
+            k = bisect_right(b, other[i])
+            if   k & 1:                           return True
+            elif k != len(b) and b[k] < other[i+1]: return True
+        return False
+
+    def intersect_with(self, Other):
+        self.__b = _flat_sweep(self.__b, _flat_boundaries(Other), _flat_and)
+
+    def intersection(self, Other):
+        result = self.clone()
+        result.intersect_with(Other)
+        return result
+
+    def subtract(self, Other):
+        if Other.__class__ == Interval:
+            self.cut_interval(Other)
+            return
+        other = _flat_boundaries(Other)
+        if   not self.__b or not other:                                return
+        elif other is self.__b:                                        self.__b = array('q')
+        elif other[-1] <= self.__b[0] or other[0] >= self.__b[-1]:     return
+        else:
+            self.__b = _flat_sweep(self.__b, other, _flat_and_not)
+
+    def cut_lesser(self, Begin):
+        """Cuts out any range that is below 'Begin'."""
+        b = self.__b
+        i = bisect_right(b, Begin) # boundaries <= Begin
+        if i & 1: b[:i] = array('q', (Begin,))
+        else:     del b[:i]
+
+    def cut_greater_or_equal(self, End):
+        """Cuts out any range that is above or equal 'End'."""
+        b = self.__b
+        k = bisect_left(b, End)    # boundaries < End
+        if k & 1: b[k:] = array('q', (End,))
+        else:     del b[k:]
+
+    def mask(self, Begin, End):
+        """Begin = first element in range to include.
+           End   = first element after the range to include.
+        """
+        self.cut_lesser(Begin)
+        self.cut_greater_or_equal(End)
+
+    def mask_interval(self, X):
+        self.mask(X.begin, X.end)
+
+    def covers_range(self, Begin, End):
+        """RETURNS: True, if self covers from Begin to End all characters.
+                    False, if not.
+        (See 'NumberSet.covers_range()')
+        """
+        Begin = max(Begin, -INTEGER_MAX)
+        End   = min(End, INTEGER_MAX)
+        b     = self.__b
+        if   len(b) != 2:  return False
+        elif b[0] > Begin: return False
+        elif b[1] < End:   return False
+        else:              return True
+
+    def cut(self, Value):
+        self.cut_interval(Interval(Value, Value+1))
+
+    def cut_interval(self, CutInterval):
+        """Removes all numbers of 'CutInterval' from the set. Only the boundaries
+        inside 'CutInterval' are replaced.
+        """
+        assert CutInterval.__class__ == Interval
+        if CutInterval.is_empty(): return
+        b = self.__b
+        if not b or CutInterval.begin >= b[-1] or CutInterval.end <= b[0]: return
+
+        i = bisect_left(b, CutInterval.begin) # boundaries <  begin
+        k = bisect_right(b, CutInterval.end)  # boundaries <= end
+        # 'i' odd => begin lies inside an interval => begin becomes its end.
+        # 'k' odd => end lies inside an interval   => end becomes its begin.
+        new = []
+        if i & 1: new.append(CutInterval.begin)
+        if k & 1: new.append(CutInterval.end)
+        b[i:k] = array('q', new)
+
+    def difference(self, Other):
+        clone = self.clone()
+        clone.subtract(Other)
+        return clone
+
+    def symmetric_difference(self, Other):
+        """Finds the set of numbers that is either in self or in Other but not
+           in both. (See 'NumberSet.symmetric_difference()')
+        """
+        return FlatNumberSet(_flat_sweep(self.__b, _flat_boundaries(Other), _flat_xor),
+                             ArgumentIsYoursF=True)
+
+    def complement(self, UniversalSet):
+        """Transforms self into NumberSet containing all values which are in
+        UniversalSet but not in self.
+        """
+        self.__b = _flat_sweep(_flat_boundaries(UniversalSet), self.__b, _flat_and_not)
+
+    def get_complement(self, UniversalSet):
+        """RETURNS: NumberSet containing all values X which are in UniversalSet
+        but not in self.
+        """
+        result = self.clone()
+        result.complement(UniversalSet)
+        return result
+
+    @typed(TrafoInfo=list)
+    def transform_by_table(self, TrafoInfo):
+        """Transforms the number set according to the given TransformationInfo.
+        (See 'NumberSet.transform_by_table()')
+
+        RETURNS: True  transformation is complete.
+                 False transformation failed.
+        """
+        if numpy is not None and len(self.__b) >= 2 * NUMPY_BULK_SIZE_MIN:
+            total_verdict, boundaries = _numpy_transform_by_table(self.__b, TrafoInfo)
+            self.__b = array('q', boundaries)
+            return total_verdict
+
+        total_verdict = True
+        result        = []
+        for interval in self.get_intervals(PromiseToTreatWellF=True):
+            verdict, transformed = interval.transform_by_table(TrafoInfo)
+            if verdict == False: total_verdict = False
+            result.extend(transformed)
+        self.__b = _flat_from_interval_list(result)
+        return total_verdict
+
+    def clean(self, SortF=True):
+        """Boundaries are always kept sorted and combined. Nothing to be done."""
+        pass
+
+    def __repr__(self):
+        return repr(self.get_intervals(PromiseToTreatWellF=True))
+
+    def __cmp__(self, Other):
+        assert False, "No comparisons defined for class NumberSet"
+
+    def get_intervals(self, PromiseToTreatWellF=False):
+        """RETURNS: List of newly created intervals. Modifications to those
+                    intervals do not have an effect on the number set.
+        """
+        b = self.__b
+        return [ Interval(b[i], b[i+1]) for i in range(0, len(b), 2) ]
+
+    def get_number_list(self):
+        """RETURNS: -- List of all numbers which are contained in the number set.
+                    -- INTEGER_MAX borders, if one border is 'INTEGER_MAX'. The list
+                       would be too big.
+        """
+        b = self.__b
+        if   not b:                                           return []
+        elif b[0] == -INTEGER_MAX or b[-1] == INTEGER_MAX: return [-INTEGER_MAX, INTEGER_MAX-1]
+
+        return flatten(
+            range(b[i], b[i+1]) for i in range(0, len(b), 2)
+        )
+
+    def get_the_only_element(self):
+        if self.has_size_one(): return self.__b[0]
+        else:                   return None
+
+    def get_the_only_interval(self):
+        if len(self.__b) != 2: return None
+        else:                  return Interval(self.__b[0], self.__b[1])
+
+    def get_string(self, Option="", Delimiter=", "):
+        if not self.__b: return "<empty NumberSet>"
+        return "".join(
+            interval.get_string(Option, Delimiter) + " "
+            for interval in self.get_intervals(PromiseToTreatWellF=True)
+        )
+
+    def get_PythonCode(self):
+        b = self.__b
+        interval_txt = ", ".join(
+            "(0x%04X,0x%04X)" % (b[i], b[i+1]) for i in range(0, len(b), 2)
+        )
+        return "NumberSet.from_tuples([%s])" % interval_txt
+
+    def get_utf8_string(self):
+        return ", ".join(
+            interval.get_utf8_string()
+            for interval in self.get_intervals(PromiseToTreatWellF=True)
+        )
+
+    def UT_iterable_integers(self):
+        b = self.__b
+        for i in range(0, len(b), 2):
+            for x in range(b[i], b[i+1]):
+                yield x
+
+    def gnuplot_string(self, y_coordinate):
+        return "".join(
+            interval.gnuplot_string(y_coordinate) + "\n"
+            for interval in self.get_intervals(PromiseToTreatWellF=True)
+        )
+
+    def assert_consistency(self):
+        """Checks whether all boundaries are lined up propperly. That is, they
+        are strictly increasing and come in pairs.
+        """
+        b = self.__b
+        assert len(b) & 1 == 0, "%s" % b
+        for i in range(1, len(b)):
+            assert b[i-1] < b[i], "%s" % b
+
+    def assert_range(self, Minimum, Supremum):
+        assert self.minimum()  >= Minimum, \
+               "FAIL: %s >= %s" % (self.minimum(), Minimum)
+        assert self.least_greater_bound() <= Supremum, \
+               "FAIL: %s <= %s" % (self.least_greater_bound(), Supremum)
+
+def _flat_boundaries(X):
+    """RETURNS: Sorted boundary array of 'X' which may be a FlatNumberSet, a
+    NumberSet, or an Interval. The result MUST NOT be modified.
+    """
+    if   X.__class__ == FlatNumberSet:
+        return X.boundaries()
+    elif X.__class__ == Interval:
+        if X.begin == X.end: return array('q')
+        else:                return array('q', (X.begin, X.end))
+    else:
+        return _flat_boundaries_of_interval_list(X.get_intervals(PromiseToTreatWellF=True))
+
+def _flat_boundaries_of_interval_list(IntervalList):
+    """RETURNS: Boundary array of a sorted, non-touching interval list."""
+    return array('q', flatten((x.begin, x.end) for x in IntervalList))
+
+def _flat_pairs(Boundaries):
+    """YIELDS: (begin, end) pairs of the intervals in a boundary array."""
+    return zip(islice(Boundaries, 0, None, 2), islice(Boundaries, 1, None, 2))
+
+def _flat_from_interval_list(IntervalList):
+    """RETURNS: Boundary array for an arbitrary list of intervals. The
+    intervals may be unsorted, overlapping, touching, or empty.
+    """
+    result = array('q')
+    for x in sorted(IntervalList, key=lambda x: x.begin):
+        if   x.begin == x.end:                  continue
+        elif not result or x.begin > result[-1]: result.extend((x.begin, x.end))
+        elif x.end > result[-1]:                 result[-1] = x.end
+    return result
+
+def _flat_or(InA, InB):      return InA or InB
+def _flat_and(InA, InB):     return InA and InB
+def _flat_and_not(InA, InB): return InA and not InB
+def _flat_xor(InA, InB):     return InA != InB
+
+def _flat_sweep(A, B, Op):
+    """Sweeps once over the boundary arrays 'A' and 'B'. At any boundary the
+    membership in 'A' and 'B' is combined by 'Op'. Where the combined
+    membership changes, a boundary of the result is placed.
+
+    RETURNS: Boundary array of the resulting set.
+    """
+    result = array('q')
+    La     = len(A)
+    Lb     = len(B)
+    i      = 0
+    k      = 0
+    in_a   = False
+    in_b   = False
+    in_r   = False
+    while i != La or k != Lb:
+        if   k == Lb:    x = A[i]
+        elif i == La:    x = B[k]
+        elif A[i] < B[k]: x = A[i]
+        else:            x = B[k]
+        if i != La and A[i] == x: in_a = not in_a; i += 1
+        if k != Lb and B[k] == x: in_b = not in_b; k += 1
+        r = Op(in_a, in_b)
+        if r != in_r:
+            result.append(x)
+            in_r = r
+    return result
+
+def _table_bisect(TrafoInfo, Value):
+    """TrafoInfo = sorted list of [SourceBegin, SourceEnd, TargetBegin].
+
+    RETURNS: Index of the first entry where 'SourceEnd > Value'. 
+             len(TrafoInfo), if there is none.
+    """
+    lower = 0
+    upper = len(TrafoInfo)
+    while lower < upper:
+        i = (lower + upper) >> 1
+        if TrafoInfo[i][1] > Value: upper = i
+        else:                       lower = i + 1
+    return lower
+
+def _numpy_contains_many(Boundaries, NumberList):
+    """RETURNS: List of booleans telling whether the numbers in 'NumberList' 
+    are in the set given by the boundary array. 
+    """
+    boundaries = numpy.asarray(Boundaries, dtype=numpy.int64)
+    # Element of set <=> number of boundaries '<= x' is odd.
+    index      = numpy.searchsorted(boundaries, numpy.asarray(NumberList, dtype=numpy.int64), 
+                                    side="right")
+    return ((index & 1) == 1).tolist()
+
+def _numpy_transform_by_table(Boundaries, TrafoInfo):
+    """Vectorized version of 'NumberSet.transform_by_table()'. For each table
+    entry, the range of intervals that intersect its source range is found by
+    'searchsorted'. All (interval, entry) pairs are then clipped and translated
+    at once. The resulting intervals are sorted and combined.
+
+    RETURNS: [0] True, if all numbers have been transformed. False, else.
+             [1] Boundary list of the transformed set.
+    """
+    b       = numpy.asarray(Boundaries, dtype=numpy.int64)
+    begin   = b[0::2]
+    end     = b[1::2]
+    table   = numpy.asarray(TrafoInfo, dtype=numpy.int64).reshape(-1, 3)
+    s_begin = table[:, 0]
+    s_end   = table[:, 1]
+    t_begin = table[:, 2]
+
+    # Intervals [lo, hi) intersect with the source range of a table entry.
+    lo      = numpy.searchsorted(end,   s_begin, side="right")
+    hi      = numpy.searchsorted(begin, s_end,   side="left")
+    count   = numpy.maximum(hi - lo, 0)
+    total_n = int(count.sum())
+    if total_n == 0:
+        return len(begin) == 0, []
+
+    entry_i    = numpy.repeat(numpy.arange(len(table)), count)
+    interval_i =   numpy.repeat(lo, count) \
+                 + numpy.arange(total_n) - numpy.repeat(numpy.cumsum(count) - count, count)
+
+    clip_begin = numpy.maximum(begin[interval_i], s_begin[entry_i])
+    clip_end   = numpy.minimum(end[interval_i],   s_end[entry_i])
+    verdict    = int((clip_end - clip_begin).sum()) == int((end - begin).sum())
+
+    offset     = t_begin[entry_i] - s_begin[entry_i]
+    new_begin  = clip_begin + offset
+    new_end    = clip_end   + offset
+    order      = numpy.argsort(new_begin, kind="stable")
+    new_begin  = new_begin[order]
+    new_end    = new_end[order]
+
+    # An interval starts a new one, if it begins after all previous intervals.
+    max_end    = numpy.maximum.accumulate(new_end)
+    start_f    = numpy.empty(len(new_begin), dtype=bool)
+    start_f[0]  = True
+    start_f[1:] = new_begin[1:] > max_end[:-1]
+    start_i    = numpy.flatnonzero(start_f)
+    last_i     = numpy.append(start_i[1:] - 1, len(new_begin) - 1)
+
+    result       = numpy.empty(2 * len(start_i), dtype=numpy.int64)
+    result[0::2] = new_begin[start_i]
+    result[1::2] = max_end[last_i]
+    return verdict, result.tolist()
+
+# Selection of the implementation behind the name 'NumberSet'.
+if os.environ.get("QUEX_NUMBER_SET", "list") == "flat":
+    NumberSet = FlatNumberSet
+
 # Range of code points that are covered by Unicode
 def UnicodeInterval():
     return Interval(0x0, 0x110000)
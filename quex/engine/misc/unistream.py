@@ -1,6 +1,7 @@
 # Project Quex (http://quex.sourceforge.net); License: MIT;
 # (C) 2005-2020 Frank-Rene Schaefer; 
 #_______________________________________________________________________________
+from   bisect import bisect_right
 import io
 
 def UniStream(TextOrStream, Name=None, UnsetStringF=False):
@@ -11,7 +12,7 @@ def UniStream(TextOrStream, Name=None, UnsetStringF=False):
           -- provide output as text (not bytes as in BytesIO)
     """
     if   isinstance(TextOrStream, UniStreamBase): result = TextOrStream
-    elif isinstance(TextOrStream, str):           result = UniStreamBytesIO(TextOrStream, Name)
+    elif isinstance(TextOrStream, str):           result = UniStreamText(TextOrStream, Name)
     else:                                         result = UniStreamStream(TextOrStream)
 
     if UnsetStringF: result.unset_string_f()
@@ -56,25 +57,67 @@ class UniStreamStream(UniStreamBase):
         if self._not_a_string_anyway_f: return False
         return isinstance(self.stream, io.StringIO)
 
-class UniStreamBytesIO(UniStreamBase):
-    def __init__(self, Text, Name=None):
-        self.stringio = io.StringIO(Text)
-        if Name is not None: self._stream_name = Name
+class UniStreamText(UniStreamBase):
+    """Stream on a text in memory. Positions are indices into the text. So, 
+    'tell()' and 'seek()' are O(1) and positions may be used for slicing. 
+    Scanners may work directly on 'text' and 'position' (see 'match()'), 
+    instead of reading character by character.
+
+    FileF: True, if the text is the content of a file (see 'string_f()').
+    """
+    def __init__(self, Text, Name=None, FileF=False):
         UniStreamBase.__init__(self)
+        self.text     = Text
+        self.position = 0
+        self.file_f   = FileF
+        if Name is not None: self._stream_name = Name
+        self.__line_begin_list = None
 
     def read(self, N=None):
-        return self.stringio.read(N)
+        begin = self.position
+        if N is None or N < 0: self.position = len(self.text)
+        else:                  self.position = min(begin + N, len(self.text))
+        return self.text[begin:self.position]
 
     def readline(self):
-        return self.stringio.readline()
+        end = self.text.find("\n", self.position)
+        if end == -1: end = len(self.text)
+        else:         end += 1
+        return self.read(end - self.position)
 
     def tell(self):
-        return self.stringio.tell()
+        return self.position
 
     def seek(self, X, Y=io.SEEK_SET):
-        return self.stringio.seek(X, Y)
+        if   Y == io.SEEK_CUR: X += self.position
+        elif Y == io.SEEK_END: X += len(self.text)
+        self.position = max(0, min(X, len(self.text)))
+        return self.position
+
+    def match(self, Re):
+        """Matches the precompiled regular expression 'Re' at the current
+        position. If it matches, the position is set behind the match.
+
+        RETURNS: Match object; None, if 'Re' does not match.
+        """
+        result = Re.match(self.text, self.position)
+        if result is not None: self.position = result.end()
+        return result
+
+    def line_n(self, Position):
+        """RETURNS: Number of the line which contains 'Position' (first = 1).
+        """
+        if self.__line_begin_list is None:
+            self.__line_begin_list = [ 0 ]
+            i = self.text.find("\n")
+            while i != -1:
+                self.__line_begin_list.append(i + 1)
+                i = self.text.find("\n", i + 1)
+        return bisect_right(self.__line_begin_list, Position)
+
+    def close(self):
+        pass
 
     def string_f(self):
         if self._not_a_string_anyway_f: return False
-        return True
-
+        return not self.file_f
@@ -1,12 +1,22 @@
 # Project Quex (http://quex.sourceforge.net); License: MIT;
 # (C) 2005-2020 Frank-Rene Schaefer; 
 #_______________________________________________________________________________
-import quex.engine.state_machine.algebra.intersection as intersection
-import quex.engine.state_machine.algebra.complement   as complement
+from   quex.engine.state_machine.core            import DFA
+from   quex.engine.state_machine.algebra.product import Product
 
 def do(A, B): 
-    A_and_B     = intersection.do([A, B])
-    not_A_and_B = complement.do(A_and_B)
+    """Difference: It only remains in A what is not in A and B.
 
-    # Difference: It only remains in A what is not in A and B.
-    return intersection.do([A, not_A_and_B])
+    The product of 'A' and 'B' continues where 'B' drops out, but not where 
+    'A' drops out. It accepts where 'A' accepts and 'B' does not.
+    """
+    A.assert_consistency() 
+    B.assert_consistency() 
+
+    if A.is_Empty(): return DFA.Empty()
+
+    result = Product([A, B], OptionalList=[False, True]).materialize(
+        lambda AcceptanceTuple: AcceptanceTuple[0] and not AcceptanceTuple[1]
+    )
+    result.delete_hopeless_states()
+    return result
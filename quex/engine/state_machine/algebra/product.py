@@ -0,0 +1,152 @@
+# Project Quex (http://quex.sourceforge.net); License: MIT;
+# (C) 2005-2020 Frank-Rene Schaefer;
+#_______________________________________________________________________________
+"""Lazy product automaton of DFAs.
+
+A state of the product of DFAs 'A0', 'A1', ... is a 'setup', i.e. a tuple
+
+                          (s0, s1, ...)
+
+where 's(i)' is a state index of 'A(i)'. The product transits on a lexatom
+from one setup to another, if each 'A(i)' transits on it from 's(i)' to the
+target's 's(i)'. If 'A(i)' is 'optional', the product continues even when
+'A(i)' drops out. Then, the setup contains 'None' for 'A(i)'.
+
+Setups are generated on demand, starting from the initial setup. Each setup
+is investigated only once (visited setups are hashed).
+
+  -- Boolean queries ('find()') stop at the first setup that witnesses a
+     condition--without building the remainder of the product.
+
+  -- Set operations ('materialize()') build a DFA only from the setups that
+     are reachable from the initial setup.
+
+(C) 2020 Frank-Rene Schaefer
+___________________________________________________________________________
+"""
+from   quex.engine.state_machine.core                 import DFA
+from   quex.engine.state_machine.state.target_map     import TargetMap
+from   quex.engine.state_machine.state.target_map_ops import get_intersection_line_up, \
+                                                             get_intersection_line_up_2
+import quex.engine.state_machine.index                as     index
+
+class Product:
+    def __init__(self, DfaList, OptionalList=None):
+        """DfaList:      DFAs of which the product is built.
+           OptionalList: OptionalList[i] == True, if the product continues
+                         after 'DfaList[i]' dropped out. If None, no DFA is
+                         optional, i.e. the product is the intersection.
+        """
+        if OptionalList is None: OptionalList = [ False ] * len(DfaList)
+        assert len(OptionalList) == len(DfaList)
+
+        self.dfa_list        = DfaList
+        self.optional_list   = OptionalList
+        self.__transition_db = {} # map: setup --> map: target setup --> NumberSet
+        self.__empty_target_map = TargetMap()
+
+    def init_setup(self):
+        return tuple(dfa.init_state_index for dfa in self.dfa_list)
+
+    def acceptance_tuple(self, Setup):
+        """RETURNS: Tuple where element 'i' is True, if 'DfaList[i]' accepts
+                    in the setup.
+        """
+        return tuple(
+            si is not None and dfa.states[si].is_acceptance()
+            for dfa, si in zip(self.dfa_list, Setup)
+        )
+
+    def get_transition_db(self, Setup):
+        """RETURNS: map: target setup --> NumberSet that triggers to it.
+
+        The result is computed only once per setup.
+        """
+        db = self.__transition_db.get(Setup)
+        if db is None: 
+            db = self.__compute_transition_db(Setup)
+            self.__transition_db[Setup] = db
+        return db
+
+    def __compute_transition_db(self, Setup):
+        target_map_list = [
+            self.__empty_target_map if si is None else dfa.states[si].target_map
+            for dfa, si in zip(self.dfa_list, Setup)
+        ]
+        if not any(self.optional_list):
+            return get_intersection_line_up(target_map_list)
+        else:
+            return dict(
+                (target_setup, trigger_set)
+                for target_setup, trigger_set in get_intersection_line_up_2(target_map_list)
+                if self.__is_alive(target_setup)
+            )
+
+    def __is_alive(self, Setup):
+        """RETURNS: True, if no DFA is dropped out that must not, and at least
+                    one DFA did not drop out.
+        """
+        alive_f = False
+        for optional_f, si in zip(self.optional_list, Setup):
+            if si is not None: alive_f = True
+            elif not optional_f: return False
+        return alive_f
+
+    def iterable_setups(self, StartList=None, ExpandF=None):
+        """YIELDS: Setups that are reachable from the setups in 'StartList' (by
+                   default: the initial setup). Each setup is yielded once.
+
+        ExpandF: If not None, the transitions of a setup are only followed,
+                 if 'ExpandF(Setup)' is True.
+
+        The walk is depth-first and does not rely on recursion.
+        """
+        if StartList is None: StartList = [ self.init_setup() ]
+
+        done_set  = set(StartList)
+        work_list = list(reversed(StartList))
+        while work_list:
+            setup = work_list.pop()
+            yield setup
+
+            if ExpandF is not None and not ExpandF(setup): continue
+
+            for target_setup in self.get_transition_db(setup):
+                if target_setup in done_set: continue
+                done_set.add(target_setup)
+                work_list.append(target_setup)
+
+    def find(self, Condition, StartList=None, ExpandF=None):
+        """RETURNS: First reachable setup for which 'Condition(Setup)' holds.
+                    None, if there is none.
+        """
+        for setup in self.iterable_setups(StartList, ExpandF):
+            if Condition(setup): return setup
+        return None
+
+    def materialize(self, AcceptanceCondition):
+        """AcceptanceCondition: function (acceptance tuple) --> bool
+                                (see 'acceptance_tuple()').
+
+        RETURNS: DFA of all setups which are reachable from the initial setup.
+
+        (Each setup is treated once, so transitions are not cached.)
+        """
+        init_setup = self.init_setup()
+        result     = DFA(AcceptanceF=AcceptanceCondition(self.acceptance_tuple(init_setup)))
+        index_db   = { init_setup: result.init_state_index } # map: setup --> state index
+
+        work_list = [ init_setup ]
+        while work_list:
+            setup = work_list.pop()
+            si    = index_db[setup]
+            for target_setup, trigger_set in self.__compute_transition_db(setup).items():
+                target_si = index_db.get(target_setup)
+                if target_si is None:
+                    target_si              = index.get()
+                    index_db[target_setup] = target_si
+                    work_list.append(target_setup)
+                acceptance_f = AcceptanceCondition(self.acceptance_tuple(target_setup))
+                result.add_transition(si, trigger_set, target_si, AcceptanceF=acceptance_f)
+
+        return result
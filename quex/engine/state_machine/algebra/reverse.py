@@ -10,15 +10,52 @@
        reverse(union(P, Q))        == union(reverse(P), reverse(Q))
        reverse(intersection(P, Q)) == intersection(reverse(P), reverse(Q))
 """
-from   quex.engine.state_machine.state.single_entry   import SeAccept
+from   quex.engine.state_machine.state.single_entry   import SeAccept, \
+                                                             SingleEntry
 from   quex.engine.state_machine.core                 import DFA
 import quex.engine.state_machine.algorithm.beautifier as beautifier
+import quex.engine.state_machine.algorithm.minimizer  as minimizer
+import quex.engine.state_machine.algorithm.alphabet   as alphabet
+
+def do(SM, EnsureDFA_f=True, BrzozowskiF=True):
+    """BrzozowskiF: If 'SM' is a DFA where all states are reachable, then the
+                    subset construction on its reverse produces a minimal DFA
+                    (Brzozowski). Minimization is then spared.
+    """
+    if EnsureDFA_f and BrzozowskiF:
+        result = __do_brzozowski(SM)
+        if result is not None: return result
 
-def do(SM, EnsureDFA_f=True):
     result = __do(SM)
     if EnsureDFA_f: return beautifier.do(result)
     else:           return result
 
+def __do_brzozowski(SM):
+    """Subset construction on the reverse of 'SM' runs on alphabet classes, if
+    that pays off (as in 'beautifier.do()'). Other commands than acceptance 
+    would be kept in the reversed state machine and prevent states from being
+    equivalent.
+
+    RETURNS: Minimal DFA matching the reverse of 'SM'.
+             None, if 'SM' does not fulfill the requirements.
+    """
+    if    any(cmd.__class__ != SeAccept 
+              for state in SM.states.values() for cmd in state.single_entry) \
+       or SM.get_orphaned_state_index_list():
+        return None
+
+    sm        = SM.clone()
+    partition = alphabet.do(sm)
+    if partition is not None: partition.compress(sm)
+
+    # (On alphabet classes, the check is less expensive)
+    if not sm.is_DFA_compliant(): return None
+
+    result = minimizer.determinized_reverse(sm, SingleEntry.from_iterable([SeAccept()]))
+
+    if partition is not None: partition.expand(result)
+    return result
+
 def __do(SM):
     """Creates a state machine that matches the reverse of what 'SM' matches.
     """
@@ -1,9 +1,7 @@
 # Project Quex (http://quex.sourceforge.net); License: MIT;
 # (C) 2005-2020 Frank-Rene Schaefer; 
 #_______________________________________________________________________________
-import quex.engine.state_machine.algebra.union        as union
-import quex.engine.state_machine.algebra.intersection as intersection
-import quex.engine.state_machine.algebra.difference   as difference
+from   quex.engine.state_machine.algebra.product import Product
 
 def do(SM_List):
     """Result: A state machine that matches what is matched by one of the
@@ -13,9 +11,16 @@ def do(SM_List):
 
                        difference(union(All), intersection(All))
 
+    The product of all state machines continues as long as one of them does
+    not drop out. It accepts where some, but not all state machines accept.
     """
-    # Difference: It only remains in A what is not in A and B.
-    tmp0 = union.do(SM_List)
-    tmp1 = intersection.do(SM_List)
-    return difference.do(tmp0, tmp1)
+    for sm in SM_List:
+        sm.assert_consistency() 
 
+    N = len(SM_List)
+    def acceptance_condition(AcceptanceTuple):
+        return 0 < sum(AcceptanceTuple) < N
+
+    result = Product(SM_List, OptionalList=[True] * N).materialize(acceptance_condition)
+    result.delete_hopeless_states()
+    return result
@@ -2,7 +2,7 @@
 # (C) 2005-2020 Frank-Rene Schaefer; 
 #_______________________________________________________________________________
 import quex.engine.state_machine.construction.parallelize        as parallelize
-import quex.engine.state_machine.algorithm.hopcroft_minimization as hopcroft_minimization
+import quex.engine.state_machine.algorithm.minimizer             as minimizer
 
 def do(SM_List):
     """The 'parallelize' module does a union of multiple state machines,
@@ -11,6 +11,6 @@ def do(SM_List):
     in this case.
     """
     result = parallelize.do(SM_List)
-    result = hopcroft_minimization.do(result, CreateNewStateMachineF=False)
+    result = minimizer.do(result)
     return result
 
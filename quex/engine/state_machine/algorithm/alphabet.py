@@ -0,0 +1,152 @@
+# Project Quex (http://quex.sourceforge.net); License: MIT;
+# (C) 2005-2020 Frank-Rene Schaefer;
+#_______________________________________________________________________________
+"""Alphabet compression by equivalence classes.
+
+Two lexatoms are equivalent, if no transition of a state machine distinguishes
+them, i.e. if every trigger set contains either both or none of them. For
+example, with the trigger sets
+
+                   [a-z]  [0-9]  [a-f0-9]  [\\p{ID_Start}]
+
+the letters 'g' to 'z' together with all non-ASCII letters in 'ID_Start' form
+one class. A class is a list of intervals, i.e. it may be scattered over the
+whole range of Unicode.
+
+Subset construction and Hopcroft minimization can run on trigger sets of
+class ids (small integers) instead of code points. Trigger sets that consist
+of hundreds of intervals, such as Unicode properties, shrink to a few class
+ids. Afterwards, class ids are mapped back to the lexatoms they represent.
+
+Class ids are assigned in ascending order of the classes' lowest lexatom. So,
+an ordering of trigger sets by their lowest element is the same before and
+after compression.
+"""
+from   quex.engine.misc.interval_handling import Interval, NumberSet
+
+class AlphabetPartition(object):
+    """Members:
+
+       class_list[i] = sorted list of intervals of lexatoms in class 'i'.
+       __set_db      = map: interval tuple of a trigger set --> NumberSet of class ids
+    """
+    def __init__(self, *DfaList):
+        key_list   = []   # distinct trigger sets as tuples of (begin, end)
+        key_db     = {}   # map: key --> index in key_list
+        for trigger_set in _trigger_sets(DfaList):
+            key = _key(trigger_set)
+            if key in key_db: continue
+            key_db[key] = len(key_list)
+            key_list.append(key)
+
+        event_list = []
+        for set_i, key in enumerate(key_list):
+            for begin, end in key:
+                event_list.append((begin, set_i))
+                event_list.append((end,   set_i))
+        event_list.sort()
+
+        # Sweep over the lexatoms. Between two subsequent event positions,
+        # the set of 'active' trigger sets is constant. It identifies the
+        # equivalence class of the lexatoms in that range.
+        self.class_list = []
+        class_db        = {}   # map: frozenset of active trigger sets --> class id
+        class_of_set    = [ [] for key in key_list ]
+        active_set      = set()
+        L               = len(event_list)
+        i               = 0
+        while i < L:
+            position = event_list[i][0]
+            while i < L and event_list[i][0] == position:
+                set_i = event_list[i][1]
+                if set_i in active_set: active_set.remove(set_i)
+                else:                   active_set.add(set_i)
+                i += 1
+            if not active_set: continue
+
+            end       = event_list[i][0] # 'i < L', since an end event follows
+            signature = frozenset(active_set)
+            class_i   = class_db.get(signature)
+            if class_i is None:
+                class_i = len(self.class_list)
+                class_db[signature] = class_i
+                self.class_list.append([])
+                for set_i in signature:
+                    class_of_set[set_i].append(class_i)
+            self.class_list[class_i].append(Interval(position, end))
+
+        self.__set_db = dict(
+            (key, _number_set_from_sorted_numbers(class_of_set[set_i]))
+            for key, set_i in key_db.items()
+        )
+
+    def class_n(self):
+        return len(self.class_list)
+
+    def get_class_set(self, TriggerSet):
+        """RETURNS: NumberSet of the ids of the classes which constitute 
+                    'TriggerSet'. 'TriggerSet' must be a trigger set of the
+                    DFAs from which the partition was built.
+        """
+        return self.__set_db[_key(TriggerSet)]
+
+    def compress(self, Dfa):
+        """Replaces all trigger sets in 'Dfa' by sets of class ids."""
+        for state in Dfa.states.values():
+            db = state.target_map.get_map()
+            for target_si, trigger_set in db.items():
+                db[target_si] = self.get_class_set(trigger_set).clone()
+
+    def expand(self, Dfa):
+        """Replaces all trigger sets of class ids in 'Dfa' by sets of the lexatoms
+        which the classes represent.
+        """
+        cache = {}
+        for state in Dfa.states.values():
+            db = state.target_map.get_map()
+            for target_si, class_set in db.items():
+                key    = _key(class_set)
+                result = cache.get(key)
+                if result is None:
+                    result = NumberSet.union_of_many(
+                        interval
+                        for begin, end in key
+                        for class_i in range(begin, end)
+                        for interval in self.class_list[class_i]
+                    )
+                    cache[key] = result
+                db[target_si] = result.clone()
+
+# Minimum number of intervals in all trigger sets, so that compression pays off.
+COMPRESSION_INTERVAL_N_MIN = 64
+
+def do(*DfaList):
+    """RETURNS: AlphabetPartition of the lexatoms in the DFAs of 'DfaList', if
+                compression pays off. None, else.
+
+    A partition built from all DFAs of a mode serves each of them. So, the
+    DFAs can be combined on class ids (see 'combination.do()').
+    """
+    interval_n = sum(
+        trigger_set.interval_number() for trigger_set in _trigger_sets(DfaList)
+    )
+    if interval_n < COMPRESSION_INTERVAL_N_MIN: return None
+    return AlphabetPartition(*DfaList)
+
+def _trigger_sets(DfaList):
+    for dfa in DfaList:
+        for state in dfa.states.values():
+            for trigger_set in state.target_map.get_map().values():
+                yield trigger_set
+
+def _key(TriggerSet):
+    return tuple(
+        (x.begin, x.end) for x in TriggerSet.get_intervals(PromiseToTreatWellF=True)
+    )
+
+def _number_set_from_sorted_numbers(NumberList):
+    interval_list = []
+    for x in NumberList:
+        if interval_list and interval_list[-1].end == x: interval_list[-1].end = x + 1
+        else:                                            interval_list.append(Interval(x, x + 1))
+    return NumberSet(interval_list, ArgumentIsYoursF=True)
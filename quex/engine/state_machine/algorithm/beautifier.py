@@ -2,17 +2,35 @@
 # (C) 2005-2020 Frank-Rene Schaefer; 
 #_______________________________________________________________________________
 import quex.engine.state_machine.algorithm.nfa_to_dfa            as nfa_to_dfa
-import quex.engine.state_machine.algorithm.hopcroft_minimization as hopcroft
+import quex.engine.state_machine.algorithm.minimizer             as minimizer
+import quex.engine.state_machine.algorithm.alphabet              as alphabet
+import quex.engine.state_machine.compact                         as compact
+
+import os
+
+# 'QUEX_DFA_STORAGE=compact' lets subset construction and minimization run 
+# on the compact, integer-indexed representation (see 'compact.py').
+COMPACT_F = os.environ.get("QUEX_DFA_STORAGE", "dict") == "compact"
 
 def do(SM, NfaToDfaF=True, CloneF=True):
     """Construct a state machine which is equivalent to SM and is:
 
        -- DFA compliant, i.e. without epsilon transitions and no two
               transitions to the same target.
-       -- Hopcroft-minimized.
+       -- Minimized (see 'minimizer.py' for the choice of the algorithm).
     """
-    if NfaToDfaF: result = nfa_to_dfa.do(SM, CloneF=CloneF)
-    else:         result = SM
-    hopcroft.do(result, CreateNewStateMachineF=False)
+    if COMPACT_F: return compact.do(SM, NfaToDfaF, CloneF)
+
+    if NfaToDfaF and CloneF: result = SM.clone()
+    else:                    result = SM
+
+    # Subset construction and minimization run on trigger sets of alphabet
+    # equivalence classes, if that pays off (see 'alphabet.py').
+    partition = alphabet.do(result)
+    if partition is not None: partition.compress(result)
+
+    if NfaToDfaF: result = nfa_to_dfa.do(result, CloneF=False)
+    minimizer.do(result)
 
+    if partition is not None: partition.expand(result)
     return result
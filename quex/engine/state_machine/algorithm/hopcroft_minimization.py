@@ -2,9 +2,21 @@
 # (C) 2005-2020 Frank-Rene Schaefer; 
 #_______________________________________________________________________________
 # (C) 2005-2011 Frank-Rene Schaefer
-import quex.engine.state_machine.index as state_machine_index
+import quex.engine.state_machine.index                as state_machine_index
+import quex.engine.state_machine.algorithm.alphabet   as alphabet
 from   itertools   import islice, chain
 from   collections import defaultdict
+import os
+
+# 'QUEX_HOPCROFT' selects the minimization algorithm:
+#
+#    'refinement'  -- 'HopcroftPartitionRefinement' (default).
+#    'homogeneity' -- 'HopcroftMinization', the adapted algorithm based on
+#                     homogenous state sets.
+#
+# On the benchmarks in 'quex/engine/misc/benchmark.py' ('hopcroft/...') the
+# partition refinement is faster, by far for DFAs with many states.
+ALGORITHM = os.environ.get("QUEX_HOPCROFT", "refinement")
 
 class HopcroftMinization:
     """Combine sets of states that are equivalent. 
@@ -371,7 +383,100 @@ class HopcroftMinization:
 
         return new_index
 
-def do(SM, CreateNewStateMachineF=True, Class_StateMachine=None, Class_State=None):
+class HopcroftPartitionRefinement:
+    """Hopcroft's partition refinement as in the text books. Its complexity
+    is O(|Alphabet| * n * log(n)) for 'n' states.
+
+    Letters are the alphabet equivalence classes of the DFA's trigger sets
+    (see 'alphabet.py'). A trigger set of hundreds of intervals, such as a
+    Unicode property, becomes a handful of letters.
+
+    (1) Initial partition: states with the same combinability key are in
+        the same block (as in 'HopcroftMinization.initial_split()').
+
+    (2) Each block in the work list is a 'splitter'. For each letter, the 
+        states which trigger on the letter into the splitter are determined
+        from the inverse transition index. Any block that contains some, but
+        not all of those states is split.
+
+    (3) When a block is split and it is on the work list, both parts are 
+        entered. Else, only the smaller part needs to be entered ('process
+        the smaller half'). This bounds the number of times that a state is
+        part of a splitter to log(n).
+
+    DFAs in quex are partial, i.e. lexatoms may drop out. Then, all initial
+    blocks must be entered into the work list--not all but one (Valmari and
+    Lehtinen, 'Efficient minimization of DFAs with partial transition 
+    functions', 2008).
+
+    The result is represented by the same members as 'HopcroftMinization':
+
+        state_set_list -- list of state sets (lists of state indices).
+        map            -- map: state index --> index of its state set.
+    """
+    def __init__(self, DFA):
+        self.sm = DFA
+
+        # inverse_db: map: target index --> map: letter --> origin state indices
+        partition  = alphabet.AlphabetPartition(DFA)
+        inverse_db = dict((i, defaultdict(list)) for i in DFA.states.keys())
+        for origin_index, state in DFA.states.items():
+            for target_index, trigger_set in state.target_map.get_map().items():
+                letter_db = inverse_db[target_index]
+                class_set = partition.get_class_set(trigger_set)
+                for interval in class_set.get_intervals(PromiseToTreatWellF=True):
+                    for letter in range(interval.begin, interval.end):
+                        letter_db[letter].append(origin_index)
+
+        # (1) Initial partition
+        distinguisher_db = defaultdict(list)
+        for state_index, state in DFA.states.items():
+            key = state.single_entry.hopcroft_combinability_key()
+            distinguisher_db[key].append(state_index)
+
+        block_list = [ set(state_set) for state_set in distinguisher_db.values() ]
+        self.map   = {}
+        for block_i, block in enumerate(block_list):
+            for state_index in block:
+                self.map[state_index] = block_i
+
+        # (2), (3) Refinement
+        work_list = list(range(len(block_list)))
+        work_set  = set(work_list)
+        while work_list:
+            splitter_i = work_list.pop()
+            work_set.remove(splitter_i)
+
+            origin_db = defaultdict(set)  # map: letter --> origins into splitter
+            for state_index in block_list[splitter_i]:
+                for letter, origin_list in inverse_db[state_index].items():
+                    origin_db[letter].update(origin_list)
+
+            for origin_set in origin_db.values():
+                touched_db = defaultdict(list) # map: block --> its states in 'origin_set'
+                for state_index in origin_set:
+                    touched_db[self.map[state_index]].append(state_index)
+
+                for block_i, touched_list in touched_db.items():
+                    block = block_list[block_i]
+                    if len(touched_list) == len(block): continue
+
+                    new_i = len(block_list)
+                    block.difference_update(touched_list)
+                    block_list.append(set(touched_list))
+                    for state_index in touched_list:
+                        self.map[state_index] = new_i
+
+                    if   block_i in work_set:              entered_i = new_i
+                    elif len(touched_list) <= len(block):  entered_i = new_i
+                    else:                                  entered_i = block_i
+                    work_list.append(entered_i)
+                    work_set.add(entered_i)
+
+        self.state_set_list = [ sorted(block) for block in block_list ]
+
+def do(SM, CreateNewStateMachineF=True, Class_StateMachine=None, Class_State=None,
+       Algorithm=None):
     """Reduces the number of states according to equivalence classes of states. It starts
        with two sets: 
        
@@ -389,10 +494,15 @@ def do(SM, CreateNewStateMachineF=True, Class_StateMachine=None, Class_State=Non
 
        The original state set is replaced by the two new ones. This algorithm is 
        repeated until the state sets do not change anymore.
+
+       Algorithm: 'refinement' or 'homogeneity' (see 'ALGORITHM' above).
     """        
     Class_StateMachine = SM.__class__
     Class_State        = SM.get_init_state().__class__
-    result = HopcroftMinization(SM)
+    if Algorithm is None: Algorithm = ALGORITHM
+
+    if Algorithm == "homogeneity": result = HopcroftMinization(SM)
+    else:                          result = HopcroftPartitionRefinement(SM)
 
     if CreateNewStateMachineF: return create_state_machine(SM, result, Class_StateMachine, Class_State)
     else:                      return adapt_state_machine(SM, result)
@@ -0,0 +1,313 @@
+# Project Quex (http://quex.sourceforge.net); License: MIT;
+# (C) 2005-2020 Frank-Rene Schaefer;
+#_______________________________________________________________________________
+"""DFA minimization with exchangeable algorithms.
+
+    'hopcroft'   -- Hopcroft's partition refinement ('hopcroft_minimization.py').
+    'valmari'    -- Valmari and Lehtinen's partition refinement of states
+                    and transitions, O(m * log(n)) for 'm' transitions. Its
+                    effort does not depend on the size of the alphabet.
+    'brzozowski' -- Double reversal: determinize(reverse(determinize(reverse(SM)))).
+                    Applicable to 'plain' state machines only (see below).
+                    Reversal and subset construction happen in one step. 
+                    (The epsilon transitions from a new initial state, as 
+                    in 'algebra.reverse', would leave a redundant initial
+                    state in the result).
+
+'hopcroft' and 'valmari' determine the same partition of states. The result
+is derived by 'hopcroft_minimization.adapt_state_machine()'. 'brzozowski'
+constructs a new state machine.
+
+A state machine is 'plain', if its acceptance states all have the same
+single entry and all other states have none. Only then, the minimal DFA is
+determined by the language alone. Brzozowski's algorithm also drops states
+from which no acceptance state can be reached.
+
+'select()' chooses the algorithm for a given state machine. The choice is
+based on the 'minimizer/...' and 'reverse/...' benchmarks in 
+'quex/engine/misc/benchmark.py':
+
+  -- Valmari's algorithm is fastest for DFAs with many states.
+  -- Else, Hopcroft's algorithm. 
+  
+  -- Brzozowski's algorithm, applied to a DFA, is slower than both. It pays
+     off in the form of its second half: the subset construction on the 
+     reverse of a DFA delivers a minimal DFA. Reversal, as for pre-contexts,
+     relies on that ('algebra/reverse.py'), and no minimization is required.
+
+'QUEX_MINIMIZER' may be set to one of the algorithm names to enforce its use
+(where applicable). By default it is 'auto'.
+"""
+import quex.engine.state_machine.algorithm.hopcroft_minimization as hopcroft
+import quex.engine.state_machine.algorithm.alphabet              as alphabet
+from   quex.engine.state_machine.core                            import DFA
+from   quex.engine.state_machine.state.core                      import DFA_State
+from   quex.engine.state_machine.state.target_map                import TargetMap
+from   quex.engine.state_machine.state.target_map_ops            import get_elementary_trigger_sets
+import quex.engine.state_machine.index                           as state_machine_index
+from   quex.engine.operations.se_operations                      import SeAccept, \
+                                                                        SeStoreInputPosition
+
+from   collections import defaultdict
+import os
+
+MINIMIZER = os.environ.get("QUEX_MINIMIZER", "auto")
+
+# Heuristic threshold for 'select()' (from the 'minimizer/...' benchmarks).
+VALMARI_STATE_N_MIN = 4096
+
+def do(Dfa, Algorithm=None):
+    """Minimizes 'Dfa' in place.
+
+    Algorithm: 'hopcroft', 'valmari', 'brzozowski', or 'auto' (see 'select()').
+               If None, 'MINIMIZER' decides.
+
+    RETURNS: 'Dfa'
+    """
+    if Algorithm is None:   Algorithm = MINIMIZER
+    if Algorithm == "auto": Algorithm = select(Dfa)
+
+    if Algorithm == "brzozowski" and is_plain(Dfa):
+        result               = brzozowski(Dfa)
+        Dfa.states           = result.states
+        Dfa.init_state_index = result.init_state_index
+        return Dfa
+    elif Algorithm == "valmari":
+        return hopcroft.adapt_state_machine(Dfa, ValmariPartition(Dfa))
+    else:
+        return hopcroft.do(Dfa, CreateNewStateMachineF=False)
+
+def select(Dfa):
+    """RETURNS: Name of the minimization algorithm that is expected to be
+                the fastest for 'Dfa'.
+    """
+    if len(Dfa.states) >= VALMARI_STATE_N_MIN: return "valmari"
+    else:                                      return "hopcroft"
+
+def is_plain(Dfa):
+    """RETURNS: True, if all acceptance states accept the same acceptance ids
+                unconditionally, and no other state has any single entry 
+                operation. No state stores or restores an input position.
+    """
+    acceptance_id_set = None
+    for state in Dfa.states.values():
+        single_entry = state.single_entry
+        if single_entry.find(SeStoreInputPosition) is not None: return False
+
+        accept_list = list(single_entry.get_iterable(SeAccept))
+        if not state.is_acceptance():
+            if accept_list: return False
+            continue
+        elif any(   op.acceptance_condition_set() 
+                 or op.restore_position_register_f() for op in accept_list):
+            return False
+
+        id_set = set(op.acceptance_id() for op in accept_list)
+        if   acceptance_id_set is None:    acceptance_id_set = id_set
+        elif acceptance_id_set != id_set:  return False
+    return True
+
+def brzozowski(Dfa):
+    """RETURNS: Minimal DFA that matches what 'Dfa' matches. 'Dfa' must be
+                plain (see 'is_plain()') and free of epsilon transitions.
+                It may be non-deterministic.
+
+    The acceptance states of the result receive the single entry of the
+    acceptance states of 'Dfa'.
+    """
+    acceptance_entry = None
+    for state in Dfa.states.values():
+        if state.is_acceptance(): acceptance_entry = state.single_entry; break
+
+    if acceptance_entry is None: return DFA.Empty()
+
+    backward = determinized_reverse(Dfa, acceptance_entry)
+    return determinized_reverse(backward, acceptance_entry)
+
+def determinized_reverse(Dfa, AcceptanceEntry):
+    """Subset construction on the reverse of 'Dfa'. The initial subset is the
+    set of acceptance states of 'Dfa'. A subset that contains the initial 
+    state of 'Dfa' is an acceptance state.
+
+    RETURNS: DFA
+    """
+    reverse_db = defaultdict(TargetMap) # map: state index --> reversed transitions
+    for si, state in Dfa.states.items():
+        assert not state.target_map.get_epsilon_target_state_index_list()
+        for target_si, trigger_set in state.target_map.get_map().items():
+            reverse_db[target_si].add_transition(trigger_set.clone(), si)
+
+    result    = DFA(DoNothingF=True)
+    subset_db = {}   # map: subset --> state index in result
+    worklist  = []
+
+    def get_state_index(Subset):
+        si = subset_db.get(Subset)
+        if si is None:
+            si = state_machine_index.get()
+            subset_db[Subset] = si
+            worklist.append((si, Subset))
+        return si
+
+    result.init_state_index = get_state_index(tuple(sorted(
+        si for si, state in Dfa.states.items() if state.is_acceptance()
+    )))
+    while worklist:
+        si, subset = worklist.pop()
+        target_map = TargetMap()
+        for member_si in subset:
+            for target_si, trigger_set in reverse_db[member_si].get_map().items():
+                target_map.add_transition(trigger_set.clone(), target_si)
+
+        state = DFA_State()
+        for target_subset, trigger_set in get_elementary_trigger_sets(target_map).items():
+            if trigger_set.is_empty(): continue
+            state.add_transition(trigger_set, get_state_index(tuple(sorted(target_subset))))
+        if Dfa.init_state_index in subset: 
+            state.set_single_entry(AcceptanceEntry.clone())
+        result.states[si] = state
+
+    return result
+
+class ValmariPartition:
+    """Partition refinement according to
+
+         A. Valmari, P. Lehtinen, 'Efficient minimization of DFAs with partial
+         transition functions', 2008.
+
+    States are partitioned into 'blocks', transitions into 'cords'. Initially,
+    blocks are given by the states' combinability keys; cords by the letters
+    (alphabet equivalence classes) of transitions. Each cord splits the blocks
+    of the transitions' origins. Each new block splits the cords of the
+    transitions that enter it. Only the smaller part of a split is new; the
+    first block is never used for splitting.
+
+    The result is represented by the same members as 'HopcroftMinization':
+
+        state_set_list -- list of state sets (lists of state indices).
+        map            -- map: state index --> index of its state set.
+    """
+    def __init__(self, Dfa):
+        self.sm = Dfa
+
+        si_list  = list(Dfa.states.keys())
+        index_db = dict((si, i) for i, si in enumerate(si_list))
+
+        # Transitions: origin[t], letter[t], target[t]
+        partition = alphabet.AlphabetPartition(Dfa)
+        origin    = []
+        letter    = []
+        target    = []
+        for si in si_list:
+            for target_si, trigger_set in Dfa.states[si].target_map.get_map().items():
+                class_set = partition.get_class_set(trigger_set)
+                for interval in class_set.get_intervals(PromiseToTreatWellF=True):
+                    for x in range(interval.begin, interval.end):
+                        origin.append(index_db[si])
+                        letter.append(x)
+                        target.append(index_db[target_si])
+
+        # Incoming transitions per state
+        incoming_list = [ [] for i in si_list ]
+        for t, i in enumerate(target):
+            incoming_list[i].append(t)
+
+        # Initial blocks
+        group_db = defaultdict(list)
+        for i, si in enumerate(si_list):
+            group_db[Dfa.states[si].single_entry.hopcroft_combinability_key()].append(i)
+        blocks = _RefinablePartition(list(group_db.values()))
+
+        # Initial cords
+        group_db = defaultdict(list)
+        for t, x in enumerate(letter):
+            group_db[x].append(t)
+        cords = _RefinablePartition([ group_db[x] for x in sorted(group_db) ])
+
+        b = 1
+        c = 0
+        while c < cords.set_n():
+            for t in cords.iterable(c):
+                blocks.mark(origin[t])
+            blocks.split()
+            c += 1
+            while b < blocks.set_n():
+                for i in blocks.iterable(b):
+                    for t in incoming_list[i]:
+                        cords.mark(t)
+                cords.split()
+                b += 1
+
+        self.state_set_list = [
+            sorted(si_list[i] for i in blocks.iterable(k)) for k in range(blocks.set_n())
+        ]
+        self.map = {}
+        for k, state_set in enumerate(self.state_set_list):
+            for si in state_set:
+                self.map[si] = k
+
+class _RefinablePartition:
+    """Partition of the numbers 0 to N-1 into sets. The elements of set 's' are
+    'element[first[s]:past[s]]'. Marked elements of 's' are moved to the front
+    of the set. 'split()' separates the marked from the unmarked elements of
+    all touched sets. The smaller part becomes a new set.
+    """
+    def __init__(self, GroupList):
+        self.element  = [ x for group in GroupList for x in group ]
+        self.location = [ 0 ] * len(self.element)
+        self.set_of   = [ 0 ] * len(self.element)
+        self.first    = []
+        self.past     = []
+        self.marked_n = []
+        self.touched  = []
+        for i, x in enumerate(self.element):
+            self.location[x] = i
+        begin = 0
+        for s, group in enumerate(GroupList):
+            for x in group:
+                self.set_of[x] = s
+            self.first.append(begin)
+            begin += len(group)
+            self.past.append(begin)
+            self.marked_n.append(0)
+
+    def set_n(self):
+        return len(self.first)
+
+    def iterable(self, S):
+        return self.element[self.first[S]:self.past[S]]
+
+    def mark(self, X):
+        s = self.set_of[X]
+        i = self.location[X]
+        j = self.first[s] + self.marked_n[s]
+        if i < j: return # already marked
+        y                = self.element[j]
+        self.element[i]  = y
+        self.location[y] = i
+        self.element[j]  = X
+        self.location[X] = j
+        if not self.marked_n[s]: self.touched.append(s)
+        self.marked_n[s] += 1
+
+    def split(self):
+        while self.touched:
+            s = self.touched.pop()
+            j = self.first[s] + self.marked_n[s]
+            self.marked_n[s] = 0
+            if j == self.past[s]: continue
+
+            new_s = len(self.first)
+            if j - self.first[s] <= self.past[s] - j:
+                # Marked part is smaller --> new set
+                self.first.append(self.first[s])
+                self.past.append(j)
+                self.first[s] = j
+            else:
+                # Unmarked part is smaller --> new set
+                self.first.append(j)
+                self.past.append(self.past[s])
+                self.past[s] = j
+            self.marked_n.append(0)
+            for i in range(self.first[new_s], self.past[new_s]):
+                self.set_of[self.element[i]] = new_s
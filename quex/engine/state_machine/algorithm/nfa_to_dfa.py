@@ -16,14 +16,17 @@ def do(SM, CloneF=True):
     sets. A very good description of the subset construction algorithm can be
     found in 'Engineering a Compiler' by Keith Cooper.
 
+    Orphans of the input are removed, unless they lie on unreachable cycles
+    (see 'ClosureDb'). Inputs with such cycles must be cleaned up before.
+
     TODO: Identify places in the code, that can actually renounce on 'CloneF=True'.
     """
     if CloneF: result = SM.clone()
     else:      result = SM
-    _combine_all_epsilon_closures(result)
+    epsilon_candidate_set = _combine_all_epsilon_closures(result)
 
     worklist   = list(result.states.keys())
-    closure_db = ClosureDb()
+    closure_db = ClosureDb(result)
 
     while worklist:
         # 'start_state_index' is the index of an **existing** state in the state machine.
@@ -54,23 +57,63 @@ def do(SM, CloneF=True):
 
             if target_state_index is None:
                 target_state_index = result.create_new_state_from_closure(original_target_si_closure)
-                closure_db.enter(target_state_index, original_target_si_closure)
+                closure_db.enter(result, target_state_index, original_target_si_closure)
                 worklist.append(target_state_index)
 
             new_target_map.add_transition(trigger_set, target_state_index)
 
-        state.set_target_map(new_target_map)
+        closure_db.set_target_map(si, state, new_target_map)
 
-    return closure_db.remove_orphaned_states(result)
+    return closure_db.remove_orphaned_states(result, epsilon_candidate_set)
 
 class ClosureDb:
-    def __init__(self):
-        self.__closure_db = {}
-        self.__expand_db  = {}
+    """Members:
+
+       __closure_db:  map: closure of original states --> combined state index
+       __expand_db:   map: combined state index --> closure of original states
+       __referrer_db: map: state index --> set of indices of the other states 
+                                           that have a transition to it.
 
-    def enter(self, TargetSi, OrigTargetSiClosure):
+    The reverse reference index is built once. It is kept up to date while 
+    states are combined and target maps are replaced. The orphan removal at
+    the end relies on it instead of scanning all states.
+    """
+    def __init__(self, Dfa):
+        self.__closure_db  = {}
+        self.__expand_db   = {}
+        self.__referrer_db = dict((si, set()) for si in Dfa.states.keys())
+        for si, state in Dfa.states.items():
+            self.__add_referrer(si, state.target_map.get_target_state_index_list())
+
+        # States without referrer, other than the init state, are orphans of
+        # the input. They are candidates for the orphan removal. The states
+        # that only they refer to follow in the cascade. (Unreachable cycles
+        # of the input are not detected.)
+        self.__input_orphan_set = set(
+            si for si, referrer_set in self.__referrer_db.items() 
+            if not referrer_set and si != Dfa.init_state_index
+        )
+
+    def enter(self, Dfa, TargetSi, OrigTargetSiClosure):
         self.__closure_db[OrigTargetSiClosure] = TargetSi
         self.__expand_db[TargetSi]             = OrigTargetSiClosure
+        self.__referrer_db.setdefault(TargetSi, set())
+        self.__add_referrer(TargetSi, Dfa.states[TargetSi].target_map.get_target_state_index_list())
+
+    def set_target_map(self, Si, State, NewTargetMap):
+        """Replaces the target map of 'State' (with index 'Si') and adapts the
+        reverse reference index.
+        """
+        old_target_set = set(State.target_map.get_target_state_index_list())
+        new_target_set = set(NewTargetMap.get_target_state_index_list())
+        for target_si in old_target_set.difference(new_target_set):
+            self.__referrer_db[target_si].discard(Si)
+        self.__add_referrer(Si, new_target_set.difference(old_target_set))
+        State.set_target_map(NewTargetMap)
+
+    def __add_referrer(self, Si, TargetSiIterable):
+        for target_si in TargetSiIterable:
+            if target_si != Si: self.__referrer_db.setdefault(target_si, set()).add(Si)
 
     def get_target_state_index(self, RawSiClosure):
         assert RawSiClosure
@@ -79,29 +122,27 @@ class ClosureDb:
         else:                             si = self.__closure_db.get(original_si_closure)
         return si, original_si_closure
 
-    def remove_orphaned_states(self, result):
-        """TODO: Develop a 'delete_orphaned_states' version that only works on the
-                 superset of the state indices in union(self.__expand_db.values()).
-                 => Computational performance increase!
-
-        A state that is absorbed into a combined state may loose all its transitions
+    def remove_orphaned_states(self, result, EpsilonCandidateSet):
+        """A state that is absorbed into a combined state may loose all its transitions
         to it. If so, it is orphan and can be removed. 
         The target states of an orphaned state still have their transitions from
         the combined state, at least. Such a target state can only become orphan
         if it is absorbed into a combined state.
 
-        => Only those states can possibly be orphans which are present in a closure.
-           That is, THERE ARE NO ORPHANS EXCEPT IN 'union(self.__expand_db.values())'.
+        => Only those states can possibly be orphans which are present in a closure,
+           or which are combined states themselves (their creator may be orphan).
+           Plus, the states of epsilon closures ('EpsilonCandidateSet') and 
+           the orphans of the input.
 
-            (1) candidates = union(self.__expand_db.values())
-        .-->(2) remainder = copy(candidates)
-        |       for state in result.states:
-        |           remainder.difference_update(state.transition_map.get_map().keys())
-        |       => remainder are definitely 'real orphans'
-        |   (3) remove orphan states
-        '---(4) repeat until no new deletions
+        The candidate restricted orphan removal is done by 'DFA.delete_orphaned_states()'
+        based on the reverse reference index.
         """
-        result.delete_orphaned_states()
+        candidate_set = set(EpsilonCandidateSet)
+        candidate_set.update(self.__input_orphan_set)
+        candidate_set.update(self.__expand_db.keys())
+        for closure in self.__expand_db.values():
+            candidate_set.update(closure)
+        result.delete_orphaned_states(candidate_set, self.__referrer_db)
         return result
 
     def __originate(self, SiClosure):
@@ -126,22 +167,35 @@ def _combine_all_epsilon_closures(sm):
     """For any state that inhabits epsilon transitions, generate a new state
     from the states of its epsilon closure. The original state is removed.
     All target state indices are adapted.
+
+    States with the same closure (e.g. all states on an epsilon loop) are 
+    replaced by the same combined state.
+
+    RETURNS: Set of state indices which may have become orphans, i.e. the
+             states of the closures and the combined states.
     """
     pure_epsilon_state_set = sm.get_pure_epsilon_state_set()
-    epsilon_closure_db     = sm.epsilon_closure_db()
+    epsilon_closure_map    = sm.epsilon_closure_map
     replacement_db = {}
-    for si, etsi_set in epsilon_closure_db.items():
+    combined_db    = {}    # map: closure --> index of combined state
+    for si, closure in epsilon_closure_map.items():
         if si in pure_epsilon_state_set: continue
-        replacement_db[si] = sm.create_new_state_from_closure(etsi_set, 
-                                                              RemoveEpsilonTansitionsF=True)
+        combined_si = combined_db.get(closure)
+        if combined_si is None:
+            combined_si = sm.create_new_state_from_closure(closure, 
+                                                           RemoveEpsilonTansitionsF=True)
+            combined_db[closure] = combined_si
+        replacement_db[si] = combined_si
 
     # Delete only after all replacement states have been created.
-    for si, etsi_set in epsilon_closure_db.items():
+    for si in epsilon_closure_map.keys():
         del sm.states[si]
 
     sm.replace_target_indices(replacement_db)
     if sm.init_state_index in replacement_db:
         sm.init_state_index = replacement_db[sm.init_state_index]
 
-
-
+    candidate_set = set(combined_db.values())
+    for closure in combined_db.keys():
+        candidate_set.update(closure)
+    return candidate_set
@@ -4,9 +4,10 @@
 from quex.constants  import E_AcceptanceCondition, \
                             E_AcceptanceConditionSet_corresponance
 from quex.engine.state_machine.core import DFA
+from quex.engine.state_machine.check.memo import walk
 
 class Checker:
-    def __init__(self, SM0, SM1):
+    def __init__(self, SM0, SM1, Memo=None):
         """Checks whether the set of patterns matched by SM0 is identical to the
            set of patterns matched by SM1.
 
@@ -15,30 +16,49 @@ class Checker:
         """
         self.sm1 = SM1
         self.sm0 = SM0
-        self.visited_state_index_db = {}
+        #     Union of all triggers were the 'mimiking' sm0 states trigger.
+        #     (For speed considerations, keep it in prepared, so it does not have to 
+        #      be computed each time it is required.)
+        self.sm0_trigger_set_union_db = {} 
+
+        if Memo is None: self.table = {}
+        else:            self.table = Memo.get_table("identity", SM0, SM1)
 
     def do(self):
-        return self.__dive(self.sm1.init_state_index, [self.sm0.init_state_index])
+        """The nodes of the walk are pairs 
 
-    def __dive(self, SM1_StateIndex, SM0_StateIndexList):
-        """SM1_StateIndex:     state index in SM1
+                  (state index in SM1, frozenset of state indices in SM0)
 
-           SM0_StateIndexList: list of states in the 'sm0 set' state machine that
-                               was reached by the same trigger set as SM1_StateIndex.      
-                               They are the set of states that can 'mimik' the current
-                               state indexed by 'SM1_StateIndex'.
+           where the set contains the states that 'mimik' the state in SM1.
+           Each node is treated once.
         """
+        init_node = (self.sm1.init_state_index, frozenset([self.sm0.init_state_index]))
+        return walk(self.table, init_node, self.__step)
+
+    def __get_sm0_trigger_set_union(self, SM0_StateIndex):
+        result = self.sm0_trigger_set_union_db.get(SM0_StateIndex)
+        if result is None:
+            result = self.sm0.states[SM0_StateIndex].target_map.get_trigger_set_union()
+            self.sm0_trigger_set_union_db[SM0_StateIndex] = result
+        return result
+
+    def __step(self, Node):
+        """Node = (SM1_StateIndex, SM0_StateIndexSet)
+
+           SM1_StateIndex:    state index in SM1
+
+           SM0_StateIndexSet: set of states in the 'sm0 set' state machine that
+                              was reached by the same trigger set as SM1_StateIndex.      
+                              They are the set of states that can 'mimik' the current
+                              state indexed by 'SM1_StateIndex'.
+
+           RETURNS: List of follow-up nodes.
+                    None, if SM0 and SM1 are not identical.
+        """
+        SM1_StateIndex, SM0_StateIndexSet = Node
         # (*) Determine the states behind the indices
         sm1_state      = self.sm1.states[SM1_StateIndex]
-        sm0_state_list = [self.sm0.states[index] for index in SM0_StateIndexList]
-        #     Bookkeeping
-        self.visited_state_index_db[SM1_StateIndex] = True
-        #     Union of all triggers were the 'mimiking' sm0 states trigger.
-        #     (For speed considerations, keep it in prepared, so it does not have to 
-        #      be computed each time it is required.)
-        sm0_trigger_set_union_db = {} 
-        for index in SM0_StateIndexList:
-            sm0_trigger_set_union_db[index] = self.sm0.states[index].target_map.get_trigger_set_union()
+        sm0_state_list = [self.sm0.states[index] for index in SM0_StateIndexSet]
 
         sm1_trigger_set_union = sm1_state.target_map.get_trigger_set_union()
 
@@ -50,36 +70,32 @@ class Checker:
         #     That is: 
         #     -- No 'mimiking sm0 state' is allowed to trigger on something beyond
         #        the trigger_set present on sm1, and vice versa.
-        for index in SM0_StateIndexList:
-            if not sm0_trigger_set_union_db[index].is_equal(sm1_trigger_set_union): 
-                return False
+        for index in SM0_StateIndexSet:
+            if not self.__get_sm0_trigger_set_union(index).is_equal(sm1_trigger_set_union): 
+                return None
 
         #     -- All 'mimiking sm0 states' must trigger on the given trigger_set to 
         #        a subsequent state of the same 'type' as the 'sm1 state'.
-        for target_index, trigger_set in list(sm1_state.target_map.get_map().items()):
+        result = []
+        for target_index, trigger_set in sm1_state.target_map.get_map().items():
             target_state = self.sm1.states[target_index]
 
             # (*) Collect the states in the 'sm0' that can be reached via the 'trigger_set'
-            sm0_target_state_index_list = []
+            sm0_target_state_index_set = set()
             for sm0_state in sm0_state_list:
-                for index in sm0_state.target_map.get_resulting_target_state_index_list(trigger_set):
-                    if index in sm0_target_state_index_list: continue
-                    sm0_target_state_index_list.append(index)
+                sm0_target_state_index_set.update(sm0_state.target_map.get_resulting_target_state_index_list(trigger_set))
 
             # (*) If there is one single state in the collection of follow-up states in sm0
             #     that has not the same type as the target state, then 'sm0' and 'sm1' are 
             #     not identical.
-            if not self.__correspondance(target_state, sm0_target_state_index_list): 
-                return False
+            if not self.__correspondance(target_state, sm0_target_state_index_set): 
+                return None
 
-            # (*) No need to go along loops, do not follow paths to states already visited.
-            if target_index not in self.visited_state_index_db:
-                if self.__dive(target_index, sm0_target_state_index_list) == False: return False
+            result.append((target_index, frozenset(sm0_target_state_index_set)))
 
-        # If the condition held for all sub-pathes of all trigger_sets then we can reports
-        # that the currently investigated sub-path supports the claim that 'sm1 sm' is a
-        # sub set state machine of 'sm0 sm'.
-        return True
+        # If the condition held for all trigger_sets then the currently investigated 
+        # node supports the claim that 'sm1 sm' is identical to 'sm0 sm'.
+        return result
 
     def __correspondance(self, S1, S0List):
         """Checks whether all states in SList are of the same type as S0. 
@@ -96,19 +112,21 @@ class Checker:
 
         return True
 
-def do(A, B):
+def do(A, B, Memo=None):
     """Assumption: post context are already mounted on core state machines.
+
+    Memo: 'CheckMemo' shared by checks, e.g. of all pattern pairs of a mode.
     """
     if isinstance(A, DFA):
         assert isinstance(B, DFA)
-        return Checker(A, B).do()
+        return Checker(A, B, Memo).do()
 
     assert not isinstance(B, DFA)
 
     # Check whether A and B are identical, i.e they match 
     # exactly the same patterns and provide exactly the same behavior of the 
     # lexical analyzer.
-    if not Checker(A.sm, B.sm).do(): return False
+    if not Checker(A.sm, B.sm, Memo).do(): return False
 
     if      A.sm.has_acceptance_condition(E_AcceptanceCondition.BEGIN_OF_LINE) \
          != B.sm.has_acceptance_condition(E_AcceptanceCondition.BEGIN_OF_LINE):   return False
@@ -121,5 +139,5 @@ def do(A, B):
     if A.sm_pre_context_to_be_reversed is None:                    
         return True
     else:
-        return Checker(A.sm_pre_context_to_be_reversed, B.sm_pre_context_to_be_reversed).do()
+        return Checker(A.sm_pre_context_to_be_reversed, B.sm_pre_context_to_be_reversed, Memo).do()
 
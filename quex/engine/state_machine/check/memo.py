@@ -0,0 +1,70 @@
+# Project Quex (http://quex.sourceforge.net); License: MIT;
+# (C) 2005-2020 Frank-Rene Schaefer; 
+#_______________________________________________________________________________
+class CheckMemo:
+    """Results of checks on pairs of state machines, e.g. the pairs of patterns
+    of a mode. A check on a pair of state machines walks along 'nodes', i.e.
+    combinations of states (such as a state and a set of 'shadowing' states).
+    For each check and pair, a table maps: 
+
+                    node --> True, if no violation is reachable from it,
+                             False, if a violation is reachable.
+
+    Nodes consist of state indices. State machines that were built elsewhere
+    (e.g. loaded from a cache) may have colliding state indices. Thus, tables
+    are not shared between pairs. They are shared by the checks on the same 
+    pair, e.g. the outrun checks of different check categories.
+    """
+    def __init__(self):
+        self.__db = {}
+
+    def get_table(self, CheckName, A, B):
+        """RETURNS: Table for the check 'CheckName' on the pair of state 
+                    machines 'A' and 'B'. Changes to the table are stored 
+                    in the memo.
+        """
+        # The entry holds 'A' and 'B', so that their ids remain valid.
+        key   = (CheckName, id(A), id(B))
+        entry = self.__db.get(key)
+        if entry is None:
+            entry          = (A, B, {})
+            self.__db[key] = entry
+        return entry[2]
+
+def walk(Table, InitNode, StepFunction):
+    """Walks along all nodes reachable from 'InitNode' using an explicit stack
+    (no recursion). 
+
+    StepFunction(Node) --> list of follow-up nodes, or None if the node
+                           violates the checked condition.
+
+    The walk does not enter nodes for which 'Table' reports True. When the 
+    walk completes without violation, all walked nodes are entered as True.
+    Upon a violation, 'InitNode' is entered as False.
+
+    RETURNS: True, if no violation is reachable from 'InitNode'.
+             False, else.
+    """
+    verdict = Table.get(InitNode)
+    if verdict is not None: return verdict
+
+    done_set  = set([InitNode])
+    work_list = [InitNode]
+    while work_list:
+        node = work_list.pop()
+        sub_node_list = StepFunction(node)
+        if sub_node_list is None:
+            Table[InitNode] = False
+            return False
+        for sub_node in sub_node_list:
+            if sub_node in done_set: continue
+            verdict = Table.get(sub_node)
+            if   verdict is True:  continue
+            elif verdict is False: 
+                Table[InitNode] = False
+                return False
+            done_set.add(sub_node)
+            work_list.append(sub_node)
+
+    Table.update((node, True) for node in done_set)
+    return True
@@ -1,9 +1,9 @@
 # Project Quex (http://quex.sourceforge.net); License: MIT;
 # (C) 2005-2020 Frank-Rene Schaefer; 
 #_______________________________________________________________________________
-from quex.engine.misc.tree_walker   import TreeWalker
+from quex.engine.state_machine.check.memo import walk
 
-def do(High, Low): 
+def do(High, Low, Memo=None): 
     """Check whether lower priority pattern 'Low' can outrun by length a 
        pattern 'High' even though 'High' has matched. 
        
@@ -21,9 +21,14 @@ def do(High, Low):
        pattern has matched on "alb". If the lexeme does not complete
        "albertikus", then the low priority pattern wins.
 
+       Memo: 'CheckMemo' shared by checks, e.g. of all pattern pairs of a mode.
+
        RETURNS: True, if 'Low' might outrun a lexeme that matches 'High'.
                 False, 'Low' can never outrun a lexeme matched by 'High'.
     """
+    if Memo is None: table = {}
+    else:            table = Memo.get_table("outrun", High, Low)
+
     # Step 1: Find acceptance states which are reached while walking
     #         along paths of 'High' that are also inside 'Low'.
     result = commonality(High, Low)
@@ -32,7 +37,7 @@ def do(High, Low):
 
     # Step 2: Detect paths in Low that divert from High starting from
     #         the acceptance states collected in step 1.
-    verdict_f = diversion(High, Low, result)
+    verdict_f = diversion(High, Low, result, table)
 
     # RETURNS (explained): 
     # True    There are acceptance states in High can be reached by paths that
@@ -44,82 +49,73 @@ def do(High, Low):
 def commonality(High, Low):
     """Find acceptance states which are reached while walking along paths 
     of 'High' that are also inside 'Low'.
-    """
-    collector = CommonalityWalker(High, Low)
-    collector.do([(High.init_state_index, Low.init_state_index)])
-    # collector.result: List of pairs (HighIndex, LowIndex) 
-    #
-    #  HighIndex = index of acceptance state in 'High' that has been reached.
-    #  LowIndex  = index of state in 'Low' that was reached when walking
-    #              along the path to 'HighIndex'.
-    #
-    return collector.result
-
-def diversion(High, Low, StartStatePairList=None):
-    """Detect paths in Low that divert from High starting from the state-pairs 
-    mentioned in 'StartStatePairList'. The 'StartStatePairList' is a list
-    of pairs (state index of High, state index of Low) where to start the 
-    searches.
-    
-    RETURNS: True  -- if there are paths in Low that divert
-             False -- if all paths from acceptance states in High are 
-                      also in Low.
-    """
-    if StartStatePairList is None:
-        StartStatePairList = [(High.init_state_index, Low.init_state_index)]
-
-    # Start searching for diversion from the critical acceptance states in High.
-    detector = DiversionWalker(High, Low)
-    detector.do(StartStatePairList)
-    return detector.result
 
-class CommonalityWalker(TreeWalker):
-    """Find acceptance states of 'High' which are reachable by walking along 
-    possible paths in 'Low'. 
-       
-       -- If an acceptance state in High ('A') is reached, then a pair
-          (Low_StateIndex, High_StateIndex) is appended to 'self.result'. 
+    RETURNS: List of pairs (HighIndex, LowIndex) 
+    
+      HighIndex = index of acceptance state in 'High' that has been reached.
+      LowIndex  = index of state in 'Low' that was reached when walking
+                  along the path to 'HighIndex'.
 
-    Later, DiversionWalker will walk along paths of 'Low' starting from these 
-    detected states to see whether it diverts.
+    The walk does not continue beyond acceptance states of 'High'. Later,
+    'diversion()' walks along paths of 'Low' starting from the detected 
+    pairs to see whether it diverts.
     """
-    def __init__(self, High, Low):
-        self.high     = High # DFA of the higher priority pattern
-        self.low      = Low  # DFA of the lower priority pattern
-        self.result   = []
-        self.done_set = set()
-        TreeWalker.__init__(self)
-
-    def on_enter(self, Args):
-        # (*) Update the information about the 'trace of acceptances'
-        High_StateIndex, Low_StateIndex = Args
-        if High_StateIndex in self.done_set: return None
-        else:                                self.done_set.add(High_StateIndex)
-        High_State = self.high.states[High_StateIndex]
+    init_node = (High.init_state_index, Low.init_state_index)
+    result    = []
+    done_set  = set([init_node])
+    work_list = [init_node]
+    while work_list:
+        node = work_list.pop()
+        High_StateIndex, Low_StateIndex = node
+        High_State = High.states[High_StateIndex]
 
         # Register any acceptance state reached in the high-prio pattern while
         # walking also along paths in 'low'. Need to specify the associated
         # state index of the low-prio pattern, so that the subsequent search
         # knows where to start.
         if High_State.is_acceptance():
-            self.result.append( (High_StateIndex, Low_StateIndex) )
-            return None
+            result.append(node)
+            continue
 
         # Follow the path of common trigger sets
-        Low_State     = self.low.states[Low_StateIndex]
-        sub_node_list = []
+        Low_State = Low.states[Low_StateIndex]
         for a_target, a_trigger_set in High_State.target_map:
             for b_target, b_trigger_set in Low_State.target_map:
-                if b_trigger_set.has_intersection(a_trigger_set): 
-                    # Some of the transition in 'High' is covered by a transition in 'Low'.
-                    sub_node_list.append( (a_target, b_target) )
+                if not b_trigger_set.has_intersection(a_trigger_set): continue
+                # Some of the transition in 'High' is covered by a transition in 'Low'.
+                sub_node = (a_target, b_target)
+                if sub_node in done_set: continue
+                done_set.add(sub_node)
+                work_list.append(sub_node)
 
-        return sub_node_list
+    return result
 
-    def on_finished(self, Args):
-        pass
+def diversion(High, Low, StartStatePairList=None, Table=None):
+    """Detect paths in Low that divert from High starting from the state-pairs 
+    mentioned in 'StartStatePairList'. The 'StartStatePairList' is a list
+    of pairs (state index of High, state index of Low) where to start the 
+    searches.
+
+    Table: map: pair --> verdict of earlier searches (see 'memo.walk()').
+    
+    RETURNS: True  -- if there are paths in Low that divert
+             False -- if all paths from acceptance states in High are 
+                      also in Low.
+    """
+    if StartStatePairList is None:
+        StartStatePairList = [(High.init_state_index, Low.init_state_index)]
+    if Table is None:
+        Table = {}
 
-class DiversionWalker(TreeWalker):
+    # Start searching for diversion from the critical acceptance states in High.
+    def step(Node):
+        return _diversion_step(High, Low, Node)
+
+    for node in StartStatePairList:
+        if not walk(Table, node, step): return True
+    return False
+
+def _diversion_step(High, Low, Node):
     """Checks whether 'Low' can walk paths which are not covered by 'High'. 
 
     Start states can be specified (For 'outrun' start at the acceptance states 
@@ -128,58 +124,35 @@ class DiversionWalker(TreeWalker):
        -- If an acceptance state in Low is reached while High does
           not accept, then Low has outrun High after match. 
           
-          Set 'result = True' and abort.
-
        -- If a step in Low is detected which is not feasible in High, 
           then Low has outrun High after match.
 
-          Set 'result = True' and abort.
+    RETURNS: List of follow-up pairs.
+             None, if 'Low' outruns 'High'.
     """
-    def __init__(self, High, Low):
-        self.high     = High  # DFA of the higher priority pattern
-        self.low      = Low   # DFA of the lower priority pattern
-        self.result   = False # Low cannot outrun High
-        self.done_set = set()
-        TreeWalker.__init__(self)
-
-    def on_enter(self, Args):
-        # (*) Update the information about the 'trace of acceptances'
-        High_StateIndex, Low_StateIndex = Args
-        if Low_StateIndex in self.done_set: return None
-        else:                               self.done_set.add(Low_StateIndex)
-
-        Low_State  = self.low.states[Low_StateIndex]
-        High_State = self.high.states[High_StateIndex]
-
-        # Low reaches acceptance state before High.
-        # => No further investigation. 
-        # Note, that here we are in states *after* a matching high-prio pattern 
-        # (after the high-prio acceptance states).
-        if Low_State.is_acceptance() and not High_State.is_acceptance():
-            self.result  = True 
-            self.abort_f = True
+    High_StateIndex, Low_StateIndex = Node
+    Low_State  = Low.states[Low_StateIndex]
+    High_State = High.states[High_StateIndex]
+
+    # Low reaches acceptance state before High.
+    # => No further investigation. 
+    # Note, that here we are in states *after* a matching high-prio pattern 
+    # (after the high-prio acceptance states).
+    if Low_State.is_acceptance() and not High_State.is_acceptance():
+        return None
+
+    sub_node_list = []
+    for b_target, b_trigger_set in Low_State.target_map:
+        b_remaining_triggers = b_trigger_set.clone()
+        for a_target, a_trigger_set in High_State.target_map:
+            if b_trigger_set.has_intersection(a_trigger_set): 
+                # The transition in 'A' is covered by a transition in 'B'.
+                sub_node_list.append( (a_target, b_target) )
+                b_remaining_triggers.subtract(a_trigger_set)
+
+        if not b_remaining_triggers.is_empty():
+            # Low contains triggers not present in High. 
+            # => Low 'diverts' from High.
             return None
 
-        sub_node_list = []
-        for b_target, b_trigger_set in Low_State.target_map:
-            b_remaining_triggers = b_trigger_set.clone()
-            for a_target, a_trigger_set in High_State.target_map:
-                if b_trigger_set.has_intersection(a_trigger_set): 
-                    # The transition in 'A' is covered by a transition in 'B'.
-                    sub_node_list.append( (a_target, b_target) )
-                    b_remaining_triggers.subtract(a_trigger_set)
-
-            if not b_remaining_triggers.is_empty():
-                # Low contains triggers not present in High. 
-                # => Low 'diverts' from High.
-                self.result  = True 
-                self.abort_f = True
-                return None
-
-        # (*) Recurse to all sub nodes
-        return sub_node_list
-
-    def on_finished(self, Args):
-        pass
-
-
+    return sub_node_list
@@ -0,0 +1,342 @@
+# Project Quex (http://quex.sourceforge.net); License: MIT;
+# (C) 2005-2020 Frank-Rene Schaefer;
+#_______________________________________________________________________________
+"""Index over the patterns of a mode to skip pairs of patterns that provably
+cannot be in conflict.
+
+Consistency checks run on all pairs (high, low) of a mode's patterns, where
+'high' has precedence over 'low'. For large pattern lists, most pairs have
+nothing in common. The index determines for each pattern 'high' the set of
+patterns 'low' for which a check *might* hold. Only those pairs need to be
+passed to the exact checks. The candidate sets are bit masks, where bit 'i'
+stands for the i-th pattern.
+
+Features of each DFA:
+
+    first_set      -- union of the initial state's trigger sets.
+    min_length     -- minimum length of a lexeme that is accepted (None, if
+                      none is accepted). The empty lexeme is not considered.
+    max_path       -- maximum number of transitions along a path from the
+                      initial state (None, if infinite).
+    literal_prefix -- lexatoms which every path passes before it may reach an
+                      acceptance state or branch.
+
+Literal prefixes are stored in a trie, so that the patterns with compatible
+prefixes (one is a prefix of the other) are found without comparing pairs.
+
+Further, the product of all DFAs is walked once. A 'setup' of the product is
+the sorted tuple of the states of all DFAs that are alive after a lexeme. From
+the setups it follows for all pairs at once:
+
+    -- which patterns are alive whenever a pattern is alive, and accept
+       whenever it accepts (superset candidates).
+    -- which patterns are alive when a pattern accepts (outrun candidates).
+    -- which patterns accept together with a pattern (intersection candidates).
+
+If the product exceeds 'PRODUCT_SETUP_N_MAX' setups, it is abandoned and only
+the features restrict the candidates.
+
+(C) 2020 Frank-Rene Schaefer
+"""
+from   quex.engine.state_machine.compact import _segments_from_iterable
+
+# Maximum number of setups in the product of all DFAs.
+PRODUCT_SETUP_N_MAX = 100000
+
+class PairIndex:
+    def __init__(self, DfaList):
+        self.dfa_list     = DfaList
+        self.feature_list = [ _Features(dfa) for dfa in DfaList ]
+        self.all_mask     = (1 << len(DfaList)) - 1
+
+        self.prefix_compatible_list = _get_prefix_compatible_list(self.feature_list)
+
+        product = _ModeProduct(DfaList)
+        if product.complete_f:
+            self.superset_db     = _transposed(product.superset_list)
+            self.outrun_db       = product.outrun_list
+            self.intersection_db = product.intersection_list
+        else:
+            self.superset_db     = None
+            self.outrun_db       = None
+            self.intersection_db = None
+
+    def superset_candidates(self, I):
+        """RETURNS: Mask of patterns 'k' that 'I' might match a superset of.
+        """
+        high = self.feature_list[I]
+        if self.superset_db is not None: mask = self.superset_db[I]
+        else:                            mask = self.all_mask
+        mask &= self.prefix_compatible_list[I]
+
+        result = 0
+        for k in iterable_bits(mask):
+            low = self.feature_list[k]
+            if   not high.first_set.is_superset(low.first_set):      continue
+            elif not _less_or_equal(low.max_path, high.max_path):    continue
+            elif     low.min_length is not None \
+                 and not _less_or_equal(high.min_length, low.min_length): continue
+            result |= 1 << k
+        return result
+
+    def outrun_candidates(self, I):
+        """RETURNS: Mask of patterns 'k' that might outrun 'I', i.e. that might
+                    continue after 'I' matched.
+        """
+        high = self.feature_list[I]
+        if self.outrun_db is not None: mask = self.outrun_db[I]
+        else:                          mask = self.all_mask
+        if high.init_acceptance_f: return mask
+
+        mask &= self.prefix_compatible_list[I]
+        if high.min_length is None: return 0
+
+        result = 0
+        for k in iterable_bits(mask):
+            low = self.feature_list[k]
+            if   not low.first_set.has_intersection(high.first_set): continue
+            elif not _less(high.min_length, low.max_path):           continue
+            result |= 1 << k
+        return result
+
+    def intersection_candidates(self, I):
+        """RETURNS: Mask of patterns 'k' which might match a lexeme that is
+                    also matched by 'I'.
+        """
+        if self.intersection_db is not None: mask = self.intersection_db[I]
+        else:                                mask = self.all_mask
+        if self.feature_list[I].init_acceptance_f: return mask
+
+        high   = self.feature_list[I]
+        mask  &= self.prefix_compatible_list[I]
+        result = 0
+        for k in iterable_bits(mask):
+            if not self.feature_list[k].first_set.has_intersection(high.first_set): continue
+            result |= 1 << k
+        return result
+
+    def pair_iterable(self, CandidateMaskFunction, Begin=0, End=None):
+        """YIELDS: Pairs (i, k) with 'i < k' where 'k' is in the candidate mask
+                   of 'i', in the order of 'Mode.unique_pattern_pair_iterable()'.
+
+        Begin, End: restrict 'i' to 'Begin <= i < End'.
+        """
+        if End is None: End = len(self.dfa_list)
+        for i in range(Begin, End):
+            mask = CandidateMaskFunction(i) >> (i + 1)
+            for k in iterable_bits(mask):
+                yield i, i + 1 + k
+
+class _Features:
+    def __init__(self, Dfa):
+        init_state = Dfa.states[Dfa.init_state_index]
+
+        self.init_acceptance_f = init_state.is_acceptance()
+        self.first_set         = init_state.target_map.get_trigger_set_union()
+        self.min_length        = _get_min_length(Dfa)
+        self.max_path          = _get_max_path(Dfa)
+        self.literal_prefix    = _get_literal_prefix(Dfa)
+
+class _ModeProduct:
+    """Walks the setups of the product of all DFAs (see module documentation).
+    DFAs must have distinct state indices.
+
+       superset_list[k]     -- mask of patterns alive and accepting whenever
+                               'k' is alive or accepting (not considering the
+                               initial setup).
+       outrun_list[i]       -- mask of patterns alive in a setup where 'i'
+                               accepts.
+       intersection_list[i] -- mask of patterns accepting in a setup where 'i'
+                               accepts.
+
+    'complete_f' is False, if the product has been abandoned.
+    """
+    def __init__(self, DfaList):
+        N = len(DfaList)
+        self.superset_list     = [ (1 << N) - 1 ] * N
+        self.outrun_list       = [ 0 ] * N
+        self.intersection_list = [ 0 ] * N
+        self.complete_f        = False
+
+        self.state_db = {}   # map: state index --> state
+        self.bit_db   = {}   # map: state index --> bit of its DFA
+        for i, dfa in enumerate(DfaList):
+            for si, state in dfa.states.items():
+                if si in self.state_db: return # state indices not distinct
+                self.state_db[si] = state
+                self.bit_db[si]   = 1 << i
+        self.segment_db = {} # map: state index --> list of (begin, end, (target,))
+
+        init_setup = tuple(sorted(dfa.init_state_index for dfa in DfaList))
+        done_set   = set([init_setup])
+        work_list  = [init_setup]
+        while work_list:
+            setup = work_list.pop()
+            self.__register(setup, setup is init_setup)
+
+            for target_setup in self.__get_target_setups(setup):
+                if target_setup in done_set: continue
+                done_set.add(target_setup)
+                work_list.append(target_setup)
+
+            if len(done_set) > PRODUCT_SETUP_N_MAX: return
+
+        self.complete_f = True
+
+    def __register(self, Setup, InitF):
+        alive_mask  = 0
+        accept_mask = 0
+        for si in Setup:
+            alive_mask |= self.bit_db[si]
+            if self.state_db[si].is_acceptance(): accept_mask |= self.bit_db[si]
+
+        for i in iterable_bits(accept_mask):
+            self.outrun_list[i]       |= alive_mask
+            self.intersection_list[i] |= accept_mask
+
+        if InitF: return
+        for k in iterable_bits(alive_mask):
+            self.superset_list[k] &= alive_mask
+        for k in iterable_bits(accept_mask):
+            self.superset_list[k] &= accept_mask
+
+    def __get_target_setups(self, Setup):
+        dummy, target_list = _segments_from_iterable(
+            segment for si in Setup for segment in self.__get_segment_list(si)
+        )
+        return set(target_setup for target_setup in target_list if target_setup)
+
+    def __get_segment_list(self, StateIndex):
+        result = self.segment_db.get(StateIndex)
+        if result is None:
+            result = [
+                (interval.begin, interval.end, (target_si,))
+                for target_si, trigger_set in self.state_db[StateIndex].target_map.get_map().items()
+                for interval in trigger_set.get_intervals(PromiseToTreatWellF=True)
+            ]
+            self.segment_db[StateIndex] = result
+        return result
+
+def iterable_bits(Mask):
+    """YIELDS: Positions of the bits set in 'Mask' in ascending order.
+    """
+    while Mask:
+        lowest = Mask & -Mask
+        yield lowest.bit_length() - 1
+        Mask ^= lowest
+
+def _transposed(MaskList):
+    """RETURNS: List of masks where bit 'k' of element 'i' is set, if bit 'i'
+                of 'MaskList[k]' is set.
+    """
+    result = [ 0 ] * len(MaskList)
+    for k, mask in enumerate(MaskList):
+        for i in iterable_bits(mask):
+            result[i] |= 1 << k
+    return result
+
+def _less(A, B):
+    """None stands for infinity."""
+    if   B is None: return A is not None
+    elif A is None: return False
+    return A < B
+
+def _less_or_equal(A, B):
+    """None stands for infinity."""
+    if   B is None: return True
+    elif A is None: return False
+    return A <= B
+
+def _get_min_length(Dfa):
+    """Breadth first search for the closest acceptance state.
+    """
+    init_state = Dfa.states[Dfa.init_state_index]
+    work_list  = init_state.target_map.get_target_state_index_list()
+    done_set   = set(work_list)
+    length     = 1
+    while work_list:
+        if any(Dfa.states[si].is_acceptance() for si in work_list): return length
+        next_work_list = []
+        for si in work_list:
+            for target_si in Dfa.states[si].target_map.get_target_state_index_list():
+                if target_si in done_set: continue
+                done_set.add(target_si)
+                next_work_list.append(target_si)
+        work_list = next_work_list
+        length   += 1
+    return None
+
+def _get_max_path(Dfa):
+    """RETURNS: Maximum number of transitions along a path from the initial
+                state. None, if a loop is reachable.
+    """
+    depth_db  = {}   # map: state index --> max. number of transitions from there
+    on_path   = set()
+    work_list = [ (Dfa.init_state_index, False) ]
+    while work_list:
+        si, done_f = work_list.pop()
+        if done_f:
+            on_path.discard(si)
+            depth_db[si] = max([
+                depth_db[target_si] + 1
+                for target_si in Dfa.states[si].target_map.get_target_state_index_list()
+            ] + [ 0 ])
+            continue
+        elif si in depth_db:
+            continue
+        on_path.add(si)
+        work_list.append((si, True))
+        for target_si in Dfa.states[si].target_map.get_target_state_index_list():
+            if   target_si in on_path:  return None
+            elif target_si in depth_db: continue
+            work_list.append((target_si, False))
+    return depth_db[Dfa.init_state_index]
+
+def _get_literal_prefix(Dfa):
+    """RETURNS: Tuple of lexatoms which every lexeme must start with. The
+                prefix ends where a state accepts or triggers on more than
+                one lexatom.
+    """
+    result   = []
+    si       = Dfa.init_state_index
+    done_set = set()
+    while si not in done_set:
+        done_set.add(si)
+        state = Dfa.states[si]
+        if state.is_acceptance(): break
+        transition_list = list(state.target_map.get_map().items())
+        if len(transition_list) != 1: break
+        target_si, trigger_set = transition_list[0]
+        lexatom = trigger_set.get_the_only_element()
+        if lexatom is None: break
+        result.append(lexatom)
+        si = target_si
+    return tuple(result)
+
+def _get_prefix_compatible_list(FeatureList):
+    """RETURNS: List of masks where bit 'k' of element 'i' is set, if the
+                literal prefix of 'k' is a prefix of the one of 'i', or vice
+                versa.
+    """
+    # Trie node: [ mask of patterns with this prefix,
+    #              mask of patterns in the sub-tree,
+    #              map: lexatom --> sub node ]
+    root = [0, 0, {}]
+    for i, feature in enumerate(FeatureList):
+        bit  = 1 << i
+        node = root
+        node[1] |= bit
+        for lexatom in feature.literal_prefix:
+            node = node[2].setdefault(lexatom, [0, 0, {}])
+            node[1] |= bit
+        node[0] |= bit
+
+    result = []
+    for feature in FeatureList:
+        node      = root
+        path_mask = node[0]
+        for lexatom in feature.literal_prefix:
+            node       = node[2][lexatom]
+            path_mask |= node[0]
+        result.append(path_mask | node[1])
+    return result
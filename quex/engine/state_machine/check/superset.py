@@ -2,18 +2,25 @@
 # (C) 2005-2020 Frank-Rene Schaefer; 
 #_______________________________________________________________________________
 from   quex.engine.state_machine.core            import DFA
+from   quex.engine.state_machine.check.memo      import walk
 from   quex.engine.pattern                       import Pattern
 from   quex.engine.misc.tools                    import typed
 from   quex.constants                            import E_AcceptanceCondition
 
 class Checker:
-    def __init__(self, SuperSM, CandidateSM):
+    def __init__(self, SuperSM, CandidateSM, Memo=None):
         assert isinstance(SuperSM, DFA),     SuperSM.__class__.__name__
         assert isinstance(CandidateSM, DFA), CandidateSM.__class__.__name__
 
         self.sub   = CandidateSM
         self.super = SuperSM
-        self.visited_state_index_set = set()
+        #     Union of all triggers were the 'shadowing' super states trigger.
+        #     (For speed considerations, keep it in prepared, so it does not have to 
+        #      be computed each time it is required.)
+        self.super_trigger_set_union_db = {}
+
+        if Memo is None: self.table = {}
+        else:            self.table = Memo.get_table("superset", SuperSM, CandidateSM)
 
     def do(self):
         """RETURNS: 
@@ -25,29 +32,41 @@ class Checker:
            In other words, SuperSM is a 'Super DFA' of Candidate, if
            the set of patterns matched by 'CandidateSM' a subset of the set of
            patterns matched by 'SuperSM'.                            
+
+           The nodes of the walk are pairs 
+
+                  (state index in 'CandidateSM', frozenset of state indices in 'SuperSM')
+
+           where the set contains the states that can 'shadow' the state of 
+           'CandidateSM'. Each node is treated once.
         """
-        return self.__dive(self.sub.init_state_index, [self.super.init_state_index])
+        init_node = (self.sub.init_state_index, frozenset([self.super.init_state_index]))
+        return walk(self.table, init_node, self.__step)
 
-    def __dive(self, SubSM_StateIndex, SuperSM_StateIndexList):
-        """SubSM_StateIndex:       refers to a state in the alleged subset state machine.
+    def __get_super_trigger_set_union(self, SuperSM_StateIndex):
+        result = self.super_trigger_set_union_db.get(SuperSM_StateIndex)
+        if result is None:
+            result = self.super.states[SuperSM_StateIndex].target_map.get_trigger_set_union()
+            self.super_trigger_set_union_db[SuperSM_StateIndex] = result
+        return result
 
-           SuperSM_StateIndexList: list of states in the 'super set' state machine that
-                                   was reached by the same trigger set as SubSM_StateIndex.      
-                                   They are the set of states that can 'shadow' the current
-                                   state indexed by 'SubSM_StateIndex'.
+    def __step(self, Node):
+        """Node = (SubSM_StateIndex, SuperSM_StateIndexSet)
+
+           SubSM_StateIndex:      refers to a state in the alleged subset state machine.
+
+           SuperSM_StateIndexSet: set of states in the 'super set' state machine that
+                                  was reached by the same trigger set as SubSM_StateIndex.      
+                                  They are the set of states that can 'shadow' the current
+                                  state indexed by 'SubSM_StateIndex'.
+
+           RETURNS: List of follow-up nodes.
+                    None, if the claim of 'superset' can be denied.
         """
+        SubSM_StateIndex, SuperSM_StateIndexSet = Node
         # (*) Determine the states behind the indices
         sub_state        = self.sub.states[SubSM_StateIndex]
-        super_state_list = [self.super.states[index] for index in SuperSM_StateIndexList]
-        #     Bookkeeping
-        self.visited_state_index_set.add(SubSM_StateIndex)
-        #     Union of all triggers were the 'shadowing' super states trigger.
-        #     (For speed considerations, keep it in prepared, so it does not have to 
-        #      be computed each time it is required.)
-        super_trigger_set_union_db = dict(
-            (index, self.super.states[index].target_map.get_trigger_set_union())
-            for index in SuperSM_StateIndexList
-        )
+        super_state_list = [self.super.states[index] for index in SuperSM_StateIndexSet]
 
         # (*) CONDITION:
         #
@@ -62,6 +81,7 @@ class Checker:
         # sm' has no correspondance. Thus, then the claim to be a super set state machine can
         # be denied.
         #
+        result = []
         for target_index, trigger_set in sub_state.target_map:
             target_state = self.sub.states[target_index]
 
@@ -70,9 +90,9 @@ class Checker:
             #     
             #     This is true, if the union of all trigger sets of a shadowing 'super state'
             #     covers the trigger set. It's not true, if not. Thus, use set subtraction:
-            for index in SuperSM_StateIndexList:
-                if trigger_set.difference(super_trigger_set_union_db[index]).is_empty() == False:
-                    return False
+            for index in SuperSM_StateIndexSet:
+                if not trigger_set.difference(self.__get_super_trigger_set_union(index)).is_empty():
+                    return None
 
             # (*) Collect the states in the 'super set sm' that can be reached via the 'trigger_set'
             super_target_state_index_set = set()
@@ -86,25 +106,24 @@ class Checker:
                 #     is matched by it and which is not matched by 'super sm'. Thus, the claim 
                 #     that the alleged 'sub sm' is a sub set state machine can be repudiated.
                 for index in super_target_state_index_set:
-                    if self.super.states[index].is_acceptance() == False: return False
+                    if not self.super.states[index].is_acceptance(): return None
 
-            # (*) No need to go along loops, do not follow paths to states already visited.
-            if target_index not in self.visited_state_index_set:
-                if self.__dive(target_index, super_target_state_index_set) == False: return False
+            result.append((target_index, frozenset(super_target_state_index_set)))
 
-        # If the condition held for all sub-pathes of all trigger_sets then we can report
-        # that the currently investigated sub-path supports the claim that 'sub sm' is a
-        # sub set state machine of 'super sm'.
-        return True
+        # If the condition held for all trigger_sets then the currently investigated 
+        # node supports the claim that 'sub sm' is a sub set state machine of 'super sm'.
+        return result
 
 @typed(A=(DFA, Pattern), B=(DFA, Pattern))
-def do(A, B):
+def do(A, B, Memo=None):
     """RETURNS: True  - if A == SUPERSET of B
                 False - if not
+
+    Memo: 'CheckMemo' shared by checks, e.g. of all pattern pairs of a mode.
     """
     if isinstance(A, DFA):
         assert isinstance(B, DFA)
-        return Checker(A, B).do()
+        return Checker(A, B, Memo).do()
 
     assert not isinstance(B, DFA)
     # (*) Core Pattern ________________________________________________________
@@ -115,7 +134,7 @@ def do(A, B):
     #       the whole lexeme has matched (from begin to end of post condition).
     #       Post-conditions only tell something about the place where the 
     #       analyzer returns after the match.
-    superset_f = Checker(A.sm, B.sm).do()
+    superset_f = Checker(A.sm, B.sm, Memo).do()
 
     if not superset_f: return False
 
@@ -144,5 +163,5 @@ def do(A, B):
 
     # 'A' and be either have both pre-context, or none.
     if A.sm_pre_context_to_be_reversed is None: return True
-    else:                        return Checker(B.sm_pre_context_to_be_reversed, A.sm_pre_context_to_be_reversed).do()
+    else:                        return Checker(B.sm_pre_context_to_be_reversed, A.sm_pre_context_to_be_reversed, Memo).do()
 
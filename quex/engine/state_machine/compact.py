@@ -0,0 +1,330 @@
+# Project Quex (http://quex.sourceforge.net); License: MIT;
+# (C) 2005-2020 Frank-Rene Schaefer;
+#_______________________________________________________________________________
+"""Compact, integer-indexed storage of finite automata.
+
+A 'DFA' holds its states in a dictionary that maps globally unique state
+indices to 'DFA_State' objects. Each of those carries a 'TargetMap' (a
+dictionary of 'NumberSet' objects) and a 'SingleEntry'. For modes with many
+thousand states this dominates memory consumption.
+
+A 'CompactDFA' numbers its states densely from 0 to N-1 and stores them in a
+list. A state's transitions are described by two parallel arrays:
+
+        boundaries:  b0,  b1,  b2, ...
+        targets:     t0,  t1,  t2, ...
+
+meaning that lexatoms in [b(i), b(i+1)) trigger to target 't(i)'. Lexatoms
+below 'b0' and from the last boundary on drop out. In a DFA, targets are
+state indices or 'DROP_OUT' stored in an 'array'. In an NFA, a target is a
+tuple of state indices (possibly empty) since a lexatom may trigger to
+multiple states. NFA states may also have epsilon transitions.
+
+Subset construction ('.determinized()') and minimization ('.minimized()')
+operate directly on the compact representation. 'do()' runs the complete
+pipeline on a 'DFA' and converts the result back.
+"""
+from   quex.engine.state_machine.core               import DFA, \
+                                                           _epsilon_closure_map
+from   quex.engine.state_machine.state.core         import DFA_State
+from   quex.engine.state_machine.state.single_entry import SingleEntry
+from   quex.engine.misc.interval_handling           import Interval, NumberSet
+import quex.engine.state_machine.index              as     state_machine_index
+
+from   array       import array
+from   collections import defaultdict
+
+DROP_OUT = -1
+
+class CompactState(object):
+    __slots__ = ("single_entry", "boundaries", "targets", "epsilon_target_list")
+
+    def __init__(self, TheSingleEntry, Boundaries, Targets, EpsilonTargetList=()):
+        assert len(Boundaries) == len(Targets)
+        self.single_entry        = TheSingleEntry
+        self.boundaries          = Boundaries
+        self.targets             = Targets
+        self.epsilon_target_list = EpsilonTargetList
+
+    def is_DFA_compliant(self):
+        return isinstance(self.targets, array) and not self.epsilon_target_list
+
+    def iterable_segments(self):
+        """YIELDS: (begin, end, target tuple)
+
+        for all ranges that trigger to at least one target.
+        """
+        b = self.boundaries
+        L = len(b)
+        if isinstance(self.targets, array):
+            for i, target in enumerate(self.targets):
+                if target == DROP_OUT: continue
+                yield b[i], b[i+1], (target,)
+        else:
+            for i, target_tuple in enumerate(self.targets):
+                if not target_tuple: continue
+                yield b[i], b[i+1], target_tuple
+
+    def get_target_map(self, IndexList):
+        """RETURNS: TargetMap database, i.e. map: target state index --> NumberSet
+
+        The state index of state 'i' in the target map is 'IndexList[i]'.
+        """
+        interval_db = defaultdict(list)
+        for begin, end, target_tuple in self.iterable_segments():
+            for target in target_tuple:
+                interval_db[target].append(Interval(begin, end))
+        return dict(
+            (IndexList[target], NumberSet(interval_list, ArgumentIsYoursF=True))
+            for target, interval_list in interval_db.items()
+        )
+
+class CompactDFA(object):
+    """Members:
+
+         init_state_index -- index of the initial state.
+         states           -- list of 'CompactState' objects.
+    """
+    __slots__ = ("init_state_index", "states")
+
+    def __init__(self, InitStateIndex, StateList):
+        self.init_state_index = InitStateIndex
+        self.states           = StateList
+
+    @staticmethod
+    def from_DFA(Dfa):
+        """The state indices of 'Dfa' are mapped to 0, 1, ... in ascending
+        order. Single entries are cloned, so that 'Dfa' remains untouched.
+        """
+        si_list  = sorted(Dfa.states.keys())
+        index_db = dict((si, i) for i, si in enumerate(si_list))
+
+        state_list = []
+        for si in si_list:
+            state = Dfa.states[si]
+            boundaries, \
+            targets     = _segments_from_target_map(state.target_map.get_map(), index_db)
+            epsilon_target_list = tuple(
+                index_db[x] for x in state.target_map.get_epsilon_target_state_index_list()
+            )
+            if not epsilon_target_list and all(len(t) == 1 for t in targets if t):
+                targets = array("l", (t[0] if t else DROP_OUT for t in targets))
+            state_list.append(CompactState(state.single_entry.clone(),
+                                           array("q", boundaries), targets,
+                                           epsilon_target_list))
+
+        return CompactDFA(index_db[Dfa.init_state_index], state_list)
+
+    def to_DFA(self, DfaId=None):
+        """RETURNS: 'DFA' with new state indices from the global index counter.
+        """
+        index_list = [ state_machine_index.get() for i in range(len(self.states)) ]
+        result     = DFA(DoNothingF=True, DfaId=DfaId)
+        result.init_state_index = index_list[self.init_state_index]
+        for i, state in enumerate(self.states):
+            new_state = DFA_State.from_TargetMap(state.get_target_map(index_list))
+            new_state.set_single_entry(state.single_entry)
+            for target in state.epsilon_target_list:
+                new_state.target_map.add_epsilon_target_state(index_list[target])
+            result.states[index_list[i]] = new_state
+        return result
+
+    def is_DFA_compliant(self):
+        return all(state.is_DFA_compliant() for state in self.states)
+
+    def get_epsilon_closure_list(self):
+        """RETURNS: list where element 'i' is the sorted tuple of state indices
+                    that are reached from state 'i' via epsilon transitions,
+                    including 'i' itself.
+        """
+        closure_map = _epsilon_closure_map(
+            (i, state.epsilon_target_list) 
+            for i, state in enumerate(self.states) if state.epsilon_target_list
+        )
+        return [
+            tuple(sorted(closure_map[i])) if i in closure_map else (i,)
+            for i in range(len(self.states))
+        ]
+
+    def determinized(self):
+        """Subset construction. States of the result are epsilon closed sets of
+        states of this automaton. Only states that are reachable from the
+        initial state are generated.
+
+        RETURNS: CompactDFA that is DFA compliant.
+        """
+        closure_list = self.get_epsilon_closure_list()
+        expansion_db = {}   # map: target tuple --> epsilon closure of targets
+        subset_db    = {}   # map: epsilon closure --> state index in result
+        state_list   = []
+        worklist     = []
+
+        def get_state_index(Subset):
+            si = subset_db.get(Subset)
+            if si is None:
+                si = len(state_list)
+                subset_db[Subset] = si
+                state_list.append(None)
+                worklist.append((si, Subset))
+            return si
+
+        def expand(TargetTuple):
+            subset = expansion_db.get(TargetTuple)
+            if subset is None:
+                if len(TargetTuple) == 1:
+                    subset = closure_list[TargetTuple[0]]
+                else:
+                    subset = set()
+                    for target in TargetTuple:
+                        subset.update(closure_list[target])
+                    subset = tuple(sorted(subset))
+                expansion_db[TargetTuple] = subset
+            return subset
+
+        init_si = get_state_index(closure_list[self.init_state_index])
+        while worklist:
+            si, subset = worklist.pop()
+            single_entry = SingleEntry()
+            single_entry.merge_list(self.states[i].single_entry for i in subset)
+
+            raw_boundaries, \
+            raw_targets      = _segments_from_iterable(
+                segment for i in subset for segment in self.states[i].iterable_segments()
+            )
+            boundaries = array("q")
+            targets    = array("l")
+            prev       = DROP_OUT
+            for boundary, target_tuple in zip(raw_boundaries, raw_targets):
+                if target_tuple: target = get_state_index(expand(target_tuple))
+                else:            target = DROP_OUT
+                if target == prev: continue
+                boundaries.append(boundary)
+                targets.append(target)
+                prev = target
+
+            state_list[si] = CompactState(single_entry, boundaries, targets)
+
+        return CompactDFA(init_si, state_list)
+
+    def minimized(self):
+        """Partition refinement: The initial partition separates states
+        according to '.single_entry.hopcroft_combinability_key()'. A block is
+        split as long as its states trigger on the same lexatoms to different
+        blocks. Equivalent states are combined into one state.
+
+        RETURNS: minimized CompactDFA.
+        """
+        assert self.is_DFA_compliant()
+
+        key_db    = {}
+        block     = [
+            key_db.setdefault(state.single_entry.hopcroft_combinability_key(), len(key_db))
+            for state in self.states
+        ]
+        block_n   = len(key_db)
+        while 1:
+            signature_db = {}
+            new_block    = [
+                signature_db.setdefault((block[i], _signature(state, block)), len(signature_db))
+                for i, state in enumerate(self.states)
+            ]
+            block = new_block
+            if len(signature_db) == block_n: break
+            block_n = len(signature_db)
+
+        if block_n == len(self.states):
+            return self
+
+        member_db = defaultdict(list)
+        for i, block_i in enumerate(block):
+            member_db[block_i].append(i)
+
+        state_list = []
+        for block_i in range(block_n):
+            member_list = member_db[block_i]
+            if self.init_state_index in member_list: prototype_i = self.init_state_index
+            else:                                    prototype_i = member_list[0]
+            prototype    = self.states[prototype_i]
+            single_entry = prototype.single_entry.clone()
+            single_entry.merge_list(
+                self.states[i].single_entry for i in member_list if i != prototype_i
+            )
+            signature = _signature(prototype, block)
+            state_list.append(CompactState(single_entry,
+                                           array("q", signature[0::2]),
+                                           array("l", signature[1::2])))
+
+        return CompactDFA(block[self.init_state_index], state_list)
+
+def do(SM, NfaToDfaF=True, CloneF=True):
+    """Same as 'beautifier.do()', only that subset construction and
+    minimization run on the compact representation.
+    """
+    if CloneF: dfa_id = None
+    else:      dfa_id = SM.get_id()
+    result = CompactDFA.from_DFA(SM)
+    if NfaToDfaF or not result.is_DFA_compliant(): result = result.determinized()
+    return result.minimized().to_DFA(dfa_id)
+
+def _signature(State, Block):
+    """RETURNS: Tuple (b0, t0, b1, t1, ...) of the state's transitions where
+                targets are replaced by their blocks. Adjacent ranges to
+                the same block are combined.
+    """
+    result = []
+    prev   = DROP_OUT
+    for boundary, target in zip(State.boundaries, State.targets):
+        if target != DROP_OUT: target = Block[target]
+        if target == prev: continue
+        result.append(boundary)
+        result.append(target)
+        prev = target
+    return tuple(result)
+
+def _segments_from_target_map(Db, IndexDb):
+    """Db: map: target state index --> NumberSet
+
+    RETURNS: [0] boundaries
+             [1] targets, i.e. sorted tuples of the targets that are triggered
+                 in the range starting at the corresponding boundary.
+    """
+    return _segments_from_iterable(
+        (interval.begin, interval.end, (IndexDb[target_si],))
+        for target_si, trigger_set in Db.items()
+        for interval in trigger_set.get_intervals(PromiseToTreatWellF=True)
+    )
+
+def _segments_from_iterable(SegmentIterable):
+    """SegmentIterable: iterable over (begin, end, target tuple). Segments may
+    overlap.
+
+    RETURNS: See '_segments_from_target_map()'.
+    """
+    event_list = []
+    for begin, end, target_tuple in SegmentIterable:
+        if begin == end: continue
+        event_list.append((begin, 1, target_tuple))
+        event_list.append((end,  -1, target_tuple))
+    event_list.sort(key=lambda x: x[0])
+
+    boundaries = []
+    targets    = []
+    active_db  = defaultdict(int)   # map: target --> number of open segments
+    prev       = ()
+    L          = len(event_list)
+    i          = 0
+    while i < L:
+        position = event_list[i][0]
+        while i < L and event_list[i][0] == position:
+            dummy, delta, target_tuple = event_list[i]
+            for target in target_tuple:
+                active_db[target] += delta
+                if not active_db[target]: del active_db[target]
+            i += 1
+        current = tuple(sorted(active_db))
+        if current == prev: continue
+        boundaries.append(position)
+        targets.append(current)
+        prev = current
+
+    return boundaries, targets
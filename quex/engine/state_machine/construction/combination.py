@@ -2,7 +2,8 @@
 # (C) 2005-2020 Frank-Rene Schaefer; 
 #_______________________________________________________________________________
 import quex.engine.state_machine.construction.parallelize        as parallelize
-import quex.engine.state_machine.algorithm.hopcroft_minimization as hopcroft_minimization
+import quex.engine.state_machine.algorithm.minimizer             as minimizer
+import quex.engine.state_machine.algorithm.alphabet              as alphabet
 import quex.engine.misc.error                                    as     error
 
 def do(StateMachine_List, FilterDominatedOriginsF=True,
@@ -16,6 +17,10 @@ def do(StateMachine_List, FilterDominatedOriginsF=True,
                      -- translation from NFA to DFA
                      -- Frank Schaefers Adapted Hopcroft optimization.
 
+           All steps run on trigger sets of alphabet equivalence classes,
+           if that pays off. The classes are computed once for all patterns
+           of the list (see 'alphabet.py').
+
            Again: The state machine ids of the original state machines
                   are traced through the whole process.
                   
@@ -69,8 +74,12 @@ def do(StateMachine_List, FilterDominatedOriginsF=True,
         assert sm.is_DFA_compliant(), sm.get_string(Option="hex")
 
     # (2) setup all patterns in paralell 
-    sm = parallelize.do([sm.clone() for sm in StateMachine_List], 
-                        CommonTerminalStateF=False) 
+    sm_list   = [sm.clone() for sm in StateMachine_List]
+    partition = alphabet.do(*sm_list)
+    if partition is not None:
+        for sm in sm_list: partition.compress(sm)
+
+    sm = parallelize.do(sm_list, CommonTerminalStateF=False) 
     __insight_check("Combine patterns", sm, AlllowInitStateAcceptF)
 
 
@@ -80,7 +89,9 @@ def do(StateMachine_List, FilterDominatedOriginsF=True,
     __insight_check("Clean-up state entry operations", sm, AlllowInitStateAcceptF)
 
     # (3) convert the state machine to an DFA (paralellization created an NFA)
-    sm = hopcroft_minimization.do(sm, CreateNewStateMachineF=False)
-    __insight_check("Hopcroft Minimization", sm, AlllowInitStateAcceptF)
+    sm = minimizer.do(sm)
+    __insight_check("Minimization", sm, AlllowInitStateAcceptF)
+
+    if partition is not None: partition.expand(sm)
     
     return sm
@@ -26,7 +26,8 @@ def do(StateMachineList, CommonTerminalStateF=True):
         return not sm.is_Empty() and sm.get_init_state().has_transitions()
 
     # filter out empty state machines from the consideration          
-    sm_list       = [ sm for sm in StateMachineList if consider(sm) ]
+    # (state indices of different state machines must not collide)
+    sm_list       = DFA.disjoint_index_spaces([ sm for sm in StateMachineList if consider(sm) ])
     empty_sm_list = [ sm for sm in StateMachineList if not consider(sm) ]
 
     if len(sm_list) < 2:
@@ -38,6 +38,10 @@ def do(the_state_machine_list,
     if not state_machine_list:         return DFA.Nothing()
     elif len(state_machine_list) == 1: return state_machine_list[0]
 
+    # State indices must not collide (DFAs built elsewhere, or the same DFA
+    # appearing twice). Clones receive indices beyond all existing ones.
+    state_machine_list = DFA.disjoint_index_spaces(state_machine_list)
+
     # (*) collect all transitions from both state machines into a single one
     #     (clone to ensure unique identifiers of states)
     result = state_machine_list[0]
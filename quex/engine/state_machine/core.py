@@ -7,6 +7,7 @@ from   quex.engine.misc.interval_handling           import NumberSet, Interval,
                                                            NumberSet_All
 import quex.engine.state_machine.index              as     state_machine_index
 from   quex.engine.state_machine.state.core         import DFA_State
+import quex.engine.state_machine.state.target_map   as     target_map_module
 from   quex.engine.state_machine.state.single_entry import SeAccept
 from   quex.input.code.base                         import SourceRef_VOID
 
@@ -23,6 +24,42 @@ from   operator    import itemgetter
 
 from   collections import defaultdict
 
+class StateDb(dict):
+    """map: state index --> DFA_State
+
+    Counts the changes to the map, so that caches which depend on its content
+    can be invalidated (see 'DFA.epsilon_closure_map').
+    """
+    change_n = 0   # class attribute as default; pickle enters items first.
+
+    def __setitem__(self, Key, Value):
+        self.change_n += 1
+        dict.__setitem__(self, Key, Value)
+
+    def __delitem__(self, Key):
+        self.change_n += 1
+        dict.__delitem__(self, Key)
+
+    def update(self, *Args, **Kwargs):
+        self.change_n += 1
+        dict.update(self, *Args, **Kwargs)
+
+    def setdefault(self, Key, Default=None):
+        self.change_n += 1
+        return dict.setdefault(self, Key, Default)
+
+    def pop(self, *Args):
+        self.change_n += 1
+        return dict.pop(self, *Args)
+
+    def popitem(self):
+        self.change_n += 1
+        return dict.popitem(self)
+
+    def clear(self):
+        self.change_n += 1
+        dict.clear(self)
+
 class DFA(object):
     """A 'DFA', in Quex-Lingo, is a finite state automaton where all entries 
     into a state are subject to the same entry action. 
@@ -50,17 +87,19 @@ class DFA(object):
         "states",
         "init_state_index",
         "__id",
-        "sr"
+        "sr",
+        "__epsilon_closure_cache"
     )
     def __init__(self, InitStateIndex=None, AcceptanceF=False, InitState=None, DoNothingF=False, DfaId=None):
         if DfaId is None: self.set_id(state_machine_index.get_state_machine_id())
         else:             self.set_id(DfaId)
 
         self.sr = SourceRef_VOID
+        self.__epsilon_closure_cache = None
 
         if DoNothingF: 
             self.init_state_index = -1
-            self.states           = {}
+            self.states           = StateDb()
             return
 
         if InitStateIndex is None: InitStateIndex = state_machine_index.get()
@@ -68,7 +107,7 @@ class DFA(object):
             
         # DFA_State Index => DFA_State (information about what triggers transition to what target state).
         if InitState is None: InitState = DFA_State(AcceptanceF=AcceptanceF)
-        self.states = { self.init_state_index: InitState }        
+        self.states = StateDb({ self.init_state_index: InitState })
 
     @staticmethod
     def Empty():
@@ -156,7 +195,7 @@ class DFA(object):
         """
         result = DFA(DoNothingF=True)
         result.init_state_index = InitStateIndex
-        result.states = dict(IterableStateIndexStatePairs)
+        result.states = StateDb(IterableStateIndexStatePairs)
         return result
 
     @staticmethod
@@ -321,15 +360,44 @@ class DFA(object):
         }
         result = DFA(InitStateIndex=correspondance_db[StartSi], DfaId=DfaId)
 
-        result.states = {
+        result.states = StateDb({
             # '.clone(correspondance_db)' only clones transitions to target states 
             # which are mentioned in 'correspondance_db'.
             correspondance_db[si]: self.states[si].clone(correspondance_db)
             for si in StateSiSet
-        }
+        })
         
         return result
 
+    def max_state_index(self):
+        if not self.states: return -1
+        return max(self.states.keys())
+
+    @staticmethod
+    def disjoint_index_spaces(DfaList):
+        """Combining DFAs requires that their state indices do not collide.
+        Indices from the global counter are unique within a process. DFAs that
+        were built elsewhere, e.g. in a worker process, or that appear twice
+        in 'DfaList' may collide. Such DFAs are renumbered. Also, the global
+        counter is set beyond all indices, so that newly created states do not
+        collide.
+
+        RETURNS: List of DFAs with pairwise disjoint state indices. DFAs that
+                 do not collide with a predecessor in the list are taken as
+                 they are.
+        """
+        if not DfaList: return []
+
+        state_machine_index.ensure_greater_than(max(dfa.max_state_index() for dfa in DfaList))
+        result    = []
+        taken_set = set()
+        for dfa in DfaList:
+            if not taken_set.isdisjoint(dfa.states.keys()):
+                dfa = dfa.clone(StateMachineId=dfa.get_id())
+            taken_set.update(dfa.states.keys())
+            result.append(dfa)
+        return result
+
     def get_id(self):
         assert isinstance(self.__id, int) or self.__id in E_IncidenceIDs
         return self.__id  # core.id()
@@ -364,14 +432,15 @@ class DFA(object):
 
         return [ i for i in self.states.keys() if i not in connected_set ]
 
-    def get_hopeless_state_index_list(self):
+    def get_hopeless_state_index_list(self, HintFromDb=None):
         """Find list of hopeless states, i.e. states from one can never 
         reach an acceptance state. 
         
         HOPELESS STATE: A state that cannot reach an acceptance state.
                        (There is no connection forward to an acceptance state).
         """
-        from_db = self.get_from_db()
+        if HintFromDb is None: from_db = self.get_from_db()
+        else:                  from_db = HintFromDb
 
         work_set     = set(  self.acceptance_state_index_list() 
                            + self.get_bad_lexatom_detector_state_index_list())
@@ -393,42 +462,55 @@ class DFA(object):
         """RETURNS: 
                     state index --> set(epsilon target state indices)
         """
-        db = {}
-        occurrence_db = defaultdict(int)
-        for si, state in self.states.items():
-            etsi_list = state.target_map.get_epsilon_target_state_index_list()
-            if not etsi_list: 
-                if AddNoEpsilonStatesF: db[si] = set([si])
-                continue
-            db[si] = set(etsi_list)
-            db[si].add(si)
-            for etsi in etsi_list: 
-                occurrence_db[etsi] += 1
-
-        # Expand those with the highest amount of references first.
-        for si, closure in sorted(iter(db.items()), key=lambda x: - occurrence_db[x[0]]):
-            worklist = set(closure)
-            done_set = set([si])
-            while worklist:
-                csi          = worklist.pop()
-                csi_closure  = db.get(csi)
-                done_set.add(csi)
-                if csi_closure is None: continue
-                new_etsi_set = csi_closure.difference(closure)
-                closure.update(new_etsi_set)
-                worklist.update(x for x in new_etsi_set if x not in done_set)
-            # 'closure' (a reference) of 'si' has been updated.
-
+        closure_map = self.epsilon_closure_map
+        db          = {}
+        for si in self.states.keys():
+            closure = closure_map.get(si)
+            if closure is not None: db[si] = set(closure)
+            elif AddNoEpsilonStatesF: db[si] = set([si])
         return db
 
+    @property
+    def epsilon_closure_map(self):
+        """map: state index --> frozenset of state indices reachable via epsilon
+                                transitions (including the state itself).
+
+        Only states with epsilon transitions are mentioned. The map is computed
+        once and kept until states are added, replaced, or deleted, or epsilon
+        transitions of any target map change. It must not be modified.
+
+        If 'states' is not a 'StateDb' (e.g. a dictionary assigned from 
+        outside), changes cannot be detected and the map is not cached.
+        """
+        if self.__epsilon_closure_cache is not None:
+            state_db, change_n, epsilon_change_n, result = self.__epsilon_closure_cache
+            if     state_db is self.states \
+               and change_n == state_db.change_n \
+               and epsilon_change_n == target_map_module.epsilon_change_n:
+                return result
+
+        edge_list = [
+            (si, tuple(etsi_list))
+            for si, etsi_list in (
+                (si, state.target_map.get_epsilon_target_state_index_list())
+                for si, state in self.states.items()
+            )
+            if etsi_list
+        ]
+        result = _epsilon_closure_map(edge_list)
+        if isinstance(self.states, StateDb):
+            self.__epsilon_closure_cache = (self.states, self.states.change_n, 
+                                            target_map_module.epsilon_change_n, result)
+        return result
+
     def get_epsilon_closure(self, StateIdx):
         """Return all states that can be reached from 'StateIdx' via epsilon
            transition."""
         assert StateIdx in self.states
 
-        result = set([StateIdx])
-        self.__dive_for_epsilon_closure(StateIdx, result)
-        return result
+        closure = self.epsilon_closure_map.get(StateIdx)
+        if closure is None: return set([StateIdx])
+        else:               return set(closure)
  
     def acceptance_state_iterable(self):
         return [ 
@@ -861,31 +943,101 @@ class DFA(object):
             state.target_map.delete_transitions_to_target(self.init_state_index)
         self.delete_orphaned_states()
 
-    def delete_orphaned_states(self):
+    def delete_orphaned_states(self, CandidateSet=None, ReferrerDb=None):
         """Remove all orphan states.
 
         ORPHAN STATE: A state that is not connected to an init state. That is
                       it can never be reached from the init state.
+
+        CandidateSet: If given, only the states in 'CandidateSet' can possibly 
+                      be orphans. All other states are known to be reachable.
+                      Then, only the candidates are investigated.
+
+        ReferrerDb:   map: state index --> set of indices of the other states
+                      that have a transition to it. If given, it must cover 
+                      the candidates. It is used instead of a scan over all
+                      states. Its sets are changed.
         """
-        for state_index in self.get_orphaned_state_index_list():
+        if CandidateSet is None: orphan_list = self.get_orphaned_state_index_list()
+        else:                    orphan_list = self.__get_orphaned_candidates(CandidateSet, ReferrerDb)
+
+        for state_index in orphan_list:
             if state_index == self.init_state_index: continue
             self.states.pop(state_index)
 
+    def __get_orphaned_candidates(self, CandidateSet, ReferrerDb):
+        """Determines orphans under the assumption that all states which are 
+        not in 'CandidateSet' are reachable from the init state.
+
+        (1) Reverse reference index: for each candidate the set of states 
+            that have a transition to it (except itself). Unless it is given
+            by 'ReferrerDb', all states are scanned.
+        (2) A candidate without referring states is an orphan. Its targets
+            loose a referrer. Those left without referrer are orphans, too,
+            and so on.
+        (3) Candidates that remain may refer to each other in cycles without
+            being reachable. A candidate is reachable, if it is referred by a
+            non-candidate or by a reachable candidate. The walk only covers
+            the remaining candidates.
+
+        RETURNS: List of orphan state indices.
+        """
+        candidate_set = set(
+            si for si in CandidateSet 
+            if si in self.states and si != self.init_state_index
+        )
+
+        # (1) Reverse reference index
+        if ReferrerDb is None:
+            ReferrerDb = dict((si, set()) for si in candidate_set)
+            for si, state in self.states.items():
+                for target_si in state.target_map.iterable_target_state_indices():
+                    referrer_set = ReferrerDb.get(target_si)
+                    if referrer_set is not None and target_si != si: referrer_set.add(si)
+
+        # (2) Cascade of orphans without referrers
+        orphan_set = set()
+        work_list  = [ si for si in candidate_set if not ReferrerDb[si] ]
+        while work_list:
+            si = work_list.pop()
+            if si in orphan_set: continue
+            orphan_set.add(si)
+            for target_si in self.states[si].target_map.iterable_target_state_indices():
+                if target_si not in candidate_set or target_si in orphan_set: continue
+                referrer_set = ReferrerDb[target_si]
+                referrer_set.discard(si)
+                if not referrer_set: work_list.append(target_si)
+
+        # (3) Orphan cycles
+        remainder_set = candidate_set.difference(orphan_set)
+        reached_set   = set(
+            si for si in remainder_set if not ReferrerDb[si].issubset(candidate_set)
+        )
+        work_list = list(reached_set)
+        while work_list:
+            si = work_list.pop()
+            for target_si in self.states[si].target_map.iterable_target_state_indices():
+                if target_si not in remainder_set or target_si in reached_set: continue
+                reached_set.add(target_si)
+                work_list.append(target_si)
+        orphan_set.update(remainder_set.difference(reached_set))
+
+        return list(orphan_set)
+
     def delete_hopeless_states(self):
         """Delete all hopeless states and transitions to them.
 
         HOPELESS STATE: A state that cannot reach an acceptance state.
                        (There is no connection forward to an acceptance state).
         """
-        hopeless_si_set = set(self.get_hopeless_state_index_list())
-        concerned_state_list = [
-            state
-            for si, state in self.states.items()
-            if si not in hopeless_si_set or si == self.init_state_index
-        ]
+        # The reverse reference index tells which states have transitions to
+        # a hopeless state. Only those need to be adapted.
+        from_db         = self.get_from_db()
+        hopeless_si_set = set(self.get_hopeless_state_index_list(from_db))
         for hl_si in hopeless_si_set:
-            for state in concerned_state_list:
-                state.target_map.delete_transitions_to_target(hl_si)
+            for from_si in from_db.get(hl_si, ()):
+                if from_si in hopeless_si_set and from_si != self.init_state_index: continue
+                self.states[from_si].target_map.delete_transitions_to_target(hl_si)
             if hl_si == self.init_state_index: continue
             self.states.pop(hl_si)
         return 
@@ -934,12 +1086,6 @@ class DFA(object):
                 number_set.mask_interval(MaskInterval)
                 if number_set.is_empty(): del target_map[to_si]
 
-    def __dive_for_epsilon_closure(self, state_index, result):
-        index_list = self.states[state_index].target_map.get_epsilon_target_state_index_list()
-        for target_index in filter(lambda x: x not in result, index_list):
-            result.add(target_index)
-            self.__dive_for_epsilon_closure(target_index, result)
-
     def is_DFA_compliant(self):
         for state in list(self.states.values()):
             if state.target_map.is_DFA_compliant() == False: 
@@ -1210,6 +1356,100 @@ class DFA(object):
         searcher.do(self.init_state_index)
         return searcher.found_cycle_f
 
+def _epsilon_closure_map(EdgeList):
+    """EdgeList: list of (state index, tuple of epsilon target state indices)
+
+    Tarjan's algorithm determines the strongly connected components (SCC) of
+    the epsilon transition graph. All states of an SCC have the same closure.
+    SCCs are completed in reverse topological order. Thus, when an SCC is 
+    completed, the closures of all SCCs that it reaches are known. Its closure
+    is the union of its own states and those closures. Closures are stored as
+    bitsets (integers) over a dense numbering of the involved states. Each 
+    closure is computed once in linear time.
+
+    RETURNS: map: state index --> frozenset of state indices in its closure.
+    """
+    edge_db    = dict(EdgeList)
+    node_list  = list(edge_db.keys())
+    index_db   = dict((si, i) for i, si in enumerate(node_list))
+    for target_tuple in edge_db.values():
+        for target_si in target_tuple:
+            if target_si in index_db: continue
+            index_db[target_si] = len(node_list)
+            node_list.append(target_si)
+
+    N          = len(node_list)
+    successors = [
+        [ index_db[target_si] for target_si in edge_db.get(si, ()) ] for si in node_list
+    ]
+    visit_i    = [-1] * N
+    low        = [0]  * N
+    on_stack_f = [False] * N
+    scc_of     = [-1] * N
+    scc_bits   = []
+    stack      = []
+    counter    = 0
+    for root in range(N):
+        if visit_i[root] != -1: continue
+        visit_i[root] = low[root] = counter
+        counter += 1
+        stack.append(root)
+        on_stack_f[root] = True
+        work_stack = [ (root, 0) ]
+        while work_stack:
+            v, k = work_stack[-1]
+            if k < len(successors[v]):
+                work_stack[-1] = (v, k + 1)
+                w = successors[v][k]
+                if visit_i[w] == -1:
+                    visit_i[w] = low[w] = counter
+                    counter += 1
+                    stack.append(w)
+                    on_stack_f[w] = True
+                    work_stack.append((w, 0))
+                elif on_stack_f[w] and visit_i[w] < low[v]:
+                    low[v] = visit_i[w]
+                continue
+
+            work_stack.pop()
+            if work_stack:
+                u = work_stack[-1][0]
+                if low[v] < low[u]: low[u] = low[v]
+            if low[v] != visit_i[v]: continue
+
+            # 'v' is the root of an SCC. Its members are on top of the stack.
+            scc_i       = len(scc_bits)
+            member_list = []
+            bits        = 0
+            while 1:
+                w = stack.pop()
+                on_stack_f[w] = False
+                scc_of[w]     = scc_i
+                member_list.append(w)
+                bits |= 1 << w
+                if w == v: break
+            for w in member_list:
+                for x in successors[w]:
+                    if scc_of[x] != scc_i: bits |= scc_bits[scc_of[x]]
+            scc_bits.append(bits)
+
+    closure_list = [ None ] * len(scc_bits)
+    result       = {}
+    for si in edge_db.keys():
+        scc_i   = scc_of[index_db[si]]
+        closure = closure_list[scc_i]
+        if closure is None:
+            closure = frozenset(node_list[i] for i in _bit_index_iterable(scc_bits[scc_i]))
+            closure_list[scc_i] = closure
+        result[si] = closure
+    return result
+
+def _bit_index_iterable(Bits):
+    while Bits:
+        lowest = Bits & -Bits
+        yield lowest.bit_length() - 1
+        Bits  ^= lowest
+
 def NumberSetSequence_to_NumberSequences(NumberSetSequence):
     """Takes a sequence of NumberSet objects. Each NumberSet corresponds
     to possible numbers at the position where it occurs. Alls possible
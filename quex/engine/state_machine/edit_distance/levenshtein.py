@@ -1,16 +1,20 @@
 # Project Quex (http://quex.sourceforge.net); License: MIT;
-# (C) 2005-2020 Frank-Rene Schaefer; 
+# (C) 2005-2020 Frank-Rene Schaefer;
 #_______________________________________________________________________________
 from   quex.engine.state_machine.core                 import DFA
+from   quex.engine.state_machine.state.core           import DFA_State
+from   quex.engine.state_machine.state.single_entry   import SingleEntry
+from   quex.engine.state_machine.compact              import _segments_from_iterable
+from   quex.engine.misc.interval_handling             import Interval, NumberSet
 import quex.engine.state_machine.index                as     index
 import quex.engine.state_machine.algorithm.beautifier as     beautifier
 
 def do(Dfa, N, InsertableCs, DeletableCs, SubstitutableCs, SubstituteCs):
     """Generates a Levenshtein Automaton (brief 'LA').
-    
+
     An 'LA' of a given 'Dfa' matches all lexemes which can be matched by the
-    'Dfa', plus the lexemes that can be produced by 'N' edit distance 
-    operations. Edit distance operations are 'insert', 'delete', and 
+    'Dfa', plus the lexemes that can be produced by 'N' edit distance
+    operations. Edit distance operations are 'insert', 'delete', and
     'substitute'.
 
     'InsertableCs':    characters inserted during an 'Insert' ed-op.
@@ -22,86 +26,178 @@ def do(Dfa, N, InsertableCs, DeletableCs, SubstitutableCs, SubstituteCs):
     'SubstituteCs':    characters substituted during an 'Substitute' ed-op.
 
     NOTE: For DFAs with cycles, the result is still functional. It still
-          matches similar lexemes, but the edit distance assumption may not 
+          matches similar lexemes, but the edit distance assumption may not
           hold.
-    
+
     RETURNS: Levenshtein Automaton.
     """
     # HOW IT WORKS:
     #
     # An edit distance operation (ed-op) that fixes a deviation from an
     # original lexeme corresponds to special transitions. For an edit distance
-    # of 'N' create 'N' levels of clones of the original DFA. Every clone
-    # stands for the number of remaining ed-ops. Whenever and ed-op is applied,
-    # it transits to the next level. When the highest level is reached no 
+    # of 'N' imagine 'N' levels of clones of the original DFA. Every clone
+    # stands for the number of applied ed-ops. Whenever and ed-op is applied,
+    # it transits to the next level. When the highest level is reached no
     # further ed-ops can be applied.
+    #
+    # The levels are not built. Following Schulz and Mihov ('Fast String
+    # Correction with Levenshtein-Automata', 2002), a state of the LA is a set
+    # of 'positions' (si, level), where 'si' is a state of 'Dfa'. The position
+    # (si, level) subsumes (si, level + k), since anything matched from the
+    # latter is also matched from the former. So, a state of the LA maps each
+    # 'si' only to its lowest level. This keeps the sets of positions small,
+    # where subset construction on the levels' NFA would combine all of them.
+    # The LA is constructed as DFA; only minimization remains.
+    #
+    # (Schulz and Mihov tabulate the position sets of single words in advance,
+    #  'universal Levenshtein automata'. Here, 'Dfa' may be any DFA and ed-ops
+    #  are restricted to character sets. So, position sets are computed on
+    #  demand.)
+    if not Dfa.is_DFA_compliant(): Dfa = beautifier.do(Dfa)
 
-    grid = LevelGrid(Dfa, N)
-
-    for next_level_db, si, state_tm in grid:
-        # Copy the original transitions before any new ones are added.
-        transition_iterable = list(iter(state_tm))
-
-        # Insert transitions => Transition to the clones same state
-        if InsertableCs is not None:
-            next_level_si = next_level_db[si]
-            state_tm.add_transition(InsertableCs, next_level_si)
-
-        for target_si, character_set in transition_iterable:
-            next_level_target_si = next_level_db[target_si]
-            # Delete transitions => Epsilon to the clones subsequent states
-            if     DeletableCs is not None \
-               and DeletableCs.has_intersection(character_set): 
-                state_tm.add_epsilon_target_state(next_level_target_si)
-        
-            # Substitutable transitions => Remainder to next level target
-            if     SubstitutableCs is not None \
-               and SubstitutableCs.has_intersection(character_set):
-                remainder = SubstituteCs.difference(character_set)
-                state_tm.add_transition(remainder, next_level_target_si)
-
-    return beautifier.do(grid.dfa, CloneF=False)
-
-class LevelGrid:
-    def __init__(self, Dfa, N):
-        """Whenever a transition happens which can only occur with an edit
-        operation 'insert', 'delete', or 'substitute', there is a transition
-        to a next level clone which allows one less edit operation.
-
-        RETURNS: [0] List of DFAs 'clone_list'.
-                 [1] State index database 'clone_state_db', where
-
-            clone_state_db[clone_i][state_i] ---> correspondent state index 
-                                                  in 'clone_i+1'
-
-        For a given DFA clone 'clone_list[i]', the dictionary entry 
-        'db[clone_i][state_i]' gives the state index of the original DFA
-        from where the state 'state_i' has been cloned.
-        """
-        def get_replacement_db(SiIterable):
-            return dict((orig_si, index.get()) for orig_si in SiIterable)
-
-        self.dfa                       = DFA(DoNothingF=True)
-        self.level_n                   = N
-        self.next_level_state_index_db = []
-        prev_clone                     = Dfa
-        for level in range(self.level_n+1):
-            next_level_db = get_replacement_db(iter(prev_clone.states.keys()))
-            if level:
-                self.next_level_state_index_db.append(next_level_db)
-            else:
-                # The grid's init state is the init state of the clone on the lowest 
-                # level of the grid.
-                self.dfa.init_state_index = next_level_db[prev_clone.init_state_index]
-            next_level_clone    = prev_clone.clone(next_level_db)
-            self.dfa.states.update(next_level_clone.states)
-            # ... connections between states are done later.
-
-            prev_clone = next_level_clone
-            assert(set(next_level_db.values()) == set(next_level_clone.states.keys()))
-
-    def __iter__(self):
-        for next_level_db in self.next_level_state_index_db:
-            for si in next_level_db.keys():
-                yield next_level_db, si, self.dfa.states[si].target_map 
+    builder = LevenshteinBuilder(Dfa, N, InsertableCs, DeletableCs,
+                                 SubstitutableCs, SubstituteCs)
+    return beautifier.do(builder.do(), NfaToDfaF=False, CloneF=False)
 
+class LevenshteinBuilder:
+    """Constructs the Levenshtein automaton as DFA (see 'do()').
+
+    A 'position set' is a sorted tuple of pairs (si, level). It contains
+    each 'si' only once, with its lowest level.
+    """
+    def __init__(self, Dfa, N, InsertableCs, DeletableCs, SubstitutableCs, SubstituteCs):
+        self.dfa     = Dfa
+        self.level_n = N
+
+        # Per state of 'Dfa':
+        #   move_db[si]       -- list of (begin, end, target si)
+        #   substitute_db[si] -- list of (begin, end, target si) by substitution
+        #   delete_db[si]     -- list of target si reached by deletion
+        self.move_db       = {}
+        self.substitute_db = {}
+        self.delete_db     = {}
+        for si, state in Dfa.states.items():
+            move_list       = []
+            substitute_list = []
+            delete_list     = []
+            for target_si, character_set in state.target_map.get_map().items():
+                move_list.extend(_segments(character_set, target_si))
+
+                if     DeletableCs is not None \
+                   and DeletableCs.has_intersection(character_set):
+                    delete_list.append(target_si)
+
+                if     SubstitutableCs is not None \
+                   and SubstitutableCs.has_intersection(character_set):
+                    remainder = SubstituteCs.difference(character_set)
+                    substitute_list.extend(_segments(remainder, target_si))
+
+            self.move_db[si]       = move_list
+            self.substitute_db[si] = substitute_list
+            self.delete_db[si]     = delete_list
+
+        if InsertableCs is None: self.insert_list = []
+        else:                    self.insert_list = _segments(InsertableCs, None)
+
+        self.closure_db = {} # map: tuple of positions --> position set
+
+    def do(self):
+        """RETURNS: DFA where each state stands for a position set.
+        """
+        result    = DFA(DoNothingF=True)
+        state_db  = {}   # map: position set --> state index in result
+        work_list = []
+
+        def get_state_index(PositionSet):
+            si = state_db.get(PositionSet)
+            if si is None:
+                si = index.get()
+                state_db[PositionSet] = si
+                work_list.append((si, PositionSet))
+            return si
+
+        result.init_state_index = get_state_index(
+            self.get_closure(((self.dfa.init_state_index, 0),))
+        )
+        while work_list:
+            si, position_set = work_list.pop()
+            interval_db = {} # map: target state index --> list of intervals
+            for begin, end, target_set in self.iterable_steps(position_set):
+                target_si     = get_state_index(target_set)
+                interval_list = interval_db.setdefault(target_si, [])
+                if interval_list and interval_list[-1].end == begin: interval_list[-1].end = end
+                else:                                                interval_list.append(Interval(begin, end))
+
+            state = DFA_State.from_TargetMap(dict(
+                (target_si, NumberSet(interval_list, ArgumentIsYoursF=True))
+                for target_si, interval_list in interval_db.items()
+            ))
+            single_entry = SingleEntry()
+            single_entry.merge_list(
+                self.dfa.states[dfa_si].single_entry for dfa_si, level in position_set
+            )
+            state.set_single_entry(single_entry)
+            result.states[si] = state
+
+        return result
+
+    def iterable_steps(self, PositionSet):
+        """YIELDS: (begin, end, position set)
+
+        for all lexatom ranges [begin, end) that lead from 'PositionSet' to a
+        non-empty position set.
+        """
+        boundary_list, \
+        target_list    = _segments_from_iterable(self.__iterable_segments(PositionSet))
+        for i, positions in enumerate(target_list):
+            if not positions: continue
+            yield boundary_list[i], boundary_list[i+1], self.get_closure(positions)
+
+    def __iterable_segments(self, PositionSet):
+        for si, level in PositionSet:
+            for begin, end, target_si in self.move_db[si]:
+                yield begin, end, ((target_si, level),)
+
+            if level == self.level_n: continue
+
+            # Insert:     stay in 'si' on the next level.
+            for begin, end, dummy in self.insert_list:
+                yield begin, end, ((si, level + 1),)
+            # Substitute: transit to the target on the next level.
+            for begin, end, target_si in self.substitute_db[si]:
+                yield begin, end, ((target_si, level + 1),)
+
+    def get_closure(self, Positions):
+        """Positions: sorted tuple of (si, level), where 'si' may appear more
+                      than once.
+
+        Delete: epsilon transition to the target on the next level.
+
+        RETURNS: position set of the positions and everything reached by
+                 deletion--where each 'si' appears only with its lowest level.
+        """
+        result = self.closure_db.get(Positions)
+        if result is not None: return result
+
+        level_db = {}
+        for si, level in Positions:
+            if si not in level_db or level_db[si] > level: level_db[si] = level
+
+        work_list = list(level_db.items())
+        while work_list:
+            si, level = work_list.pop()
+            if level_db[si] < level or level == self.level_n: continue
+            for target_si in self.delete_db[si]:
+                if target_si in level_db and level_db[target_si] <= level + 1: continue
+                level_db[target_si] = level + 1
+                work_list.append((target_si, level + 1))
+
+        result = tuple(sorted(level_db.items()))
+        self.closure_db[Positions] = result
+        return result
+
+def _segments(CharacterSet, Target):
+    return [
+        (interval.begin, interval.end, Target)
+        for interval in CharacterSet.get_intervals(PromiseToTreatWellF=True)
+    ]
@@ -7,6 +7,10 @@ import itertools
 #     that all target indices of a state machine must be also start indices. For connecting
 #     state machines though, it is much easier to rely on a globaly unique state index.
 #
+#     DFAs that were built elsewhere (e.g. in another process) may have indices
+#     which collide with the ones of this process. Combining operations (see
+#     'DFA.disjoint_index_spaces()') renumber those explicitly.
+#
 #     NOTE: The index is stored in a 'long' variable. If this variable flows over, then
 #           we are likely not be able to implement our state machine due to memory shortage
 #           anyway.
@@ -15,14 +19,46 @@ def get():
     global __internal_state_index_counter
     return int(next(__internal_state_index_counter))
 
+def ensure_greater_than(Index):
+    """States with indices up to 'Index' exist, which have not been created
+    by 'get()'. Subsequent calls to 'get()' shall not collide with them.
+    """
+    global __internal_state_index_counter
+    next_index = next(__internal_state_index_counter)
+    __internal_state_index_counter = itertools.count(start=max(next_index, Index + 1))
+
 __internal_state_machine_id_counter = itertools.count(start=0)
 def get_state_machine_id():
     global __internal_state_machine_id_counter
     return int(next(__internal_state_machine_id_counter))
 
+def get_counter_state():
+    """RETURNS: (next state index, next state machine id)
+
+    Objects which have been numbered in another process (e.g. loaded from a
+    cache) are safe, if the counters are continued from there on (see
+    'ensure_counter_state()').
+    """
+    global __internal_state_index_counter
+    global __internal_state_machine_id_counter
+    next_index = next(__internal_state_index_counter)
+    next_id    = next(__internal_state_machine_id_counter)
+    __internal_state_index_counter      = itertools.count(start=next_index)
+    __internal_state_machine_id_counter = itertools.count(start=next_id)
+    return (next_index, next_id)
+
+def ensure_counter_state(CounterState):
+    """Subsequent indices and ids are not less than the ones in 'CounterState'
+    (see 'get_counter_state()').
+    """
+    global __internal_state_machine_id_counter
+    next_index, next_id = CounterState
+    ensure_greater_than(next_index - 1)
+    current_id = next(__internal_state_machine_id_counter)
+    __internal_state_machine_id_counter = itertools.count(start=max(current_id, next_id))
+
 def clear():
     global __internal_state_index_counter
     global __internal_state_machine_id_counter
     __internal_state_index_counter      = itertools.count(start=0)
     __internal_state_machine_id_counter = itertools.count(start=0)
-
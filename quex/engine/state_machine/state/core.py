@@ -4,7 +4,8 @@
 from   quex.engine.state_machine.state.single_entry import SingleEntry, \
                                                            SeAccept, \
                                                            SeStoreInputPosition
-from   quex.engine.state_machine.state.target_map   import TargetMap
+from   quex.engine.state_machine.state.target_map   import TargetMap, \
+                                                           epsilon_changed
 from   quex.engine.misc.tools import typed
 from   quex.constants         import E_IncidenceIDs
 
@@ -94,6 +95,9 @@ class DFA_State(object):
 
     @typed(TM=TargetMap)
     def set_target_map(self, TM):
+        if    self.__target_map.get_epsilon_target_state_index_list() \
+           or TM.get_epsilon_target_state_index_list():
+            epsilon_changed()
         self.__target_map = TM
 
     @staticmethod
@@ -10,6 +10,15 @@ from   quex.engine.misc.tools                         import typed
 
 from   operator import attrgetter
 
+# Number of changes to the epsilon transitions of any target map. Caches of 
+# epsilon closures are valid as long as it remains the same (see 
+# 'DFA.epsilon_closure_map').
+epsilon_change_n = 0
+
+def epsilon_changed():
+    global epsilon_change_n
+    epsilon_change_n += 1
+
 class TargetMap:
     """Members:
 
@@ -50,6 +59,7 @@ class TargetMap:
             # Do not set default value 'TriggerMap={}' since this creates the same
             # default object for all calls of this function.
             self.__db = {}
+        if self.__epsilon_target_index_list: epsilon_changed()
         self.__epsilon_target_index_list = [] 
 
     def is_empty(self):
@@ -78,6 +88,7 @@ class TargetMap:
     def add_epsilon_target_state(self, TargetStateIdx):
         if TargetStateIdx not in self.__epsilon_target_index_list:
             self.__epsilon_target_index_list.append(TargetStateIdx)
+            epsilon_changed()
 
     def add_transition(self, Trigger, TargetStateIdx): 
         """Adds a transition according to trigger and target index.
@@ -115,6 +126,7 @@ class TargetMap:
     def delete_epsilon_target_state(self, TargetStateIdx):
         if TargetStateIdx in self.__epsilon_target_index_list:
             del self.__epsilon_target_index_list[self.__epsilon_target_index_list.index(TargetStateIdx)]
+            epsilon_changed()
 
     def delete_transitions_on_empty_trigger_sets(self):
         for target_index, trigger_set in list(self.__db.items()):
@@ -124,10 +136,7 @@ class TargetMap:
         return len(self.__db)
 
     def get_trigger_set_union(self):
-        interval_list = []
-        for trigger_set in self.__db.values():
-            interval_list.extend(trigger_set.get_intervals())
-        return NumberSet.from_IntervalList(interval_list)
+        return NumberSet.union_of_many(self.__db.values())
 
     def get_drop_out_trigger_set_union(self):
         """This function returns the union of all trigger sets that do not
@@ -136,7 +145,11 @@ class TargetMap:
         return self.get_trigger_set_union().get_complement(Setup.buffer_encoding.source_set)
 
     def get_epsilon_target_state_index_list(self):
-        return self.__epsilon_target_index_list
+        """RETURNS: Tuple of epsilon target state indices. Changes must be 
+                    made by the member functions, so that they are noticed
+                    (see 'epsilon_changed()').
+        """
+        return tuple(self.__epsilon_target_index_list)
 
     def iterable_target_state_indices(self):
         for state_index in self.__db.keys():
@@ -173,7 +186,7 @@ class TargetMap:
 
     def get_resulting_target_state_index_list(self, Trigger):
         result = []
-        if Trigger.__class__.__name__ == "NumberSet":
+        if isinstance(Trigger, NumberSet):
             for target_index, trigger_set in list(self.__db.items()):
                 if trigger_set.has_intersection(Trigger) and target_index not in result:
                     result.append(target_index) 
@@ -202,6 +215,7 @@ class TargetMap:
 
     def update(self, Other):
         self.__db.update(Other.__db)
+        if Other.__epsilon_target_index_list: epsilon_changed()
         self.__epsilon_target_index_list.extend(Other.__epsilon_target_index_list)
 
     def absorb_target_map(self, Db):
@@ -292,6 +306,7 @@ class TargetMap:
             new_idx = ReplacementDict.get(target_idx)
             if new_idx is None: continue
             self.__epsilon_target_index_list[i] = new_idx
+            epsilon_changed()
             
     def minimum(self):
         if not self.__db: return None
@@ -3,7 +3,7 @@
 #_______________________________________________________________________________
 from   quex.engine.misc.interval_handling                        import NumberSet 
 import quex.engine.state_machine.algorithm.nfa_to_dfa            as     nfa_to_dfa
-import quex.engine.state_machine.algorithm.hopcroft_minimization as     hopcroft_minimization
+import quex.engine.state_machine.algorithm.minimizer             as     minimizer
 import quex.engine.state_machine.index                           as     state_machine_index
 from   quex.engine.state_machine.state.core                      import DFA_State
 from   quex.engine.misc.tools                                    import typed
@@ -107,7 +107,7 @@ class EncodingTrafo:
         #        lie in the drain_set.
         if not sm.is_DFA_compliant(): 
             sm = nfa_to_dfa.do(sm, CloneF=False)
-        sm = hopcroft_minimization.do(sm, CreateNewStateMachineF=False)
+        sm = minimizer.do(sm)
 
         return all_complete_f, sm
 
@@ -81,6 +81,14 @@ That means, that for states 2 and 3 the last transition is on [80, BF]
 to state B. Thus, the intermediate states 2 and 3 are equivalent. Both
 can be replaced by a single state. 
 
+    This applies to all levels of intermediate states: a state is determined
+    by its position in the code unit sequence, its transition map, and the
+    state 'B' at the end. Intermediate states are built from the end of the
+    sequences towards the beginning. A state that exists already is reused.
+    States are shared among all transitions of a state machine to the same
+    state 'B', e.g. a tail '[80-BF][80-BF]' is generated only once (compare
+    RE2's UTF-8 compiler).
+
 (B) Forwards: The first couple of bytes in the correspondent utf8 sequences
     might be the same. Then, no branch is required until the first differing
     byte.
@@ -92,6 +100,9 @@ PROCESS:
 
 (2) The interval sequences are plugged in between the state A and B
     of the state machine.
+
+The split of an interval into interval sequences is computed only once per
+interval and encoding.
 """
 from   quex.engine.state_machine.state.core          import DFA_State
 import quex.engine.state_machine.transformation.base as     base
@@ -108,6 +119,20 @@ class EncodingTrafoBySplit(base.EncodingTrafo):
         base.EncodingTrafo.__init__(self, Name, 
                                     NumberSet.from_range(0, 0x110000),
                                     ErrorRangeByCodeUnitDb)
+        # map: (begin, end) of a 'pure' interval --> list of interval sequences
+        self._interval_sequence_db = {}
+        # map: (ToSi, position, transition map) --> intermediate state index
+        #      (None, outside 'do_state_machine()')
+        self._suffix_db            = None
+
+    def do_state_machine(self, sm):
+        """Intermediate states are shared among all transitions of 'sm' (see
+        'plug_interval_sequences()').
+        """
+        self._suffix_db = {}
+        result          = base.EncodingTrafo.do_state_machine(self, sm)
+        self._suffix_db = None
+        return result
 
     def do_transition(self, from_target_map, FromSi, ToSi, BadLexatomSi):
         """Translates to transition 'FromSi' --> 'ToSi' inside the state
@@ -134,7 +159,7 @@ class EncodingTrafoBySplit(base.EncodingTrafo):
             return False, None
 
         transformed_interval_sequence_list = flatten(
-            self.get_interval_sequences(interval)
+            self._get_interval_sequences(interval)
             for interval in number_set.get_intervals(PromiseToTreatWellF=True)
         )
 
@@ -150,6 +175,16 @@ class EncodingTrafoBySplit(base.EncodingTrafo):
 
         return True, new_state_db
 
+    def _get_interval_sequences(self, X):
+        """RETURNS: 'get_interval_sequences(X)', computed only once per interval.
+        """
+        key    = (X.begin, X.end)
+        result = self._interval_sequence_db.get(key)
+        if result is None:
+            result = self.get_interval_sequences(X)
+            self._interval_sequence_db[key] = result
+        return result
+
     def _do_single(self, Code): 
         number_set    = NumberSet.from_range(Code, Code+1)
         if number_set.is_empty():
@@ -187,73 +222,71 @@ class EncodingTrafoBySplit(base.EncodingTrafo):
         'BadLexatomSi' is None => no bad lexatom detection.
                        else, transitions to 'bad lexatom state' are added
                        on invalid code units.
+
+        Intermediate states are identified by their transition maps and their
+        position in the code unit sequence. A state that exists already is
+        reused, rather than generated anew--also if it stems from another
+        transition of the same state machine (see 'do_state_machine()').
         
         RETURN: [0] Target map update for the first state.
                 [1] State Db update for intermediate states.
 
         """
-        def simplify(tm_db, tm_end_inv, ToSi):
-            """Those states which trigger on the same intervals to 'ToSi' are
-            equivalent, i.e. can replaced by one state.
-            """
-            # Find the states that trigger on the same interval list to the 
-            # terminal 'ToSi'.
-            equivalence_db = {}
-            replacement_db = {}
-            for from_si, interval_list in tm_end_inv.items():
-                key           = tuple(sorted(interval_list))
-                equivalent_si = equivalence_db.get(key)
-                if equivalent_si is None: equivalence_db[key]     = from_si
-                else:                     replacement_db[from_si] = equivalent_si
-
-            # Replace target states which are equivalent
-            result = {}
-            for from_si, tm in tm_db.items():
-                new_tm = defaultdict(NumberSet)
-                for target_si, interval in tm.items():
-                    replacement_si = replacement_db.get(target_si)
-                    if replacement_si is not None: target_si = replacement_si
-                    new_tm[target_si].add_interval(interval)
-
-                assert not any(number_set.is_empty() for si, number_set in list(new_tm.items()))
-
-                if from_si in tm_end_inv:
-                    for interval in tm_end_inv[from_si]:
-                        new_tm[ToSi].add_interval(interval)
-
-                result[from_si] = new_tm
-
-            return result
-
-        tm_db,      \
-        tm_end_inv, \
-        position_db = _get_intermediate_transition_maps(FromSi, ToSi, 
-                                                        IntervalSequenceList)
-
-        result_tm_db = simplify(tm_db, tm_end_inv, ToSi)
-
-        if BadLexatomSi is not None:
-            for si, position in position_db.items():
-                # The 'positon 0' is done by 'do_state_machine'. It is concerned
-                # with the first state's transition.
-                assert position != 0
-                self._add_transition_to_bad_lexatom_detector(result_tm_db[si],
-                                                             BadLexatomSi,
-                                                             position)
-
-        for tm in result_tm_db.values():
-            assert not any(number_set.is_empty() for number_set in tm.values())
-
-        # Generate the target map to be inserted into state 'FromSi'.
-        # Generate list of intermediate states that implement the sequence
-        # of intervals.
-        first_tm     = result_tm_db.pop(FromSi)
-        new_state_db = dict(
-            (si, DFA_State.from_TargetMap(tm)) for si, tm in result_tm_db.items()
-        )
+        if self._suffix_db is None: suffix_db = {}
+        else:                       suffix_db = self._suffix_db
+
+        # Sort the list of sequences, so that adjacent intervals are listed one
+        # after the other. This is necessary for '_bunch_iterable()' to function.
+        IntervalSequenceList.sort()
+
+        new_state_db = {}
+        first_tm     = self.__get_target_map(IntervalSequenceList, 0, ToSi, BadLexatomSi, 
+                                             suffix_db, new_state_db)
         return first_tm, new_state_db
 
-def __bunch_iterable(IntervalSequenceList, Index):
+    def __get_target_map(self, SequenceGroup, Index, ToSi, BadLexatomSi, 
+                         SuffixDb, NewStateDb):
+        """RETURNS: Target map of the state that triggers on the intervals at
+                    'Index' in 'SequenceGroup'. 
+        """
+        tm = defaultdict(NumberSet)
+        for interval, sub_group, last_f in _bunch_iterable(SequenceGroup, Index):
+            if last_f: 
+                target_si = ToSi
+            else:
+                target_si = self.__get_state_index(sub_group, Index + 1, ToSi, BadLexatomSi,
+                                                   SuffixDb, NewStateDb)
+            tm[target_si].add_interval(interval)
+        return tm
+
+    def __get_state_index(self, SequenceGroup, Index, ToSi, BadLexatomSi, 
+                          SuffixDb, NewStateDb):
+        """RETURNS: Index of the intermediate state that triggers on the 
+                    intervals at 'Index' in 'SequenceGroup'. 
+
+        The state is only generated, if there is no equivalent state in 
+        'SuffixDb'. A new state is entered into 'NewStateDb'.
+        """
+        tm  = self.__get_target_map(SequenceGroup, Index, ToSi, BadLexatomSi, 
+                                    SuffixDb, NewStateDb)
+        key = (ToSi, Index, tuple(sorted(
+            (target_si, tuple((x.begin, x.end) for x in number_set.get_intervals(PromiseToTreatWellF=True)))
+            for target_si, number_set in tm.items()
+        )))
+        si = SuffixDb.get(key)
+        if si is not None: return si
+
+        # The 'position 0' is done by 'do_state_machine'. It is concerned with
+        # the first state's transition.
+        assert Index != 0
+        self._add_transition_to_bad_lexatom_detector(tm, BadLexatomSi, Index)
+
+        si               = state_machine_index.get()
+        NewStateDb[si]   = DFA_State.from_TargetMap(tm)
+        SuffixDb[key]    = si
+        return si
+
+def _bunch_iterable(IntervalSequenceList, Index):
     """Iterate over sub-bunches of sequence in 'IntervalSequenceList' which are
     the same at the given 'Position'. The 'IntervalSequenceList' must be sorted!
     That is, same intervals must be adjacent. 
@@ -309,91 +342,6 @@ def __bunch_iterable(IntervalSequenceList, Index):
 
     yield prev_interval, IntervalSequenceList[prev_i:], prev_last_f
 
-def _get_intermediate_transition_maps(FromSi, ToSi, interval_sequence_list):
-    """Several transitions are to be inserted in between state 'FromSi' and 
-    'ToSi'. The transitions result from the list of sequences in 
-    'interval_sequence_list'. This function develops the transition maps
-    of the states involved. Also, it notifies about the 'position' of each
-    state in the code unit sequence. Thus, the caller may insert error-detectors
-    on invalid code units.
-
-    FORBIDDEN: There cannot be a sequence that starts with the exact intervals
-               as a shorter sequences. Example:
-
-           [ (0, 1), (0, 2), (0, 3) ]   # 
-           [ (0, 1), (0, 2) ]           # Bad, very bad!
-
-    This would mean that after (0, 1), (0, 2) the 'ToSi' is reached, but then
-    after (0, 3) again. The result is an *iteration* on 'ToSi'
-
-           --(0, 1)-->( A )--(0, 2)-->( ToSi )---->
-                                    |           |
-                                    '-<-(0, 3)--'
-
-    Consequently, such a list of interval sequences cannot represent a linear
-    transition.
-
-    RETURNS: [0] Transition Map DB:  state_index --> 'TransitionMap' 
-
-                 with TransitionMap: target_state_index --> Interval
-
-                 That is 'TransitionMap[target_state_index]' tells through which
-                 intervals the 'state_index' triggers to 'target_states'
-
-                 The 'Transition Map DB' does not contain transitions to the
-                 'ToSi'--the end state.
-     
-             [1] Inverse End Transition Map:
-
-                 Transitions to the end state are stored inversely:
-
-                        from_state_index --> list of Interval-s
-
-                 The end state can be reached by more than one interval, so a
-                 list of Interval-s is associated with the transition
-                 'from_state_index' to 'ToSi'.
-
-             [1] PositionDB:    state_index --> position in code unit sequence.
-    """
-    # Sort the list of sequences, so that adjacent intervals are listed one
-    # after the other. This is necessary for '__bunch_iterable()' to function.
-    interval_sequence_list.sort()
-
-    worklist = [
-        # The state at 'BeginStateIndex' is concerned with the intervals
-        # at position '0' in the 'interval_sequence_list'. The list needs to
-        # be grouped according to the first interval, and for each distinct
-        # interval a transition to another state must be generated.
-        (FromSi, interval_sequence_list, 0)
-    ]
-    tm_db       = defaultdict(dict)
-    tm_end_inv  = defaultdict(list)
-    position_db = {}
-    while worklist:
-        si, sequence_group, index = worklist.pop()
-        # -- State 'si' triggers on intervals at 'index' in 'sequence_group'.
-        tm              = tm_db[si]
-        # -- State 'si' comes at position 'index' in a sequence of code units.
-        # (position of 'FromSi' shall not appear in the 'position_db' since
-        #  the error detection of the first state is done in the caller.)
-        if si != FromSi: position_db[si] = index
-
-        # Group the sequences according to the interval at position 'index'.
-        for interval, sub_group, last_f in __bunch_iterable(sequence_group, index):
-            # Transit to new state for the given sub-group of sequences.
-            if not last_f:
-                # For each 'interval' a deliberate target state is generated.
-                # => each target state is only reached by a single Interval.
-                new_si = state_machine_index.get()
-                tm[new_si] = interval
-                worklist.append((new_si, sub_group, index+1))
-            else:
-                # If the 'interval' is the last in the sequence, the 'ToSi' is 
-                # reached. Obviously this may/should happen more than once. 
-                tm_end_inv[si].append(interval)
-
-    return tm_db, tm_end_inv, position_db
-
 def TODO_ALTERNATIVE_get_intermediate_transition_map(sm, intervalSequenceList, start_si, end_si):
     """Plug a set of interval sequences betweens states.
     """
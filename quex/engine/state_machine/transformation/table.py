@@ -50,6 +50,9 @@ class EncodingTrafoByTable(EncodingTrafo, list):
         EncodingTrafo.__init__(self, codec_name, source_set, 
                                error_range_by_code_unit_db)
 
+        # map: intervals of a trigger set --> (verdict, transformed NumberSet)
+        self.__transformed_db = {}
+
     def do_transition(self, from_target_map, FromSi, ToSi, BadLexatomSi):
         """Translates to transition 'FromSi' --> 'ToSi' inside the state
         machine according to the translation table.
@@ -61,17 +64,30 @@ class EncodingTrafoByTable(EncodingTrafo, list):
         RETURNS: [0] True if complete, False else.
                  [1] StateDb to be added (always None, here)
         """
-        number_set = from_target_map[ToSi]
-
-        # 'transform_by_table' adapts the 'number_set' in the 'from_target_map'
-        # and returns 'True' if and only if the transformation was complete.
-        verdict_f = number_set.transform_by_table(self)
+        verdict_f, \
+        number_set = self.transform(from_target_map[ToSi])
 
-        if number_set.is_empty():
-            del from_target_map[ToSi]
+        if number_set.is_empty(): del from_target_map[ToSi]
+        else:                     from_target_map[ToSi] = number_set.clone()
 
         return verdict_f, None
 
+    def transform(self, TriggerSet):
+        """The same trigger sets appear in many transitions and many DFAs. So,
+        the transformation is computed only once per set.
+
+        RETURNS: [0] True, if all elements of 'TriggerSet' have been transformed.
+                 [1] Transformed NumberSet. It must not be modified.
+        """
+        key    = tuple((x.begin, x.end) for x in TriggerSet.get_intervals(PromiseToTreatWellF=True))
+        result = self.__transformed_db.get(key)
+        if result is None:
+            number_set = TriggerSet.clone()
+            verdict_f  = number_set.transform_by_table(self)
+            result     = (verdict_f, number_set)
+            self.__transformed_db[key] = result
+        return result
+
     def _do_single(self, Code): 
         """Unicode character is translated to itself.
         """
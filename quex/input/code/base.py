@@ -3,7 +3,7 @@
 #_______________________________________________________________________________
 from   quex.engine.misc.file_operations import count_until_position_raw, \
                                                count_until_position
-from   quex.engine.misc.unistream       import UniStreamBytesIO, \
+from   quex.engine.misc.unistream       import UniStreamText, \
                                                UniStreamStream
 from   quex.engine.misc.tools           import typed, \
                                                all_isinstance, \
@@ -43,8 +43,11 @@ class SourceRef(namedtuple("SourceRef_tuple", ("file_f", "file_name", "position"
             file_name     = "<string>" 
             file_f        = False
             line_n_offset = count_until_position_raw(Fh, Fh.tell(), '\n') - 1
-        elif    isinstance(Fh, UniStreamBytesIO) \
-             or (isinstance(Fh, UniStreamStream) and Fh.string_f()):
+        elif isinstance(Fh, UniStreamText):
+            file_name     = Fh.name
+            file_f        = False
+            line_n_offset = Fh.line_n(position) - 1
+        elif isinstance(Fh, UniStreamStream) and Fh.string_f():
             file_name     = Fh.name
             file_f        = False
             line_n_offset = count_until_position_raw(Fh, Fh.tell(), '\n') - 1
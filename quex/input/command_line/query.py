@@ -14,6 +14,7 @@ from   quex.input.regular_expression.exception  import RegularExpressionExceptio
 import quex.input.regular_expression.core       as     regular_expression
 from   quex.DEFINITIONS                         import QUEX_VERSION 
 import quex.engine.codec_db.core                as     codec_db
+import quex.input.command_line.query_server     as     query_server
 
 from   quex.blackboard import setup as Setup
 
@@ -28,6 +29,7 @@ OPTION_DB = {
         "--numeric":            ["Display sets numerically",  ["--set-by-property", "--set-by-expression"]],
         "--intervals":          ["Display sets by intervals", ["--set-by-property", "--set-by-expression"]],
         "--names":              ["Display unicode names",     ["--set-by-property", "--set-by-expression"]],
+        "--query-server":       ["Answer queries in JSON format from stdin or a Unix socket"],
 }
 
 def run(cl, Argv):
@@ -43,7 +45,8 @@ def run(cl, Argv):
     Setup.path_limit_code   = -1
 
     try: 
-        if   Setup.query_encoding:             __handle_codec(cl)
+        if   Setup.query_server is not None:   query_server.do(Setup.query_server)
+        elif Setup.query_encoding:             __handle_codec(cl)
         elif Setup.query_encoding_list:        __handle_codec_list(cl)
         elif Setup.query_encoding_file:        __handle_codec_file(cl)
         elif Setup.query_encoding_language:    __handle_codec_for_language(cl)
@@ -403,6 +406,12 @@ QUERY MODE (selected options):
                         intervals.
   --names               Display characters by their name.
 
+  --query-server [SOCKET-PATH]
+                        Answer queries (newline-delimited JSON) from stdin, or
+                        from the Unix socket SOCKET-PATH, until 'quit'. The 
+                        databases are loaded only once. Character sets are 
+                        answered as interval lists.
+
 GENERATOR MODE (selected options):
 
   -i                      The following '.qx' files are the basis for lexical 
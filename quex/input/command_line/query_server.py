@@ -0,0 +1,237 @@
+# Project Quex (http://quex.sourceforge.net); License: MIT;
+# (C) 2005-2020 Frank-Rene Schaefer;
+#_______________________________________________________________________________
+"""Query server: answers queries, as they are made by '--set-by-expression',
+'--property-match', '--encoding-info', etc., for as long as it runs. The
+Unicode and codec databases are loaded only once and remain in memory.
+
+                > quex --query-server             (stdin/stdout)
+                > quex --query-server SOCKET-PATH (Unix socket)
+
+Requests and responses are newline-delimited JSON objects, one per line:
+
+    request:  { "id": ANY, "query": QUERY, "argument": STRING }
+    response: { "id": ANY, "result": OBJECT }
+              { "id": ANY, "error":  STRING }
+
+where 'id' is optional and passed back as is. Queries:
+
+    "set-by-property"       'Name' or 'Name=Value'   --> { "intervals": [...] }
+    "set-by-expression"     set expression           --> { "intervals": [...] }
+    "property-match"        'Name=Wildcard'          --> { "values": [...] }
+    "property"              'Name', or '' for all    --> { "name", "alias", "type",
+                                                           "values": [...] }
+                                                         { "properties": [...] }
+    "encoding-info"         encoding name            --> { "intervals": [...],
+                                                           "languages": [...] }
+    "encoding-info-file"    codec file name          --> { "intervals": [...] }
+    "encoding-list"         -                        --> { "encodings": [...] }
+    "encoding-for-language" language                 --> { "encodings": [...] }
+    "quit"                  -                        --> {}, and the server stops.
+
+Character sets are given as lists of intervals '[begin, end]', where 'end' is
+the first code point after the interval.
+
+Messages which the handlers would print (e.g. by 'error.log()') are caught, so
+that only responses appear on the output. A failing query results in an
+'error' response; the server continues.
+
+With a socket, connections are served one after the other. Each connection
+may send any number of requests. The server stops at 'quit'--with stdin,
+also at the end of the input.
+
+(C) Frank-Rene Schaefer
+"""
+import quex.engine.codec_db.core                as     codec_db
+from   quex.engine.codec_db.unicode.parser      import ucs_property_db
+from   quex.engine.misc.interval_handling       import NumberSet, Interval
+from   quex.engine.misc.unistream               import UniStream
+import quex.input.regular_expression.core       as     regular_expression
+from   quex.input.regular_expression.exception  import RegularExpressionException
+
+from   contextlib import redirect_stdout
+from   io         import StringIO
+import json
+import os
+import socket
+import stat
+import sys
+
+class QueryError(Exception):
+    pass
+
+def do(SocketPath):
+    """SocketPath: path of the Unix socket; "" for stdin/stdout.
+    """
+    ucs_property_db.init_db()
+    if not SocketPath:
+        serve(sys.stdin, sys.stdout)
+        return
+
+    if os.path.exists(SocketPath) and stat.S_ISSOCK(os.stat(SocketPath).st_mode):
+        os.remove(SocketPath)  # left over from a previous server
+
+    server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    server.bind(SocketPath)
+    server.listen()
+    try:
+        quit_f = False
+        while not quit_f:
+            connection, dummy = server.accept()
+            with connection, connection.makefile("r", encoding="utf8") as fh_in, \
+                             connection.makefile("w", encoding="utf8") as fh_out:
+                quit_f = serve(fh_in, fh_out)
+    finally:
+        server.close()
+        os.remove(SocketPath)
+
+def serve(FhIn, FhOut):
+    """Answers the requests from 'FhIn' on 'FhOut' until the input ends or
+    'quit' is requested.
+
+    RETURNS: True, if 'quit' has been requested.
+    """
+    for line in FhIn:
+        if not line.strip(): continue
+        response, quit_f = respond(line)
+        FhOut.write(json.dumps(response) + "\n")
+        FhOut.flush()
+        if quit_f: return True
+    return False
+
+def respond(Line):
+    """RETURNS: [0] response object.
+                [1] True, if the server shall quit.
+    """
+    try:
+        request = json.loads(Line)
+    except ValueError as x:
+        return { "error": "Request is not in JSON format: %s" % x }, False
+    if not isinstance(request, dict):
+        return { "error": "Request is not a JSON object." }, False
+
+    response = {}
+    if "id" in request: response["id"] = request["id"]
+
+    query    = request.get("query")
+    argument = request.get("argument", "")
+    if query == "quit":
+        response["result"] = {}
+        return response, True
+
+    handler = QUERY_DB.get(query)
+    if handler is None:
+        response["error"] = "Unknown query '%s'. Known queries are: %s." \
+                            % (query, ", ".join(sorted(QUERY_DB) + ["quit"]))
+        return response, False
+    elif not isinstance(argument, str):
+        response["error"] = "Argument must be a string."
+        return response, False
+
+    output = StringIO()
+    try:
+        with redirect_stdout(output):
+            response["result"] = handler(argument)
+    except QueryError as x:
+        response["error"] = str(x)
+    except RegularExpressionException as x:
+        response["error"] = x.message
+    except SystemExit:
+        # 'error.log()' printed the message before it exited.
+        response["error"] = output.getvalue().strip() or "Query failed."
+    return response, False
+
+def __set_by_property(Argument):
+    fields = [x.strip() for x in Argument.split("=")]
+    if len(fields) not in [1, 2]:
+        raise QueryError("Wrong property setting '%s'." % Argument)
+    property = __get_property(fields[0])
+
+    if len(fields) == 2: value = fields[1]
+    else:                value = None
+    if property.type == "Binary" and value is not None:
+        raise QueryError("Binary property '%s' cannot have a value assigned to it." % property.name)
+
+    character_set = property.get_character_set(value)
+    if not isinstance(character_set, NumberSet):
+        raise QueryError(character_set)
+    return { "intervals": __interval_list(character_set) }
+
+def __set_by_expression(Argument):
+    stream = UniStream("[:" + Argument + ":]", "<query>")
+    dummy, character_set = regular_expression.parse_character_set(stream)
+    return { "intervals": __interval_list(character_set) }
+
+def __property_match(Argument):
+    fields = [x.strip() for x in Argument.split("=")]
+    if len(fields) != 2:
+        raise QueryError("Wrong property setting '%s'." % Argument)
+    property = __get_property(fields[0])
+    if property.type == "Binary":
+        raise QueryError("Binary property '%s' is not subject to value wild card matching." % property.name)
+    elif property.code_point_db is None:
+        raise QueryError("Property '%s' is not supported by the Unicode database." % property.name)
+
+    return { "values": property.get_wildcard_value_matches(fields[1]) }
+
+def __property(Argument):
+    if not Argument:
+        return { "properties": ucs_property_db.get_property_name_list() }
+
+    property = __get_property(Argument)
+    if property.type == "Binary" or property.code_point_db is None:
+        value_list = []
+    else:
+        value_list = sorted(property.code_point_db)
+    return {
+        "name":   property.name,
+        "alias":  property.alias,
+        "type":   property.type,
+        "values": value_list,
+    }
+
+def __encoding_info(Argument):
+    character_set = codec_db.get_supported_unicode_character_set(CodecAlias=Argument)
+    if character_set is None:
+        raise QueryError("Encoding '%s' cannot be loaded." % Argument)
+    return {
+        "intervals": __interval_list(character_set),
+        "languages": codec_db.get_supported_language_list(Argument),
+    }
+
+def __encoding_info_file(Argument):
+    character_set = codec_db.get_supported_unicode_character_set(FileName=Argument)
+    if character_set is None:
+        raise QueryError("Codec file '%s' cannot be loaded." % Argument)
+    return { "intervals": __interval_list(character_set) }
+
+def __encoding_list(Argument):
+    return { "encodings": [ x for x in codec_db.get_complete_supported_codec_list() if x ] }
+
+def __encoding_for_language(Argument):
+    return { "encodings": codec_db.get_codecs_for_language(Argument) }
+
+QUERY_DB = {
+    "set-by-property":       __set_by_property,
+    "set-by-expression":     __set_by_expression,
+    "property-match":        __property_match,
+    "property":              __property,
+    "encoding-info":         __encoding_info,
+    "encoding-info-file":    __encoding_info_file,
+    "encoding-list":         __encoding_list,
+    "encoding-for-language": __encoding_for_language,
+}
+
+def __get_property(Name_or_Alias):
+    property = ucs_property_db[Name_or_Alias]
+    if property is None:
+        raise QueryError("Unknown property or alias '%s'." % Name_or_Alias)
+    property.init_code_point_db()
+    return property
+
+def __interval_list(CharacterSet):
+    character_set = CharacterSet.intersection(NumberSet(Interval(0, 0x110000)))
+    return [
+        [interval.begin, interval.end]
+        for interval in character_set.get_intervals(PromiseToTreatWellF=True)
+    ]
@@ -6,6 +6,8 @@ from   quex.input.setup                               import NotificationDB
 import quex.engine.state_machine.check.superset       as     superset_check
 import quex.engine.state_machine.algebra.is_disjoint  as     is_disjoint
 import quex.engine.state_machine.check.outrun         as     outrun_checker
+from   quex.engine.state_machine.check.memo           import CheckMemo
+from   quex.engine.state_machine.check.pair_index     import PairIndex
 import quex.engine.misc.error                         as     error
 from   quex.engine.misc.tools                         import typed
 import quex.blackboard                                as     blackboard
@@ -13,6 +15,10 @@ from   quex.blackboard                                import setup as Setup
 import quex.token_db                                  as     token_db
 from   quex.constants                                 import E_IncidenceIDs
 
+from   functools import partial
+import concurrent.futures
+import os
+
 @typed(ModePrepList=[Mode_Prep])
 def do(ModePrepList):
     """Consistency check of mode database
@@ -44,77 +50,151 @@ def do(ModePrepList):
         __entry_transitions(mode, ModePrepList, mode_name_list)
         __exit_transitions(mode, ModePrepList, mode_name_list)
 
+    # (*) Checks on pairs of patterns
+    check_list = _get_pair_check_list()
+    if not check_list: return
+
+    for mode, issue_db in zip(ModePrepList, _find_pair_issues(ModePrepList, check_list)):
+        for check_name in check_list:
+            for i, k in issue_db[check_name]:
+                _report_pair_issue(check_name, mode.pattern_list[i], mode.pattern_list[k])
+
+def _get_pair_check_list():
+    """RETURNS: Names of the checks on pairs of patterns that are to be done--in
+                the order of reporting.
+    """
+    result = []
+    # (*) [Optional] Warnings on Outrun
+    if Setup.warning_on_outrun_f:
+        result.append("outrun")
+
+    # (*) Special Patterns shall not match on same lexemes
+    if NotificationDB.error_on_special_pattern_same not in Setup.suppressed_notification_list:
+        result.append("special_same")
+
+    # (*) Special Patterns (skip, indentation, etc.) 
+    #     shall not be outrun by another pattern.
+    if NotificationDB.error_on_special_pattern_outrun not in Setup.suppressed_notification_list:
+        result.append("special_outrun")
+
+    # (*) Special Patterns shall not have common matches with patterns
+    #     of higher precedence.
+    if NotificationDB.error_on_special_pattern_subset not in Setup.suppressed_notification_list:
+        result.append("special_subset")
+
+    # (*) Check for dominated patterns
+    if NotificationDB.error_on_dominated_pattern not in Setup.suppressed_notification_list:
+        result.append("dominated")
+
+    return result
+
+def _find_pair_issues(ModePrepList, CheckList):
+    """Runs the checks of 'CheckList' on the pattern pairs of all modes. With
+    '--jobs' other than 1, the modes--and the pairs of large modes in 
+    chunks--are checked in a pool of processes. 
+
+    YIELDS: For each mode, in the order of 'ModePrepList':
+            map: check name --> list of pairs (i, k) of pattern indices for
+                                which the check reports an issue.
+
+    The order of the pairs is the order of 'mode.unique_pattern_pair_iterable()'.
+    Thus, reports do not depend on the number of jobs.
+    """
+    job_n = Setup.jobs
+    if job_n == 0: job_n = os.cpu_count() or 1
+
+    task_list    = []   # list of (pattern list, map: check name --> pair list)
+    chunk_n_list = []   # number of tasks per mode
     for mode in ModePrepList:
-        # (*) [Optional] Warnings on Outrun
-        if Setup.warning_on_outrun_f:
-             _check_low_priority_outruns_high_priority_pattern(mode)
-
-        # (*) Special Patterns shall not match on same lexemes
-        if NotificationDB.error_on_special_pattern_same not in Setup.suppressed_notification_list:
-            _check_match_same(mode, NotificationDB.error_on_special_pattern_same)
-
-        # (*) Special Patterns (skip, indentation, etc.) 
-        #     shall not be outrun by another pattern.
-        if NotificationDB.error_on_special_pattern_outrun not in Setup.suppressed_notification_list:
-            _check_special_incidence_outrun(mode, NotificationDB.error_on_special_pattern_outrun)
-
-        # (*) Special Patterns shall not have common matches with patterns
-        #     of higher precedence.
-        if NotificationDB.error_on_special_pattern_subset not in Setup.suppressed_notification_list:
-            _check_higher_priority_matches_subset(mode, NotificationDB.error_on_special_pattern_subset)
-
-        # (*) Check for dominated patterns
-        if NotificationDB.error_on_dominated_pattern not in Setup.suppressed_notification_list:
-            _check_dominated_pattern(mode, NotificationDB.error_on_dominated_pattern)
-
-def _check_special_incidence_outrun(mode, ErrorCode):
-    for high, low in mode.unique_pattern_pair_iterable():
-        if     high.pattern_string() not in Mode_Prep.focus \
-           and low.pattern_string()  not in Mode_Prep.focus: 
-            continue
-        
-        elif not outrun_checker.do(high.sm, low.sm):                  
-            continue
+        chunk_list = _get_chunk_list(_get_pair_db(mode.pattern_list, CheckList), job_n)
+        chunk_n_list.append(len(chunk_list))
+        task_list.extend(
+            (mode.pattern_list, pair_db) for pair_db in chunk_list
+        )
+
+    if job_n == 1 or len(task_list) == 1:
+        executor        = None
+        result_iterable = map(_find_pair_issues_in_chunk, task_list)
+    else:
+        executor        = concurrent.futures.ProcessPoolExecutor(max_workers=job_n)
+        result_iterable = executor.map(_find_pair_issues_in_chunk, task_list)
+
+    try:
+        for chunk_n in chunk_n_list:
+            issue_db = dict((name, []) for name in CheckList)
+            for i in range(chunk_n):
+                for name, issue_list in next(result_iterable).items():
+                    issue_db[name].extend(issue_list)
+            yield issue_db
+    finally:
+        # Upon exit on error, pending checks are not of interest.
+        if executor is not None: executor.shutdown(cancel_futures=True)
+
+def _get_pair_db(PatternList, CheckList):
+    """Pairs that cannot conflict are skipped (see 'pair_index.py'). The index
+    is built once per mode.
+
+    RETURNS: map: check name --> list of pairs (i, k) of pattern indices that
+                                 are subject to the check.
+    """
+    index = PairIndex([pattern.sm for pattern in PatternList])
+    return dict(
+        (name, list(index.pair_iterable(partial(_candidates_db[name], index))))
+        for name in CheckList
+    )
 
-        error.log_consistency_issue(high, low, ExitF=False, 
-                        ThisComment  = "has higher precedence but",
-                        ThatComment  = "may outrun it",
-                        SuppressCode = ErrorCode)
-                             
-def _check_higher_priority_matches_subset(mode, ErrorCode):
-    """Checks whether a higher prioritized pattern matches a common subset
-       of the ReferenceSM. For special patterns of skipper, etc. this would
-       be highly confusing.
+# Minimum number of pairs in a mode, so that it is checked in chunks.
+CHUNK_PAIR_N_MIN = 1024
+
+def _get_chunk_list(PairDb, JobN):
+    """Splits the pair lists into chunks with about the same number of pairs.
+
+    RETURNS: List of maps: check name --> list of pairs.
     """
-    global special_pattern_list
-    for high, low in mode.unique_pattern_pair_iterable():
-        if     high.pattern_string() not in Mode_Prep.focus \
-           and low.pattern_string() not in Mode_Prep.focus: continue
+    pair_n = sum(len(pair_list) for pair_list in PairDb.values())
+    if JobN == 1 or pair_n < CHUNK_PAIR_N_MIN: return [ PairDb ]
 
-        if not superset_check.do(high.sm, low.sm):             
-            continue
+    return [
+        dict((name, pair_list[len(pair_list) * i // JobN:len(pair_list) * (i + 1) // JobN])
+             for name, pair_list in PairDb.items())
+        for i in range(JobN)
+    ]
 
-        error.log_consistency_issue(high, low, ExitF=True, 
-                        ThisComment  = "has higher precedence and",
-                        ThatComment  = "matches a subset of",
-                        SuppressCode = ErrorCode)
+def _find_pair_issues_in_chunk(Task):
+    """Task = (pattern list, map: check name --> list of pairs (i, k))
 
-def _check_dominated_pattern(mode, ErrorCode):
-    for high, low in mode.unique_pattern_pair_iterable():
-        # 'low' comes after 'high' => 'i' has precedence
-        # Check for domination.
-        if superset_check.do(high, low):
-            error.log_consistency_issue(high, low, 
-                            ThisComment  = "matches a superset of what is matched by",
-                            EndComment   = "The former has precedence and the latter can never match.",
-                            ExitF        = True, 
-                            SuppressCode = ErrorCode)
-
-def _check_match_same(mode, ErrorCode):
+    Runs the checks on the given pairs of pattern indices. The function is run
+    in a worker process for '--jobs'. It does not report, it only detects.
+
+    RETURNS: map: check name --> list of pairs (i, k) of pattern indices.
+    """
+    pattern_list, pair_db = Task
+
+    # Results of checks on a pair are shared by the checks of the chunk.
+    memo = CheckMemo()
+
+    return dict(
+        (name, list(_find_db[name](pattern_list, memo, pair_list)))
+        for name, pair_list in pair_db.items()
+    )
+
+def _is_focus_pair(High, Low):
+    return    High.pattern_string() in Mode_Prep.focus \
+           or Low.pattern_string()  in Mode_Prep.focus
+
+def _find_low_priority_outruns_high_priority_pattern(PatternList, Memo, PairList):
+    """Low priority patterns that may outrun high priority patterns.
+    Assume that the pattern list is sorted by priority!
+    """
+    for i, k in PairList:
+        if outrun_checker.do(PatternList[i].sm, PatternList[k].sm, Memo):
+            yield i, k
+
+def _find_match_same(PatternList, Memo, PairList):
     """Special patterns shall never match on some common lexemes."""
-    for high, low in mode.unique_pattern_pair_iterable():
-        if     high.pattern_string() not in Mode_Prep.focus \
-           and low.pattern_string() not in Mode_Prep.focus: continue
+    for i, k in PairList:
+        high, low = PatternList[i], PatternList[k]
+        if not _is_focus_pair(high, low): continue
 
         # A superset of B, or B superset of A => there are common matches.
         if is_disjoint.do(high.sm, low.sm): continue
@@ -123,19 +203,79 @@ def _check_match_same(mode, ErrorCode):
         if high.pattern_string() == "." or low.pattern_string() == ".":
             continue
 
+        yield i, k
+
+def _find_special_incidence_outrun(PatternList, Memo, PairList):
+    for i, k in PairList:
+        high, low = PatternList[i], PatternList[k]
+        if not _is_focus_pair(high, low): continue
+        elif outrun_checker.do(high.sm, low.sm, Memo): yield i, k
+
+def _find_higher_priority_matches_subset(PatternList, Memo, PairList):
+    """Checks whether a higher prioritized pattern matches a common subset
+       of the ReferenceSM. For special patterns of skipper, etc. this would
+       be highly confusing.
+    """
+    for i, k in PairList:
+        high, low = PatternList[i], PatternList[k]
+        if not _is_focus_pair(high, low): continue
+        elif superset_check.do(high.sm, low.sm, Memo): yield i, k
+
+def _find_dominated_pattern(PatternList, Memo, PairList):
+    for i, k in PairList:
+        # 'low' comes after 'high' => 'i' has precedence
+        # Check for domination.
+        if superset_check.do(PatternList[i], PatternList[k], Memo): yield i, k
+
+_find_db = {
+    "outrun":         _find_low_priority_outruns_high_priority_pattern,
+    "special_same":   _find_match_same,
+    "special_outrun": _find_special_incidence_outrun,
+    "special_subset": _find_higher_priority_matches_subset,
+    "dominated":      _find_dominated_pattern,
+}
+
+# Candidate masks of the pairs that are subject to a check (see 'PairIndex').
+_candidates_db = {
+    "outrun":         PairIndex.outrun_candidates,
+    "special_same":   PairIndex.intersection_candidates,
+    "special_outrun": PairIndex.outrun_candidates,
+    "special_subset": PairIndex.superset_candidates,
+    "dominated":      PairIndex.superset_candidates,
+}
+
+def _report_pair_issue(CheckName, high, low):
+    if CheckName == "outrun":
+        error.log_consistency_issue(low, high, ExitF=False, ThisComment="may outrun")
+
+    elif CheckName == "special_same":
         error.log_consistency_issue(high, low, 
                         ThisComment  = "matches on some common lexemes as",
                         ThatComment  = "",
                         ExitF        = True,
-                        SuppressCode = ErrorCode)
+                        SuppressCode = NotificationDB.error_on_special_pattern_same)
 
-def _check_low_priority_outruns_high_priority_pattern(mode):
-    """Warn when low priority patterns may outrun high priority patterns.
-    Assume that the pattern list is sorted by priority!
-    """
-    for high, low in mode.unique_pattern_pair_iterable():
-        if outrun_checker.do(high.sm, low.sm):
-            error.log_consistency_issue(low, high, ExitF=False, ThisComment="may outrun")
+    elif CheckName == "special_outrun":
+        error.log_consistency_issue(high, low, ExitF=False, 
+                        ThisComment  = "has higher precedence but",
+                        ThatComment  = "may outrun it",
+                        SuppressCode = NotificationDB.error_on_special_pattern_outrun)
+
+    elif CheckName == "special_subset":
+        error.log_consistency_issue(high, low, ExitF=True, 
+                        ThisComment  = "has higher precedence and",
+                        ThatComment  = "matches a subset of",
+                        SuppressCode = NotificationDB.error_on_special_pattern_subset)
+
+    elif CheckName == "dominated":
+        error.log_consistency_issue(high, low, 
+                        ThisComment  = "matches a superset of what is matched by",
+                        EndComment   = "The former has precedence and the latter can never match.",
+                        ExitF        = True, 
+                        SuppressCode = NotificationDB.error_on_dominated_pattern)
+
+    else:
+        assert False
 
 def initial_mode(ModePrepList, initial_mode):
     # (*) Start mode specified?
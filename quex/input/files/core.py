@@ -1,7 +1,7 @@
 # Project Quex (http://quex.sourceforge.net); License: MIT;
 # (C) 2005-2020 Frank-Rene Schaefer; 
 import quex.engine.misc.error                   as     error
-from   quex.engine.misc.file_operations         import open_file_or_die
+from   quex.engine.misc.file_operations         import open_text_stream_or_die
 from   quex.engine.misc.file_in                 import EndOfStreamException, \
                                                        check, \
                                                        check_end_of_file, \
@@ -10,6 +10,7 @@ from   quex.engine.misc.file_in                 import EndOfStreamException, \
                                                        read_integer, \
                                                        skip_whitespace
 import quex.input.files.mode                    as     mode
+import quex.input.files.parse_cache             as     parse_cache
 import quex.input.files.section_define          as     section_define
 import quex.input.files.section_token           as     section_token
 import quex.input.files.token_type              as     token_type
@@ -38,18 +39,17 @@ def do(file_list):
     if not Setup.extern_token_id_file:
         prepare_default_standard_token_ids()
 
-    for file_name in file_list:
+    # Files whose parsing result is stored in the cache are not parsed again.
+    cache  = parse_cache.ParseCache(file_list)
+    loaded = cache.load()
+    if loaded is None: done_n = 0
+    else:              done_n, mode_parsed_db, initial_mode = loaded
+
+    for i, file_name in enumerate(file_list):
+        if i < done_n: continue
         error.insight("File '%s'" % file_name)
-        fh = open_file_or_die(file_name, CodecCheckF=True, Encoding="utf-8-sig")
-
-        # Read all modes until end of file
-        try:
-            while 1 + 1 == 2:
-                parse_section(fh, mode_parsed_db, initial_mode)
-        except EndOfStreamException:
-            pass # ... next, please!
-        except RegularExpressionException as x:
-            error.log(x.message, fh)
+        with cache.recording(i, mode_parsed_db, initial_mode):
+            _parse_file(file_name, mode_parsed_db, initial_mode)
         
     if token_db.token_type_definition is None:
         _parse_default_token_definition(mode_parsed_db)
@@ -58,6 +58,21 @@ def do(file_list):
 
     return mode_parsed_db, initial_mode
 
+def _parse_file(file_name, mode_parsed_db, initial_mode):
+    try:
+        fh = open_text_stream_or_die(file_name, Encoding="utf-8-sig")
+    except UnicodeDecodeError as x:
+        _log_encoding_error(x, SourceRef.from_FileName(file_name))
+
+    # Read all modes until end of file
+    try:
+        while 1 + 1 == 2:
+            parse_section(fh, mode_parsed_db, initial_mode)
+    except EndOfStreamException:
+        pass # ... next, please!
+    except RegularExpressionException as x:
+        error.log(x.message, fh)
+
 def parse_section(fh, mode_parsed_db, initial_mode=None, CustomizedTokenTypeF=True):
     position = fh.tell()
     word     = ""
@@ -70,16 +85,19 @@ def parse_section(fh, mode_parsed_db, initial_mode=None, CustomizedTokenTypeF=Tr
             _parse_section(fh, position, word, mode_parsed_db, initial_mode, CustomizedTokenTypeF)
 
     except UnicodeDecodeError as x:
-        if x.start == 0: extra_str = " (Probably wrong byte order mark)."
-        else:            extra_str = "."
-        error.log("Quex requires ASCII or UTF8 input character format.\n" \
-                  "Found encoding error at position '%s'%s" % (x.start, extra_str), fh)
+        _log_encoding_error(x, fh)
 
     except EndOfStreamException as x:
         fh.seek(position)
         if word: error.error_eof(word, fh)
         else:    raise x
 
+def _log_encoding_error(x, Fh_or_Sr):
+    if x.start == 0: extra_str = " (Probably wrong byte order mark)."
+    else:            extra_str = "."
+    error.log("Quex requires ASCII or UTF8 input character format.\n" \
+              "Found encoding error at position '%s'%s" % (x.start, extra_str), Fh_or_Sr)
+
 def _parse_section(fh, position, section_name, mode_parsed_db, initial_mode, CustomizedTokenTypeF):
     """  -- 'mode { ... }'        => define a mode
          -- 'start = ...;'        => define the name of the initial mode
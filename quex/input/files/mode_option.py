@@ -128,6 +128,16 @@ class OptionDB(dict):
     def __getitem__(self, Key):        assert False, "'[]' not supported. Use '.value()'"
     def __setitem__(self, Key, Value): assert False, "'[]' not supported. Use '.enter()'"
 
+    def __reduce__(self):
+        # Pickle would enter the items by '[]' (see 'quex/input/files/parse_cache.py').
+        return (OptionDB.from_items, (list(dict.items(self)),), self.__dict__ or None)
+
+    @classmethod
+    def from_items(cls, Items):
+        result = cls()
+        dict.update(result, Items)
+        return result
+
     @classmethod
     def from_BaseModeSequence(cls, BaseModeSequence):
         # BaseModeSequence[-1] = mode itself
@@ -0,0 +1,235 @@
+# Project Quex (http://quex.sourceforge.net); License: MIT;
+# (C) 2005-2020 Frank-Rene Schaefer;
+#_______________________________________________________________________________
+"""Cache for the results of parsing input files.
+
+Lexers are often generated from the same shared '.qx' files (token
+definitions, 'define' sections, base modes) followed by lexer specific ones:
+
+        > quex -i tokens.qx defines.qx base.qx lexer-a.qx -o A ...
+        > quex -i tokens.qx defines.qx base.qx lexer-b.qx -o B ...
+
+There are no include directives--what a file sees is what the files before it
+in the list have defined. So, the state after parsing the files 0 to i is
+stored under a key derived from
+
+    -- the sources of the quex package and the environment variables that
+       select implementations of the engine (e.g. 'QUEX_NUMBER_SET'),
+    -- the command line setup (except for input and output locations),
+    -- the content of files that are referred to by the setup (token class
+       file, foreign token id file, encoding file), and
+    -- the content of the input files 0 to i.
+
+Changing a file invalidates the states of all files that follow it. When the
+files are parsed, the longest list head with a stored state is loaded, and
+only the remaining files are parsed.
+
+The state consists of the parsed modes, token type definition, token ids,
+'define' shorthands, code fragments, the start mode, and what those imply
+for the setup and the global counters. Messages that were printed while
+parsing (warnings, notes) are recorded and repeated when the state is loaded.
+Nothing is stored for files with commands in the 'define' section, since
+their output is the purpose of running them.
+
+The states are stored in the disk cache (see 'quex/engine/misc/disk_cache.py').
+They are pickled, and loading a pickle may execute code. Thus, the cache is
+only used if 'QUEX_CACHE_PATH' is set explicitly to a non-empty directory. 
+Then, only the user shall be able to write into that directory.
+
+(C) Frank-Rene Schaefer
+"""
+from   quex.DEFINITIONS                  import QUEX_PARSE_CACHE_F, QUEX_PATH
+import quex.engine.misc.disk_cache       as     disk_cache
+import quex.engine.state_machine.index   as     index
+import quex.input.files.token_type       as     token_type
+from   quex.input.setup                  import SETUP_INFO
+from   quex.blackboard                   import setup as Setup
+import quex.blackboard                   as     blackboard
+import quex.token_db                     as     token_db
+
+from   contextlib import contextmanager, redirect_stdout
+import hashlib
+import io
+import os
+import pickle
+import sys
+
+CATEGORY = "parse"
+
+# Options which do not influence the result of parsing.
+_SETUP_IGNORED_LIST = [ "input_mode_files", "output_directory", "jobs" ]
+
+# Environment variables which select implementations of the engine. The 
+# stored objects depend on them (e.g. the class of number sets).
+_ENVIRONMENT_LIST = [ "QUEX_DFA_STORAGE", "QUEX_HOPCROFT", "QUEX_MINIMIZER", "QUEX_NUMBER_SET" ]
+
+_TOKEN_DB_NAME_LIST = [
+    "token_id_db", "token_id_foreign_set", "token_id_implicit_list",
+    "token_repetition_token_id_list", "token_repetition_source_reference_example",
+    "token_type_definition",
+]
+
+class ParseCache:
+    def __init__(self, FileList):
+        self.file_list    = FileList
+        self.setup_before = dict(Setup.__dict__)
+        if QUEX_PARSE_CACHE_F: self.key_list = _get_key_list(FileList)
+        else:                  self.key_list = []
+
+    def load(self):
+        """Loads the state after the longest list head of files for which a
+        state is stored.
+
+        RETURNS: [0] Number of files whose parsing is done.
+                 [1] mode_parsed_db
+                 [2] initial_mode
+                 None, if nothing has been loaded.
+        """
+        for i in reversed(range(len(self.key_list))):
+            content = disk_cache.read(CATEGORY, self.key_list[i], self.file_list[i])
+            if content is None: continue
+            try:
+                state = pickle.loads(content)
+            except (pickle.UnpicklingError, AttributeError, ImportError, EOFError, TypeError):
+                continue
+            mode_parsed_db, initial_mode = self.__restore(state)
+            return i + 1, mode_parsed_db, initial_mode
+        return None
+
+    @contextmanager
+    def recording(self, FileIndex, mode_parsed_db, initial_mode):
+        """Stores the state after the parsing of 'FileList[FileIndex]' in the
+        'with' block. Printed messages are recorded. Nothing is stored, if the
+        block does not terminate normally.
+        """
+        if FileIndex >= len(self.key_list): 
+            yield
+            return
+
+        output = _TeeStream(sys.stdout)
+        with redirect_stdout(output):
+            yield
+
+        if blackboard.dfa_command_executed_f: return
+        state = self.__snapshot(mode_parsed_db, initial_mode, output.getvalue())
+        try:    content = pickle.dumps(state, pickle.HIGHEST_PROTOCOL)
+        except pickle.PicklingError: return
+        disk_cache.write(CATEGORY, self.key_list[FileIndex], self.file_list[FileIndex], content)
+
+    def __snapshot(self, mode_parsed_db, initial_mode, Output):
+        return {
+            "mode_parsed_db":   mode_parsed_db,
+            "initial_mode":     initial_mode,
+            "fragment_db":      dict((name, getattr(blackboard, name))
+                                     for name in blackboard.fragment_db.values()),
+            "shorthand_db":     blackboard.shorthand_db,
+            "required_support": (blackboard.required_support_indentation_count(),
+                                 blackboard.required_support_begin_of_line()),
+            "token_db":         dict((name, getattr(token_db, name))
+                                     for name in _TOKEN_DB_NAME_LIST),
+            "data_name_index":  _get_data_name_index_counter(),
+            "setup":            dict((name, value)
+                                     for name, value in Setup.__dict__.items()
+                                     if self.setup_before.get(name) is not value),
+            "counter_state":    index.get_counter_state(),
+            "output":           Output,
+        }
+
+    def __restore(self, State):
+        for name, value in State["fragment_db"].items():
+            setattr(blackboard, name, value)
+        _assign(blackboard, "shorthand_db", State["shorthand_db"])
+
+        indentation_count_f, begin_of_line_f = State["required_support"]
+        if indentation_count_f: blackboard.required_support_indentation_count_set()
+        if begin_of_line_f:     blackboard.required_support_begin_of_line_set()
+
+        for name, value in State["token_db"].items():
+            _assign(token_db, name, value)
+        _set_data_name_index_counter(State["data_name_index"])
+
+        Setup.__dict__.update(State["setup"])
+        index.ensure_counter_state(State["counter_state"])
+
+        sys.stdout.write(State["output"])
+        return State["mode_parsed_db"], State["initial_mode"]
+
+class _TeeStream(io.StringIO):
+    """Records what is written, and passes it on to 'Stream'.
+    """
+    def __init__(self, Stream):
+        io.StringIO.__init__(self)
+        self.stream = Stream
+
+    def write(self, Text):
+        self.stream.write(Text)
+        return io.StringIO.write(self, Text)
+
+    def flush(self):
+        self.stream.flush()
+
+def _get_key_list(FileList):
+    """RETURNS: List where element 'i' is the key of the state after parsing
+                'FileList[0]' to 'FileList[i]'. Empty list, if a file cannot
+                be read.
+    """
+    sha1 = hashlib.sha1()
+    sha1.update(_get_source_digest())
+    for name in _ENVIRONMENT_LIST:
+        sha1.update(repr((name, os.environ.get(name))).encode())
+
+    for name in sorted(SETUP_INFO):
+        if   type(SETUP_INFO[name]) != list:                      continue
+        elif name in _SETUP_IGNORED_LIST:                         continue
+        elif name.startswith("query_") or name.startswith("XX_"): continue
+        sha1.update(repr((name, Setup.__dict__.get(name))).encode())
+
+    reference_list = [ Setup.extern_token_class_file, Setup.buffer_encoding_file ] \
+                     + Setup.extern_token_id_specification[:1]
+    try:
+        for file_name in reference_list:
+            if file_name: sha1.update(_get_digest(file_name))
+
+        result = []
+        for file_name in FileList:
+            sha1.update(_get_digest(file_name))
+            result.append(sha1.hexdigest())
+    except OSError:
+        return []
+    return result
+
+def _get_digest(FileName):
+    with open(FileName, "rb") as fh:
+        return hashlib.sha1(fh.read()).digest()
+
+def _get_source_digest():
+    """RETURNS: Digest of the Python sources of the quex package. Stored
+                states of another version of the code are not loaded.
+    """
+    sha1 = hashlib.sha1()
+    for root, dir_list, file_list in os.walk(os.path.join(QUEX_PATH, "quex")):
+        dir_list[:] = sorted(
+            name for name in dir_list 
+            if name != "__pycache__" and not name.startswith("TEST")
+        )
+        for name in sorted(file_list):
+            if not name.endswith(".py"): continue
+            sha1.update(name.encode())
+            sha1.update(_get_digest(os.path.join(root, name)))
+    return sha1.digest()
+
+def _assign(Module, Name, Value):
+    """Containers are modified in place, since they may be referred to by
+    other modules.
+    """
+    current = getattr(Module, Name)
+    if   type(current) == dict and type(Value) == dict: current.clear(); current.update(Value)
+    elif type(current) == set  and type(Value) == set:  current.clear(); current.update(Value)
+    elif type(current) == list and type(Value) == list: current[:] = Value
+    else:                                               setattr(Module, Name, Value)
+
+def _get_data_name_index_counter():
+    return getattr(token_type, "__data_name_index_counter")
+
+def _set_data_name_index_counter(Value):
+    setattr(token_type, "__data_name_index_counter", Value)
@@ -374,7 +374,8 @@ def snap_case_folded_pattern(sh, PatternDict, NumberSetF=False):
        Assume that '\C' has been snapped already from the stream.
 
        See function ucs_case_fold_parser.get_fold_set() for details
-       about case folding.
+       about case folding. Character sets are folded as a whole by the 
+       precomputed 'FoldIndex'.
     """
     def __add_intermediate_states(sm, character_list, start_state_idx, target_state_idx):
         next_idx = start_state_idx
@@ -382,13 +383,10 @@ def snap_case_folded_pattern(sh, PatternDict, NumberSetF=False):
             next_idx = sm.add_transition(next_idx, letter)
         sm.add_transition(next_idx, character_list[-1], target_state_idx)
 
-    def __add_case_fold(sm, Flags, trigger_set, start_state_idx, target_state_idx):
-        for interval in trigger_set.get_intervals(PromiseToTreatWellF=True):
-            for fold in ucs_case_fold.get_fold_set_for_interval(interval, Flags):
-                if len(fold) > 1:
-                    __add_intermediate_states(sm, fold, start_state_idx, target_state_idx)
-                else:
-                    trigger_set.add_interval(Interval(fold[0]))
+    def __add_case_fold(sm, FoldIndex, trigger_set, start_state_idx, target_state_idx):
+        for fold in FoldIndex.get_multi_fold_list(trigger_set):
+            __add_intermediate_states(sm, fold, start_state_idx, target_state_idx)
+        trigger_set.unite_with(FoldIndex.get_fold_number_set(trigger_set))
 
 
     pos = sh.tell()
@@ -411,7 +409,8 @@ def snap_case_folded_pattern(sh, PatternDict, NumberSetF=False):
 
     skip_whitespace(sh)
 
-    result = snap_curly_bracketed_expression(sh, PatternDict, "case fold operator", "C")[0]
+    result     = snap_curly_bracketed_expression(sh, PatternDict, "case fold operator", "C")[0]
+    fold_index = ucs_case_fold.get_fold_index(flag_txt)
 
     if NumberSetF:
         trigger_set = result.get_number_set()
@@ -420,17 +419,13 @@ def snap_case_folded_pattern(sh, PatternDict, NumberSetF=False):
                       "The content in '\\C{content}' may start with '[' or '[:'.", sh)
 
         # -- perform the case fold for Sets!
-        for interval in trigger_set.get_intervals(PromiseToTreatWellF=True):
-            for fold in ucs_case_fold.get_fold_set_for_interval(interval, flag_txt):
-                trigger_set.add_interval(Interval(fold[0]))
-
-        result = trigger_set
+        result = fold_index.get_fold_number_set(trigger_set)
 
     else:
         # -- perform the case fold for DFAs!
         for state_idx, state in list(result.states.items()):
             for target_state_idx, trigger_set in list(state.target_map.get_map().items()):
-                __add_case_fold(result, flag_txt, trigger_set, state_idx, target_state_idx)
+                __add_case_fold(result, fold_index, trigger_set, state_idx, target_state_idx)
 
     return result
 
@@ -266,6 +266,7 @@ SETUP_INFO = {
     "indentation_stack_size":         [["--indentation-stack-size", "--indss" ], 1024],
     "input_mode_files":               [["-i"],                                 SetupParTypes.LIST],
     "insight_f":                      [["--insight"],                          SetupParTypes.FLAG],
+    "jobs":                           [["--jobs", "-j"],                       1],
     "language":                       [["--language", "-l"],                 "C++"],
     "memory_management_extern_f":     [["--extern-memory-management", "--emm"], SetupParTypes.FLAG],
     "mode_stack_size":                [["--mode-stack-size",        "--mss" ],   64],
@@ -313,6 +314,7 @@ SETUP_INFO = {
     "query_numeric_f":                [["--numeric", "--num"],            SetupParTypes.FLAG],
     "query_interval_f":               [["--intervals", "--itv"],          SetupParTypes.FLAG],
     "query_unicode_names_f":          [["--names"],                       SetupParTypes.FLAG],
+    "query_server":                   [["--query-server"],                SetupParTypes.OPTIONAL_STRING],
     #
     #__________________________________________________________________________
     # Parameters not set on the command line:
@@ -702,6 +704,7 @@ DOC = {
     "converter_icu_f":                ("Use 'icu' library for character conversions.", ""),
     "include_stack_support_f":        ("", ""),
     "input_mode_files":               ("", ""),
+    "jobs":                           ("Number of processes for consistency checks (0: number of CPUs).", ""),
     "extern_token_class_file":               ("", ""),
     "token_class":                    ("", ""),
     "token_class_only_f":             ("", ""),